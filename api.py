@@ -4,13 +4,23 @@ Kütüphane Yönetim Sistemi - FastAPI Web Servisi
 Global AI Hub Python 202 Bootcamp Projesi - Aşama 3
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, validator
-from typing import List, Optional
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError, validator
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import base64
+import binascii
+import json
+import os
 import re
 import html
-from library import Library
+import uuid
+from library import (ADD_STATUSES, CONFLICT_POLICIES, EXPORT_FORMATS, Library, OpenLibraryUnavailableError,
+                     count_statuses)
+from openlibrary import OPEN_LIBRARY_URL, OpenLibraryClient
 from book import Book
+from response_cache import ResponseCache
 
 # FastAPI uygulaması oluştur
 app = FastAPI(
@@ -19,8 +29,30 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Global kütüphane nesnesi
-library = Library("api_library.json")
+# Global kütüphane nesnesi (LIBRARY_FILE ile .db veya .bcat gibi başka bir arka uç seçilebilir;
+# Open Library yanıtları OPENLIBRARY_CACHE_FILE dosyasında önbelleğe alınır)
+# Son isteklerin %95'inden yavaş kalan Open Library isteklerine ikinci bir istek eklenir;
+# OPENLIBRARY_URL ile openlibrary.org yerine örn. fake_openlibrary.py sunucusu kullanılabilir
+openlibrary = OpenLibraryClient(
+    os.environ.get("OPENLIBRARY_URL", OPEN_LIBRARY_URL),
+    hedge_percentile=float(os.environ.get("OPENLIBRARY_HEDGE_PERCENTILE", "0.95"))
+)
+library = Library(
+    os.environ.get("LIBRARY_FILE", "api_library.json"),
+    openlibrary=openlibrary,
+    metadata_cache=os.environ.get("OPENLIBRARY_CACHE_FILE", "openlibrary_cache.db"),
+    # offline_index.py ile Open Library dump'larından oluşturulan yerel indeks (isteğe bağlı)
+    offline_index=os.environ.get("OPENLIBRARY_OFFLINE_INDEX")
+)
+# Okuma uç noktalarının JSON'a çevrilmiş yanıtları (katalog değişince geçersiz olur)
+response_cache = ResponseCache(int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024)))
+
+
+@app.on_event("shutdown")
+async def shutdown_library():
+    """Sunucu kapanırken bekleyen değişiklikleri diske yazar."""
+    await library.aclose()
+    await openlibrary.aclose()
 
 
 # Pydantic modelleri
@@ -90,6 +122,51 @@ class ISBNRequest(BaseModel):
         return v
 
 
+class ISBNBatchRequest(BaseModel):
+    """Toplu ISBN ile kitap ekleme için model."""
+    isbns: List[str]
+    concurrency: int = 8
+    
+    @validator('isbns')
+    def validate_isbns(cls, v):
+        if not v:
+            raise ValueError('En az bir ISBN girilmelidir')
+        if len(v) > 10000:
+            raise ValueError('Tek istekte en fazla 10000 ISBN eklenebilir')
+        return v
+    
+    @validator('concurrency')
+    def validate_concurrency(cls, v):
+        if not 1 <= v <= 32:
+            raise ValueError('concurrency 1 ile 32 arasında olmalıdır')
+        return v
+
+
+class BatchResultItem(BaseModel):
+    """Toplu işlemde tek bir satırın sonucu."""
+    index: int
+    isbn: Optional[str] = None
+    status: str
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    """Toplu işlem yanıtı modeli."""
+    added: int
+    replaced: int
+    skipped: int
+    failed: int
+    results: List[BatchResultItem]
+
+
+class RemoveBatchResponse(BaseModel):
+    """Toplu silme yanıtı modeli."""
+    removed: int
+    not_found: int
+    failed: int
+    results: List[BatchResultItem]
+
+
 class MessageResponse(BaseModel):
     """Genel mesaj yanıtı modeli."""
     message: str
@@ -97,6 +174,10 @@ class MessageResponse(BaseModel):
 
 
 # API Endpoint'leri
+#
+# Kütüphaneye erişen uç noktalar düz def olarak tanımlanır; FastAPI bunları iş
+# parçacığı havuzunda çalıştırır. Böylece kütüphane kilidini uzun süre tutan
+# bir toplu yazma, kilidi bekleyen istekler yüzünden olay döngüsünü durdurmaz.
 
 @app.get("/", response_model=dict)
 async def root():
@@ -107,20 +188,131 @@ async def root():
         "endpoints": {
             "GET /books": "Tüm kitapları listele",
             "POST /books": "ISBN ile kitap ekle (Open Library API)",
+            "POST /books/batch": "ISBN listesiyle toplu kitap ekle",
+            "POST /books/bulk": "Kitap listesini tek işlemle ekle",
+            "DELETE /books/bulk": "ISBN listesindeki kitapları tek işlemle sil",
             "POST /books/manual": "Manuel kitap ekle",
             "DELETE /books/{isbn}": "Kitap sil",
+            "GET /books/export": "Kataloğu NDJSON veya CSV olarak akış halinde indir",
             "GET /books/{isbn}": "Belirli bir kitabı getir",
             "GET /books/search/{query}": "Kitap ara",
-            "GET /stats": "Kütüphane istatistikleri"
+            "GET /stats": "Kütüphane istatistikleri",
+            "GET /admin/cache": "Open Library önbellek istatistikleri",
+            "DELETE /admin/cache/not-found": "Bulunamayan ISBN önbelleğini temizle",
+            "GET /admin/openlibrary": "Open Library devre kesici durumu ve gecikmeler",
+            "POST /admin/prefetch": "ISBN listesini arka planda önbelleğe çek",
+            "GET /admin/prefetch": "Ön yükleme ilerlemesi"
         }
     }
 
 
+# ETag'ler süreç başına farklı önekle üretilir; yeniden başlatılan veya farklı
+# bir worker'daki kütüphanenin aynı sürüm numarası yanlışlıkla 304 döndürmez
+ETAG_PREFIX = uuid.uuid4().hex[:8]
+
+
+def catalog_etag(version: int) -> str:
+    """Katalog sürümünden ETag değerini üretir."""
+    return f'"{ETAG_PREFIX}-{version}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    İstemcinin If-None-Match başlığındaki ETag güncelse veriye dokunmadan
+    döndürülecek 304 yanıtını, değilse None döndürür.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    # Zayıf karşılaştırma: W/ önekli ETag'ler de eşleşir
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    if tags & {etag, f"W/{etag}", "*"}:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def cached_json(request: Request, key: Hashable,
+                build: Callable[[], Tuple[object, Dict[str, str]]]) -> Response:
+    """
+    Okuma uç noktalarının ortak yanıt yolu: ETag güncelse 304, hazır yanıt
+    önbellekteyse saklanan baytlar döner. Aksi halde build() çağrılır; dönen
+    veri JSON'a bir kez kodlanıp katalog sürümüyle önbelleğe yazılır.
+    Kütüphane kilidini aldığı için olay döngüsünde değil, iş parçacığı
+    havuzunda çalışan (def) uç noktalardan çağrılmalıdır.
+    
+    Args:
+        request (Request): Gelen istek
+        key (Hashable): Uç nokta ve parametrelerden oluşan önbellek anahtarı
+        build (Callable): (JSON'a çevrilecek veri, ek başlıklar) döndüren fonksiyon
+        
+    Returns:
+        Response: JSON yanıtı veya 304
+    """
+    version = library.version
+    etag = catalog_etag(version)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    
+    entry = response_cache.get(version, key)
+    if entry is None:
+        data, headers = build()
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        response_cache.set(version, key, body, headers)
+    else:
+        body, headers = entry
+    return Response(content=body, media_type="application/json", headers={**headers, "ETag": etag})
+
+
+# Sayfalı listelemede varsayılan ve en büyük sayfa boyutu
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(isbn: str) -> str:
+    """Sayfanın son ISBN'inden istemciye verilecek opak imleci oluşturur."""
+    return base64.urlsafe_b64encode(isbn.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """İmleci ISBN'e çevirir; geçersizse 400 döndürür."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Geçersiz sayfa imleci")
+
+
 @app.get("/books", response_model=List[BookResponse])
-async def get_all_books():
-    """Kütüphanedeki tüm kitapları döndürür."""
-    books = library.get_all_books()
-    return [BookResponse(title=book.title, author=book.author, isbn=book.isbn) for book in books]
+def get_all_books(request: Request,
+                  limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                  cursor: Optional[str] = None):
+    """
+    Kütüphanedeki kitapları döndürür.
+    
+    limit veya cursor verilirse kitaplar ISBN sırasına göre sayfa sayfa döner;
+    sonraki sayfanın imleci X-Next-Cursor başlığında (ve Link başlığında)
+    bulunur, son sayfada bu başlıklar yoktur. İkisi de verilmezse tüm kitaplar
+    eskisi gibi ekleme sırasıyla döner.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    # Boş imleç (?cursor=) de sayfalı yanıt ister; önbellek anahtarı bunu ayırt etmeli
+    paged = limit is not None or cursor is not None
+    
+    def build():
+        if not paged:
+            return [book.to_dict() for book in library.get_all_books()], {}
+        
+        page_size = limit or DEFAULT_PAGE_SIZE
+        books, next_after = library.get_books_page(page_size, after)
+        headers = {}
+        if next_after is not None:
+            next_cursor = encode_cursor(next_after)
+            headers["X-Next-Cursor"] = next_cursor
+            headers["Link"] = f'</books?limit={page_size}&cursor={next_cursor}>; rel="next"'
+        return [book.to_dict() for book in books], headers
+    
+    return cached_json(request, ("books", paged, limit, after), build)
 
 
 @app.post("/books", response_model=BookResponse)
@@ -133,23 +325,45 @@ async def add_book_by_isbn(isbn_request: ISBNRequest):
     if not isbn:
         raise HTTPException(status_code=400, detail="ISBN numarası boş olamaz")
     
-    # ISBN zaten var mı kontrol et
-    if library.find_book(isbn):
+    # ISBN zaten var mı kontrol et (kütüphane kilidi olay döngüsünde beklenmez)
+    if await run_in_threadpool(library.find_book, isbn):
         raise HTTPException(status_code=409, detail=f"ISBN {isbn} zaten mevcut")
     
-    # API'den kitap bilgilerini çek
-    success = library.add_book_by_isbn(isbn)
+    # API'den kitap bilgilerini çek (olay döngüsünü bloklamadan)
+    try:
+        success = await library.add_book_by_isbn_async(isbn)
+    except ValueError as e:
+        # İstek sürerken aynı ISBN başka bir istekle eklenmiş olabilir
+        if await run_in_threadpool(library.find_book, isbn):
+            raise HTTPException(status_code=409, detail=f"ISBN {isbn} zaten mevcut")
+        # Open Library'ye ulaşılamadıysa (devre kesici açık, ağ hatası) 503 döndür
+        if isinstance(e, OpenLibraryUnavailableError):
+            raise HTTPException(status_code=503, detail=str(e))
+        raise HTTPException(status_code=404, detail=str(e))
     
     if not success:
         raise HTTPException(status_code=404, detail="Kitap Open Library'de bulunamadı veya API hatası")
     
     # Eklenen kitabı döndür
-    added_book = library.find_book(isbn)
+    added_book = await run_in_threadpool(library.find_book, isbn)
     return BookResponse(title=added_book.title, author=added_book.author, isbn=added_book.isbn)
 
 
+@app.post("/books/batch", response_model=BatchResponse)
+async def add_books_by_isbn(batch_request: ISBNBatchRequest):
+    """
+    ISBN listesindeki kitapları Open Library'den toplu olarak çeker ve ekler.
+    Her ISBN için sonuç (added, skipped, error) ayrı ayrı döndürülür.
+    """
+    # Toplu istekler iş parçacığı havuzunda çalıştırılır, olay döngüsü bloklanmaz
+    summary = await run_in_threadpool(
+        library.add_books_by_isbn, batch_request.isbns, concurrency=batch_request.concurrency
+    )
+    return BatchResponse(**summary)
+
+
 @app.post("/books/manual", response_model=BookResponse)
-async def add_book_manual(book_data: BookCreate):
+def add_book_manual(book_data: BookCreate):
     """
     Manuel olarak kitap ekler.
     """
@@ -177,8 +391,96 @@ async def add_book_manual(book_data: BookCreate):
     return BookResponse(title=new_book.title, author=new_book.author, isbn=new_book.isbn)
 
 
+# Dışa aktarım formatlarının içerik türleri
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+# Toplu yazma uç noktalarında tek istekteki en fazla satır sayısı
+MAX_BULK_ITEMS = 10000
+
+
+@app.post("/books/bulk", response_model=BatchResponse)
+async def add_books_bulk(items: List[dict], on_conflict: str = "skip"):
+    """
+    Kitap listesini (POST /books/manual ile aynı alanlar) tek kayıt işlemiyle
+    ekler. Her satır ayrı doğrulanır; sonuç (added, replaced, skipped, error)
+    satır satır döndürülür. on_conflict: skip, replace veya error (çakışma
+    varsa hiçbir kitap eklenmez ve 409 döner).
+    """
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Tek istekte en fazla {MAX_BULK_ITEMS} kitap eklenebilir")
+    if on_conflict not in CONFLICT_POLICIES:
+        raise HTTPException(status_code=400, detail=f"Geçersiz çakışma politikası: {on_conflict}")
+    
+    results = {}
+    books = []
+    indexes = []
+    for index, item in enumerate(items):
+        try:
+            # /books/manual ile aynı temizleme ve doğrulama
+            book_data = BookCreate(**item)
+        except ValidationError as e:
+            isbn = item.get("isbn") if isinstance(item.get("isbn"), str) else None
+            results[index] = {"index": index, "isbn": isbn, "status": "error", "error": e.errors()[0]["msg"]}
+            continue
+        books.append(Book(book_data.title, book_data.author, book_data.isbn))
+        indexes.append(index)
+    
+    # Çakışma kontrolü ve yazma, diğer uç noktalarla aynı kütüphane kilidi altında yapılır
+    try:
+        added = await run_in_threadpool(library.add_books, books, on_conflict=on_conflict)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    for result in added["results"]:
+        index = indexes[result["index"]]
+        results[index] = dict(result, index=index)
+    
+    summary = count_statuses((result["status"] for result in results.values()), ADD_STATUSES)
+    return BatchResponse(results=[results[index] for index in sorted(results)], **summary)
+
+
+@app.delete("/books/bulk", response_model=RemoveBatchResponse)
+async def delete_books_bulk(isbns: List[str]):
+    """
+    ISBN listesindeki kitapları tek kayıt işlemiyle siler. Her ISBN için sonuç
+    (removed, not_found, error) ayrı ayrı döndürülür.
+    """
+    if len(isbns) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Tek istekte en fazla {MAX_BULK_ITEMS} kitap silinebilir")
+    
+    try:
+        summary = await run_in_threadpool(library.remove_books, isbns)
+    except ValueError as e:
+        # Örn. salt okunur ikili katalog
+        raise HTTPException(status_code=400, detail=str(e))
+    return RemoveBatchResponse(**summary)
+
+
+@app.get("/books/export")
+def export_books(request: Request, format: str = "ndjson"):
+    """
+    Tüm kataloğu NDJSON (varsayılan) veya CSV olarak akış halinde döndürür.
+    Kitaplar depolama arka ucundan okundukça gönderilir; katalog belleğe
+    alınmaz ve Pydantic modelleri oluşturulmaz.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz format, desteklenenler: {', '.join(EXPORT_FORMATS)}")
+    etag = catalog_etag(library.version)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    
+    # Senkron üreteç iş parçacığı havuzunda tüketilir, olay döngüsü bloklanmaz
+    return StreamingResponse(
+        library.iter_export(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"',
+                 "ETag": etag}
+    )
+
+
 @app.get("/books/{isbn}", response_model=BookResponse)
-async def get_book_by_isbn(isbn: str):
+def get_book_by_isbn(isbn: str, request: Request):
     """
     Belirli bir ISBN'e sahip kitabı döndürür.
     """
@@ -187,16 +489,17 @@ async def get_book_by_isbn(isbn: str):
     if not re.match(r'^[\d\-X]+$', isbn) or len(isbn) > 20:
         raise HTTPException(status_code=400, detail="Geçersiz ISBN formatı")
     
-    book = library.find_book(isbn)
-    
-    if not book:
-        raise HTTPException(status_code=404, detail=f"ISBN {isbn} bulunamadı")
+    def build():
+        book = library.find_book(isbn)
+        if not book:
+            raise HTTPException(status_code=404, detail=f"ISBN {isbn} bulunamadı")
+        return book.to_dict(), {}
     
-    return BookResponse(title=book.title, author=book.author, isbn=book.isbn)
+    return cached_json(request, ("book", isbn), build)
 
 
 @app.delete("/books/{isbn}", response_model=MessageResponse)
-async def delete_book(isbn: str):
+def delete_book(isbn: str):
     """
     Belirtilen ISBN'e sahip kitabı siler.
     """
@@ -214,7 +517,7 @@ async def delete_book(isbn: str):
 
 
 @app.get("/books/search/{query}", response_model=List[BookResponse])
-async def search_books(query: str):
+def search_books(query: str, request: Request):
     """
     Başlık, yazar veya ISBN'e göre kitap arar.
     """
@@ -230,40 +533,85 @@ async def search_books(query: str):
     # HTML escape
     query = html.escape(query)
     
-    found_books = library.search_books(query)
-    
-    return [BookResponse(title=book.title, author=book.author, isbn=book.isbn) for book in found_books]
+    return cached_json(
+        request, ("search", query),
+        lambda: ([book.to_dict() for book in library.search_books(query)], {})
+    )
 
 
 @app.get("/stats", response_model=dict)
-async def get_library_stats():
+def get_library_stats(request: Request):
     """
     Kütüphane istatistiklerini döndürür.
     """
-    books = library.get_all_books()
-    book_count = len(books)
-    
-    # Yazarlara göre grupla
-    authors = {}
-    for book in books:
-        if book.author in authors:
-            authors[book.author] += 1
-        else:
-            authors[book.author] = 1
-    
-    stats = {
-        "total_books": book_count,
-        "unique_authors": len(authors),
-        "authors_with_most_books": None,
-        "most_books_count": 0
-    }
-    
-    if authors:
-        max_author = max(authors, key=authors.get)
-        stats["authors_with_most_books"] = max_author
-        stats["most_books_count"] = authors[max_author]
+    return cached_json(request, ("stats",), lambda: (library.stats(), {}))
+
+
+@app.get("/admin/cache", response_model=dict)
+def get_cache_stats():
+    """
+    Open Library önbelleklerinin ve hazır yanıt önbelleğinin isabet/ıskalama
+    sayılarını ve doluluğunu döndürür.
+    """
+    return dict(library.cache_stats(), responses=response_cache.stats())
+
+
+@app.delete("/admin/cache/not-found", response_model=MessageResponse)
+def purge_not_found_cache(isbn: Optional[str] = None):
+    """
+    Open Library'de bulunamayan ISBN kayıtlarını siler. isbn verilirse yalnızca o
+    ISBN, verilmezse tüm kayıtlar silinir.
+    """
+    count = library.purge_negative_cache(isbn.strip() if isbn else None)
+    return MessageResponse(message=f"{count} kayıt silindi", success=True)
+
+
+@app.get("/admin/openlibrary", response_model=dict)
+async def get_openlibrary_status():
+    """
+    Open Library istemcisinin devre kesici durumunu, tekrar deneme ve hedged
+    istek sayılarını ve son isteklerin gecikmelerini döndürür.
+    """
+    return library.openlibrary.stats()
+
+
+# Arka planda çalışan ön yüklemenin ilerlemesi (aynı anda tek ön yükleme çalışır)
+prefetch_progress = {"running": False, "done": 0, "total": 0, "summary": None, "error": None}
+
+
+def run_prefetch(isbns: List[str], concurrency: int) -> None:
+    """ISBN'leri önbelleğe çeker ve ilerlemeyi prefetch_progress'e yazar."""
+    try:
+        prefetch_progress["summary"] = library.prefetch_isbns(
+            isbns, concurrency=concurrency,
+            progress_callback=lambda done, total: prefetch_progress.update(done=done, total=total)
+        )
+    except ValueError as e:
+        prefetch_progress["error"] = str(e)
+    finally:
+        prefetch_progress["running"] = False
+
+
+@app.post("/admin/prefetch", response_model=dict, status_code=202)
+async def start_prefetch(prefetch_request: ISBNBatchRequest, background_tasks: BackgroundTasks):
+    """
+    ISBN listesindeki kitapların bilgilerini kütüphaneye eklemeden, arka planda
+    Open Library önbelleğine çeker. İlerleme GET /admin/prefetch ile izlenir.
+    """
+    if prefetch_progress["running"]:
+        raise HTTPException(status_code=409, detail="Devam eden bir ön yükleme var")
     
-    return stats
+    prefetch_progress.update(running=True, done=0, total=len(prefetch_request.isbns),
+                             summary=None, error=None)
+    # Yanıt döndükten sonra iş parçacığı havuzunda çalışır
+    background_tasks.add_task(run_prefetch, prefetch_request.isbns, prefetch_request.concurrency)
+    return dict(prefetch_progress)
+
+
+@app.get("/admin/prefetch", response_model=dict)
+async def get_prefetch_progress():
+    """Son ön yüklemenin ilerlemesini ve bittiyse sonuç sayılarını döndürür."""
+    return dict(prefetch_progress)
 
 
 # Güvenli hata yakalama middleware'i
@@ -0,0 +1,174 @@
+"""
+Kütüphane Yönetim Sistemi - Yazar Adı Belleği
+
+Birçok kitap aynı yazar anahtarını paylaşır. AuthorMemo, yazar anahtarı ->
+yazar adı eşlemesini süreli olarak bellekte tutar ve aynı anahtar için aynı
+anda yapılan sorguları tek bir ağ isteğinde birleştirir (single-flight).
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+class AuthorMemo:
+    """
+    Yazar anahtarı -> yazar adı belleği.
+    
+    Bir yazar adı ttl süresince yeniden sorgulanmaz. Aynı anahtar için eş
+    zamanlı resolve (iş parçacıkları) ve resolve_async (herhangi bir olay
+    döngüsündeki görevler) çağrıları, hangisi önce başlatmış olursa olsun tek
+    bir fetch çağrısının sonucunu paylaşır. Başarısız sorgular (None) belleğe
+    alınmaz.
+    """
+    
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 10000):
+        """
+        AuthorMemo sınıfının constructor'ı.
+        
+        Args:
+            ttl (float): Bir yazar adının geçerli kalacağı süre (saniye)
+            max_entries (int): Bellekte tutulacak en fazla yazar sayısı
+            
+        Raises:
+            ValueError: ttl veya max_entries pozitif değilse
+        """
+        if ttl <= 0 or max_entries < 1:
+            raise ValueError("ttl ve max_entries pozitif olmalıdır")
+            
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._names: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Süren sorgular; senkron ve asenkron çağıranlar aynı Future'ı bekler
+        self._calls: Dict[str, Future] = {}
+    
+    def _lookup(self, key: str) -> Optional[str]:
+        """Geçerli yazar adını döndürür; kilit tutulurken çağrılmalıdır."""
+        entry = self._names.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._names[key]
+            return None
+        self._names.move_to_end(key)
+        return entry[1]
+    
+    def _store(self, key: str, name: Optional[str]) -> None:
+        """Başarılı sonucu belleğe yazar; sınır aşılırsa en eski kaydı siler."""
+        if name is None:
+            return
+        with self._lock:
+            self._names[key] = (time.monotonic(), name)
+            self._names.move_to_end(key)
+            if len(self._names) > self.max_entries:
+                self._names.popitem(last=False)
+    
+    def _join(self, key: str) -> Tuple[Optional[str], Optional[Future], bool]:
+        """
+        Bellekteki adı veya anahtar için süren sorguyu döndürür; sorgu yoksa
+        çağıranı lider yaparak yeni bir Future oluşturur.
+        
+        Returns:
+            Tuple[Optional[str], Optional[Future], bool]: Bellekteki ad (varsa),
+                beklenecek Future ve çağıranın sorguyu yapıp yapmayacağı
+        """
+        with self._lock:
+            name = self._lookup(key)
+            if name is not None:
+                self.hits += 1
+                return name, None, False
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return None, future, False
+            future = self._calls[key] = Future()
+            # Bekleyenlerden biri Future'ı iptal edemesin
+            future.set_running_or_notify_cancel()
+            self.misses += 1
+            return None, future, True
+    
+    def _finish(self, key: str, future: Future, name: Optional[str]) -> None:
+        """Lider sorguyu kapatır ve sonucu bekleyenlere iletir."""
+        with self._lock:
+            del self._calls[key]
+        future.set_result(name)
+    
+    def resolve(self, key: str, fetch: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Yazar adını bellekten döndürür; yoksa fetch ile bir kez sorgular.
+        
+        Args:
+            key (str): Yazar anahtarı (örn: /authors/OL23919A)
+            fetch (Callable[[], Optional[str]]): Yazar adını ağdan getiren fonksiyon
+            
+        Returns:
+            Optional[str]: Yazar adı veya None
+        """
+        name, future, leader = self._join(key)
+        if future is None:
+            return name
+        if not leader:
+            # Aynı anahtar için süren (senkron veya asenkron) isteğin sonucunu bekle
+            return future.result()
+            
+        try:
+            name = fetch()
+            self._store(key, name)
+        finally:
+            self._finish(key, future, name)
+        return name
+    
+    async def resolve_async(self, key: str, fetch: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """
+        resolve'un asenkron karşılığı.
+        
+        Args:
+            key (str): Yazar anahtarı (örn: /authors/OL23919A)
+            fetch (Callable[[], Awaitable[Optional[str]]]): Yazar adını ağdan
+                getiren coroutine fonksiyonu
+                
+        Returns:
+            Optional[str]: Yazar adı veya None
+        """
+        name, future, leader = self._join(key)
+        if future is None:
+            return name
+        if not leader:
+            # shield: bekleyen bir görevin iptali diğerlerini etkilemesin
+            return await asyncio.shield(asyncio.wrap_future(future))
+            
+        try:
+            name = await fetch()
+            self._store(key, name)
+            return name
+        finally:
+            self._finish(key, future, name)
+    
+    def clear(self) -> None:
+        """Bellekteki tüm yazar adlarını siler."""
+        with self._lock:
+            self._names.clear()
+    
+    def stats(self) -> dict:
+        """
+        Bellek istatistiklerini döndürür.
+        
+        Returns:
+            dict: entries, max_entries, ttl, hits, misses ve coalesced (süren bir
+                isteğe eklenen sorgu sayısı)
+        """
+        return {
+            "entries": len(self._names),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced
+        }
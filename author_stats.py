@@ -0,0 +1,159 @@
+"""
+Kütüphane Yönetim Sistemi - Yazar İstatistikleri
+
+Yazar başına kitap sayılarını ekleme ve silmelerle birlikte güncel tutar; böylece
+istatistikler her istekte tüm katalog taranmadan hesaplanır.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+from book import Book
+
+
+class AuthorStats:
+    """
+    Yazar -> kitap sayısı eşlemesini ve en çok kitabı olan yazarı O(1) güncelleyen yapı.
+    
+    Yazarlar kitap sayılarına göre kovalara (bucket) ayrılır. Her ekleme veya
+    silme bir yazarı yalnızca komşu kovaya taşıdığından en yüksek sayı sabit
+    zamanda izlenebilir. Eşitlik durumunda katalogdaki kitapları arasında en
+    önce eklenmiş kitabı olan yazar seçilir (SQLite arka ucundaki ORDER BY
+    c DESC, MIN(seq) ile aynı). Bunun için her kitaba ekleme sırası verilir,
+    güncellenen kitap sırasını korur; her yazarın kitap sıraları ve her kova
+    da yazarların en küçük sırasına göre birer yığın (heap) olarak tutulur.
+    """
+    
+    def __init__(self):
+        """AuthorStats sınıfının constructor'ı."""
+        self._counts: Dict[str, int] = {}
+        # Kitap sayısı -> o sayıda kitabı olan yazarlar (sıralı küme olarak dict)
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        # Kitap sayısı -> (yazarın en küçük kitap sırası, yazar) yığını; kovadan
+        # çıkan yazarların ve eskimiş sıraların kayıtları top() sırasında atılır
+        self._heaps: Dict[int, List[Tuple[int, str]]] = {}
+        # ISBN -> kitabın ekleme sırası
+        self._seqs: Dict[str, int] = {}
+        # Yazar -> kitaplarının ekleme sıraları (yığın); en üstteki her zaman
+        # katalogdaki bir kitabındır, silinenler (yazar, sıra) olarak _dead içinde bekler
+        self._author_seqs: Dict[str, List[int]] = {}
+        self._dead: Set[Tuple[str, int]] = set()
+        self._seq = 0
+        self._max_count = 0
+        self._total = 0
+    
+    def _first_seq(self, author: str) -> int:
+        return self._author_seqs[author][0]
+    
+    def _move(self, author: str, old_count: int, new_count: int) -> None:
+        if old_count:
+            bucket = self._buckets[old_count]
+            del bucket[author]
+            if not bucket:
+                del self._buckets[old_count]
+                del self._heaps[old_count]
+        if new_count:
+            self._counts[author] = new_count
+            bucket = self._buckets.setdefault(new_count, {})
+            bucket[author] = None
+            heap = self._heaps.setdefault(new_count, [])
+            heapq.heappush(heap, (self._first_seq(author), author))
+            # Eskimiş kayıtlar birikirse yığını kovadaki yazarlardan yeniden kur
+            if len(heap) > 2 * len(bucket) + 8:
+                heap[:] = [(self._first_seq(name), name) for name in bucket]
+                heapq.heapify(heap)
+        else:
+            del self._counts[author]
+    
+    def _add(self, author: str, seq: int) -> None:
+        heapq.heappush(self._author_seqs.setdefault(author, []), seq)
+        count = self._counts.get(author, 0)
+        self._move(author, count, count + 1)
+        self._total += 1
+        if count + 1 > self._max_count:
+            self._max_count = count + 1
+    
+    def _remove(self, author: str, seq: int) -> None:
+        seqs = self._author_seqs[author]
+        if seqs[0] == seq:
+            heapq.heappop(seqs)
+            while seqs and (author, seqs[0]) in self._dead:
+                self._dead.discard((author, heapq.heappop(seqs)))
+            if not seqs:
+                del self._author_seqs[author]
+        else:
+            self._dead.add((author, seq))
+        count = self._counts[author]
+        self._move(author, count, count - 1)
+        self._total -= 1
+        # Yazar bir alt kovaya geçtiği için en yüksek sayı en fazla bir azalır
+        if count == self._max_count and count not in self._buckets:
+            self._max_count -= 1
+    
+    def add(self, book: Book) -> None:
+        """Kitabı ekler ve yazarının kitap sayısını bir artırır."""
+        seq = self._seq
+        self._seq += 1
+        self._seqs[book.isbn] = seq
+        self._add(book.author, seq)
+    
+    def replace(self, old_book: Book, new_book: Book) -> None:
+        """Aynı ISBN'li kitabı günceller; kitap ekleme sırasını korur."""
+        seq = self._seqs.get(old_book.isbn)
+        if seq is None:
+            self.add(new_book)
+        elif old_book.author != new_book.author:
+            self._remove(old_book.author, seq)
+            self._add(new_book.author, seq)
+    
+    def remove(self, book: Book) -> None:
+        """Kitabı çıkarır ve yazarının kitap sayısını bir azaltır."""
+        seq = self._seqs.pop(book.isbn, None)
+        if seq is not None:
+            self._remove(book.author, seq)
+    
+    def clear(self) -> None:
+        """Tüm sayıları sıfırlar."""
+        self._counts = {}
+        self._buckets = {}
+        self._heaps = {}
+        self._seqs = {}
+        self._author_seqs = {}
+        self._dead = set()
+        self._seq = 0
+        self._max_count = 0
+        self._total = 0
+    
+    def count(self, author: str) -> int:
+        """Yazarın kitap sayısını döndürür."""
+        return self._counts.get(author, 0)
+    
+    def top(self) -> Tuple[Optional[str], int]:
+        """
+        En çok kitabı olan yazarı ve kitap sayısını döndürür.
+        
+        Returns:
+            Tuple[Optional[str], int]: Yazar adı (kitap yoksa None) ve kitap sayısı
+        """
+        if not self._max_count:
+            return None, 0
+        bucket = self._buckets[self._max_count]
+        heap = self._heaps[self._max_count]
+        while heap[0][1] not in bucket or self._first_seq(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][1], self._max_count
+    
+    def stats(self) -> dict:
+        """
+        Kitap sayısı, farklı yazar sayısı ve en çok kitabı olan yazarı döndürür.
+        
+        Returns:
+            dict: total_books, unique_authors, authors_with_most_books ve
+                most_books_count anahtarlarını içeren sözlük
+        """
+        author, count = self.top()
+        return {
+            "total_books": self._total,
+            "unique_authors": len(self._counts),
+            "authors_with_most_books": author,
+            "most_books_count": count
+        }
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Kütüphane Yönetim Sistemi - ISBN Ekleme Benchmark'ı
+
+ISBN ile kitap ekleme yolunu (add_book_by_isbn, add_book_by_isbn_async,
+add_books_by_isbn veya POST /books) yerel sahte Open Library sunucusuna karşı
+farklı eş zamanlılık düzeylerinde çalıştırır; saniyedeki işlem sayısını ve
+gecikme yüzdeliklerini raporlar.
+
+Kullanım:
+    python benchmark_lookup.py --mode sync --concurrency 1 4 16 --requests 500 --latency 0.02
+    python benchmark_lookup.py --mode api --concurrency 8 32 --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+import httpx
+from fake_openlibrary import FakeOpenLibrary
+from library import Library
+from openlibrary import OpenLibraryClient
+
+
+MODES = ("sync", "async", "batch", "api")
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Sıralı listenin p yüzdeliğini döndürür (0-1 arası)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def run_sync(library: Library, isbns: List[str], concurrency: int) -> List[Optional[float]]:
+    """add_book_by_isbn'i iş parçacığı havuzuyla çalıştırır; her çağrının süresini döndürür."""
+    def add(isbn: str) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            library.add_book_by_isbn(isbn)
+        except ValueError:
+            return None
+        return time.perf_counter() - started
+        
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(add, isbns))
+
+
+async def run_async(add: Callable, isbns: List[str], concurrency: int) -> List[Optional[float]]:
+    """Asenkron ekleme fonksiyonunu en fazla concurrency görevle çalıştırır."""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def timed(isbn: str) -> Optional[float]:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok = await add(isbn)
+            except ValueError:
+                return None
+            return time.perf_counter() - started if ok else None
+            
+    return await asyncio.gather(*(timed(isbn) for isbn in isbns))
+
+
+def run_batch(library: Library, isbns: List[str], concurrency: int) -> List[Optional[float]]:
+    """add_books_by_isbn'i tek çağrıda çalıştırır; toplam süre tüm kitaplara yazılır."""
+    started = time.perf_counter()
+    summary = library.add_books_by_isbn(isbns, concurrency=concurrency)
+    elapsed = time.perf_counter() - started
+    return [elapsed if result["status"] == "added" else None for result in summary["results"]]
+
+
+def run_api(base_url: str, library_file: str, isbns: List[str], concurrency: int) -> List[Optional[float]]:
+    """POST /books uç noktasını ASGI transport üzerinden çalıştırır."""
+    os.environ["OPENLIBRARY_URL"] = base_url
+    os.environ["LIBRARY_FILE"] = library_file
+    os.environ["OPENLIBRARY_CACHE_FILE"] = ":memory:"
+    import api
+    
+    async def scenario() -> List[Optional[float]]:
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            async def add(isbn: str) -> bool:
+                response = await client.post("/books", json={"isbn": isbn})
+                return response.status_code == 200
+            return await run_async(add, isbns, concurrency)
+            
+    try:
+        return asyncio.run(scenario())
+    finally:
+        api.library.close()
+        # Sonraki çalıştırmada kütüphane yeniden oluşturulsun
+        del sys.modules["api"]
+
+
+def benchmark(mode: str, server: FakeOpenLibrary, concurrency: int, requests: int, offset: int) -> dict:
+    """Tek bir eş zamanlılık düzeyi için benchmark'ı çalıştırır ve sonuçları döndürür."""
+    isbns = [f"978{offset + i:010d}" for i in range(requests)]
+    temp_dir = tempfile.mkdtemp()
+    library_file = os.path.join(temp_dir, "library.json")
+    try:
+        started = time.perf_counter()
+        if mode == "api":
+            latencies = run_api(server.base_url, library_file, isbns, concurrency)
+        else:
+            client = OpenLibraryClient(server.base_url, max_connections=max(20, concurrency))
+            library = Library(library_file, openlibrary=client, write_policy="batch")
+            try:
+                if mode == "sync":
+                    latencies = run_sync(library, isbns, concurrency)
+                elif mode == "async":
+                    async def scenario():
+                        try:
+                            return await run_async(library.add_book_by_isbn_async, isbns, concurrency)
+                        finally:
+                            await client.aclose()
+                    latencies = asyncio.run(scenario())
+                else:
+                    latencies = run_batch(library, isbns, concurrency)
+            finally:
+                library.close()
+                client.close()
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        
+    succeeded = sorted(latency for latency in latencies if latency is not None)
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": requests,
+        "failed": requests - len(succeeded),
+        "throughput": len(succeeded) / elapsed if elapsed else 0.0,
+        "p50": percentile(succeeded, 0.50),
+        "p95": percentile(succeeded, 0.95),
+        "p99": percentile(succeeded, 0.99)
+    }
+
+
+def main() -> None:
+    """Komut satırı argümanlarını okur, benchmark'ı çalıştırır ve tabloyu yazdırır."""
+    parser = argparse.ArgumentParser(description="ISBN ile kitap ekleme benchmark'ı")
+    parser.add_argument("--mode", choices=MODES, default="sync")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="Her düzeyde eklenecek ISBN sayısı")
+    parser.add_argument("--latency", type=float, default=0.02, help="Sahte sunucu gecikmesi (saniye)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Sahte sunucu ek gecikme üst sınırı")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Sahte sunucu 503 oranı")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="Sahte sunucu 404 oranı")
+    args = parser.parse_args()
+    
+    print(f"{'mod':<6} {'eşz.':>5} {'istek':>6} {'hata':>5} {'işlem/sn':>10} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    with FakeOpenLibrary(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         not_found_rate=args.not_found_rate, seed=1) as server:
+        for run, concurrency in enumerate(args.concurrency):
+            # Her düzey farklı ISBN'lerle çalışır, önceki düzeyin önbelleği kullanılmaz
+            result = benchmark(args.mode, server, concurrency, args.requests, run * args.requests)
+            print(f"{result['mode']:<6} {result['concurrency']:>5} {result['requests']:>6} "
+                  f"{result['failed']:>5} {result['throughput']:>10.1f} {result['p50'] * 1000:>8.1f} "
+                  f"{result['p95'] * 1000:>8.1f} {result['p99'] * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
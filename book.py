@@ -1,4 +1,5 @@
 import re
+import sys
 import html
 from typing import Optional
 
@@ -13,6 +14,9 @@ class Book:
         isbn (str): Kitabın benzersiz ISBN numarası
     """
     
+    # Örnek başına __dict__ oluşturulmaz; büyük kataloglarda bellek tasarrufu sağlar
+    __slots__ = ("title", "author", "isbn")
+    
     def __init__(self, title: str, author: str, isbn: str):
         """
         Book sınıfının constructor'ı.
@@ -26,8 +30,23 @@ class Book:
             ValueError: Geçersiz giriş değerleri için
         """
         self.title = self._validate_title(title)
-        self.author = self._validate_author(author)
+        # Aynı yazar adı binlerce kitapta tek bir string nesnesini paylaşır
+        self.author = sys.intern(self._validate_author(author))
         self.isbn = self._validate_isbn(isbn)
+    
+    @classmethod
+    def _from_validated(cls, title: str, author: str, isbn: str) -> 'Book':
+        """
+        Daha önce doğrulanmış ve temizlenmiş alanlardan Book nesnesi oluşturur.
+        
+        Doğrulama ve HTML escape tekrar yapılmaz; yalnızca Book nesnelerinden
+        alınmış değerlerle kullanılmalıdır.
+        """
+        book = cls.__new__(cls)
+        book.title = title
+        book.author = author
+        book.isbn = isbn
+        return book
         
     @staticmethod
     def _validate_title(title: str) -> str:
@@ -0,0 +1,116 @@
+"""
+Kütüphane Yönetim Sistemi - Sütun Tabanlı Kitap Deposu
+
+Çok büyük kataloglarda her kitap için ayrı bir Book nesnesi ve başlık dizgisi
+tutmak yerine başlıkları tek bir UTF-8 arabelleğinde, yazar numaralarını ve
+başlık sınırlarını da array'lerde saklar.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional
+from book import Book
+
+
+class BookStore:
+    """
+    Kitapları sütunlar halinde saklayan, ISBN -> Book sözlüğü gibi kullanılabilen depo.
+    
+    Başlıklar UTF-8 olarak tek bir bytearray'e art arda yazılır ve her satırın
+    bitiş konumu array('Q') içinde tutulur; satır başına bir str nesnesi
+    oluşmaz. Yazar adları bir kez saklanır ve kitaplar yazarlarını array('I')
+    içindeki numara ile gösterir. Book nesneleri yalnızca istendiğinde
+    oluşturulur. Güncellenen kitap yeni bir satıra yazılır; eski ve silinen
+    satırlar boş bırakılır ve sayıları yeterince artınca depo sıkıştırılır.
+    Ekleme sırası (ISBN -> satır sözlüğünün sırası) korunur.
+    """
+    
+    # Kullanılmayan satır sayısı bu değeri ve canlı satır sayısını geçince sıkıştırılır
+    COMPACT_MIN_DEAD_ROWS = 1024
+    
+    def __init__(self):
+        """BookStore sınıfının constructor'ı."""
+        self._title_data = bytearray()
+        self._title_ends = array('Q')
+        self._author_ids = array('I')
+        self._authors: List[str] = []
+        self._author_index: Dict[str, int] = {}
+        self._rows: Dict[str, int] = {}
+        self._dead_rows = 0
+    
+    def _author_id(self, author: str) -> int:
+        """Yazar adının numarasını döndürür, yoksa yeni numara verir."""
+        author_id = self._author_index.get(author)
+        if author_id is None:
+            author_id = len(self._authors)
+            self._authors.append(sys.intern(author))
+            self._author_index[author] = author_id
+        return author_id
+    
+    def _append_row(self, title: bytes, author_id: int) -> int:
+        self._title_data += title
+        self._title_ends.append(len(self._title_data))
+        self._author_ids.append(author_id)
+        return len(self._title_ends) - 1
+    
+    def _book_at(self, isbn: str, row: int) -> Book:
+        start = self._title_ends[row - 1] if row else 0
+        title = self._title_data[start:self._title_ends[row]].decode('utf-8')
+        return Book._from_validated(title, self._authors[self._author_ids[row]], isbn)
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __contains__(self, isbn: str) -> bool:
+        return isbn in self._rows
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+    
+    def __setitem__(self, isbn: str, book: Book) -> None:
+        """Kitabı ekler; ISBN zaten varsa kitabın sıradaki yeri korunarak güncellenir."""
+        replaced = isbn in self._rows
+        self._rows[isbn] = self._append_row(book.title.encode('utf-8'), self._author_id(book.author))
+        if replaced:
+            self._mark_dead()
+    
+    def get(self, isbn: str) -> Optional[Book]:
+        """ISBN'e göre kitabı döndürür, yoksa None."""
+        row = self._rows.get(isbn)
+        return None if row is None else self._book_at(isbn, row)
+    
+    def pop(self, isbn: str, default: Optional[Book] = None) -> Optional[Book]:
+        """Kitabı siler ve döndürür, yoksa default."""
+        row = self._rows.pop(isbn, None)
+        if row is None:
+            return default
+            
+        book = self._book_at(isbn, row)
+        self._mark_dead()
+        return book
+    
+    def values(self) -> Iterator[Book]:
+        """Kitapları ekleme sırasıyla tek tek oluşturarak döndürür."""
+        for isbn in list(self._rows):
+            book = self.get(isbn)
+            if book is not None:
+                yield book
+    
+    def _mark_dead(self) -> None:
+        self._dead_rows += 1
+        if self._dead_rows > self.COMPACT_MIN_DEAD_ROWS and self._dead_rows > len(self._rows):
+            self._compact()
+    
+    def _compact(self) -> None:
+        """Kullanılmayan satırları sütunlardan çıkarır."""
+        old_rows = self._rows
+        title_ends, author_ids = self._title_ends, self._author_ids
+        title_data = self._title_data
+        self._title_data = bytearray()
+        self._title_ends = array('Q')
+        self._author_ids = array('I')
+        self._rows = {}
+        for isbn, row in old_rows.items():
+            start = title_ends[row - 1] if row else 0
+            self._rows[isbn] = self._append_row(title_data[start:title_ends[row]], author_ids[row])
+        self._dead_rows = 0
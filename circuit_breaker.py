@@ -0,0 +1,175 @@
+"""
+Kütüphane Yönetim Sistemi - Devre Kesici
+
+Open Library yavaşladığında veya hata verdiğinde her isteğin zaman aşımını
+beklemesi yerine, hata oranı eşiği aşılınca istekleri bir süre hiç göndermeden
+hemen başarısız sayar (circuit breaker).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional
+import httpx
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.RequestError):
+    """Devre kesici açıkken istek gönderilmediğinde fırlatılır."""
+
+
+def _caller() -> object:
+    """Çağıran asyncio görevini, yoksa iş parçacığını döndürür (deneme isteğinin sahibi)."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task if task is not None else threading.get_ident()
+
+
+class CircuitBreaker:
+    """
+    Son isteklerin hata oranına göre açılan devre kesici.
+    
+    closed: istekler normal gönderilir. Son window isteğin en az min_requests
+    tanesi sonuçlanmış ve hata oranı failure_threshold değerine ulaşmışsa devre
+    açılır (open). reset_timeout süresince istek gönderilmez; süre dolunca tek
+    bir deneme isteğine izin verilir (half_open). Deneme başarılıysa devre
+    kapanır, başarısızsa yeniden açılır.
+    """
+    
+    def __init__(self, failure_threshold: float = 0.5, window: int = 20,
+                 min_requests: int = 10, reset_timeout: float = 30.0):
+        """
+        CircuitBreaker sınıfının constructor'ı.
+        
+        Args:
+            failure_threshold (float): Devreyi açan hata oranı (0-1 arası)
+            window (int): Hata oranı hesaplanırken bakılan son istek sayısı
+            min_requests (int): Devrenin açılabilmesi için gereken en az istek sayısı
+            reset_timeout (float): Devrenin açık kalacağı süre (saniye)
+            
+        Raises:
+            ValueError: Parametreler geçersizse
+        """
+        if not 0 < failure_threshold <= 1:
+            raise ValueError("failure_threshold 0 ile 1 arasında olmalıdır")
+        if window < 1 or not 1 <= min_requests <= window or reset_timeout <= 0:
+            raise ValueError("window, min_requests ve reset_timeout pozitif olmalıdır")
+            
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.trips = 0
+        self.rejected = 0
+        self._results: deque = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._trial_owner: object = None
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """
+        Bir isteğin gönderilip gönderilemeyeceğini döndürür.
+        
+        Returns:
+            bool: Devre kapalıysa veya deneme isteği hakkı varsa True
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+                
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self._trial_owner = _caller()
+                return True
+                
+            self.rejected += 1
+            return False
+    
+    def record_success(self) -> None:
+        """Başarılı bir isteği kaydeder."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._results.clear()
+            self._results.append(True)
+    
+    def record_failure(self) -> None:
+        """Başarısız bir isteği (ağ hatası, zaman aşımı veya 5xx) kaydeder."""
+        with self._lock:
+            self._results.append(False)
+            if self.state == HALF_OPEN:
+                self._open()
+                return
+                
+            failures = self._results.count(False)
+            if (self.state == CLOSED and len(self._results) >= self.min_requests
+                    and failures / len(self._results) >= self.failure_threshold):
+                self._open()
+    
+    def release_trial(self) -> None:
+        """
+        Çağıranın aldığı deneme isteği hakkını, sonuç kaydedilmeden biten istekler
+        (ör. iptal veya beklenmeyen hata) için geri verir; aksi halde devre
+        half_open durumunda kalır ve hiçbir istek gönderilemez. Çağıran deneme
+        isteğinin sahibi değilse bir şey yapmaz.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN and self._trial_in_flight and self._trial_owner == _caller():
+                self._trial_in_flight = False
+                self._trial_owner = None
+    
+    def _open(self) -> None:
+        """Devreyi açar; kilit tutulurken çağrılmalıdır."""
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+        self.trips += 1
+    
+    @property
+    def is_open(self) -> bool:
+        """Devre açıksa ve bekleme süresi dolmamışsa True döndürür."""
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self._opened_at < self.reset_timeout
+    
+    def reset(self) -> None:
+        """Devreyi kapatır ve geçmişi siler."""
+        with self._lock:
+            self.state = CLOSED
+            self._results.clear()
+            self._opened_at = None
+            self._trial_in_flight = False
+    
+    def stats(self) -> dict:
+        """
+        Devre kesicinin durumunu döndürür.
+        
+        Returns:
+            dict: state, window_requests, window_failures, error_rate, trips,
+                rejected ve devre açıksa yeniden denemeye kalan süre (retry_in)
+        """
+        with self._lock:
+            requests = len(self._results)
+            failures = self._results.count(False)
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            return {
+                "state": self.state,
+                "window_requests": requests,
+                "window_failures": failures,
+                "error_rate": failures / requests if requests else 0.0,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in": retry_in
+            }
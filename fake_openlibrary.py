@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Kütüphane Yönetim Sistemi - Yerel Sahte Open Library Sunucusu
+
+Benchmark ve uçtan uca testler için openlibrary.org yerine kullanılabilen,
+http.server tabanlı küçük bir sunucu. /isbn/{isbn}.json, /authors/{key}.json
+ve /api/books?bibkeys=... isteklerini fixture dosyasından veya ISBN'den
+türetilen sentetik verilerle yanıtlar. Yanıt gecikmesi ve hata oranı
+ayarlanabilir.
+
+Kullanım:
+    python fake_openlibrary.py --port 8081 --latency 0.05 --error-rate 0.01
+    OPENLIBRARY_URL=http://127.0.0.1:8081 uvicorn api:app
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+ISBN_PATH = re.compile(r"^/isbn/([\dX\-]+)\.json$")
+AUTHOR_PATH = re.compile(r"^(/authors/[A-Za-z0-9]+)\.json$")
+
+
+class FakeOpenLibrary:
+    """
+    Arka planda çalışan sahte Open Library sunucusu.
+    
+    fixtures verilirse yalnızca içindeki kitaplar ve yazarlar bilinir, diğerleri
+    için 404 döner. Verilmezse her ISBN için sentetik bir kitap üretilir; kitaplar
+    author_count farklı yazar arasında paylaştırılır.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, not_found_rate: float = 0.0,
+                 fixtures: Optional[dict] = None, author_count: int = 100, seed: Optional[int] = None):
+        """
+        FakeOpenLibrary sınıfının constructor'ı.
+        
+        Args:
+            host (str): Dinlenecek adres
+            port (int): Dinlenecek port; 0 ise boş bir port seçilir
+            latency (float): Her yanıttan önceki ortalama gecikme (saniye)
+            jitter (float): Gecikmeye eklenecek rastgele sapmanın üst sınırı (saniye)
+            error_rate (float): 503 döndürülecek isteklerin oranı (0-1)
+            not_found_rate (float): Sentetik veride 404 döndürülecek ISBN oranı (0-1)
+            fixtures (Optional[dict]): {"editions": {isbn: kitap}, "authors": {anahtar: yazar}}
+                biçiminde sabit veriler
+            author_count (int): Sentetik veride kullanılacak farklı yazar sayısı
+            seed (Optional[int]): Rastgele sayı üreteci için başlangıç değeri
+        """
+        if not 0 <= error_rate <= 1 or not 0 <= not_found_rate <= 1:
+            raise ValueError("error_rate ve not_found_rate 0 ile 1 arasında olmalıdır")
+            
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.not_found_rate = not_found_rate
+        self.fixtures = fixtures
+        self.author_count = max(1, author_count)
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        """Sunucunun adresi (OpenLibraryClient base_url parametresi için)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def edition(self, isbn: str) -> Optional[dict]:
+        """ISBN'e ait kitap verisini döndürür; bilinmiyorsa None."""
+        if self.fixtures is not None:
+            return self.fixtures.get("editions", {}).get(isbn)
+            
+        digits = int(re.sub(r"\D", "", isbn) or 0)
+        # Aynı ISBN her zaman aynı sonucu verir
+        if random.Random(digits).random() < self.not_found_rate:
+            return None
+        return {
+            "title": f"Kitap {isbn}",
+            "authors": [{"key": f"/authors/OL{digits % self.author_count + 1}A"}],
+            "isbn_13": [isbn]
+        }
+    
+    def author(self, key: str) -> Optional[dict]:
+        """Yazar anahtarına ait yazar verisini döndürür; bilinmiyorsa None."""
+        if self.fixtures is not None:
+            return self.fixtures.get("authors", {}).get(key)
+        match = re.match(r"^/authors/OL(\d+)A$", key)
+        return {"key": key, "name": f"Yazar {match.group(1)}"} if match else None
+    
+    def bibkeys(self, query: str) -> dict:
+        """/api/books?bibkeys=ISBN:...&jscmd=data yanıtını oluşturur."""
+        result = {}
+        for bibkey in parse_qs(query).get("bibkeys", [""])[0].split(","):
+            isbn = bibkey.split(":", 1)[-1]
+            edition = self.edition(isbn) if bibkey.startswith("ISBN:") else None
+            if edition is None:
+                continue
+            authors = []
+            for author_ref in edition.get("authors", []):
+                author = self.author(author_ref.get("key", ""))
+                if author:
+                    authors.append({"url": f"{self.base_url}{author_ref['key']}", "name": author.get("name")})
+            result[bibkey] = {"title": edition.get("title"), "authors": authors}
+        return result
+    
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+    
+    def _fail(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Başlık ve gövde ayrı yazıldığından Nagle gecikmesi ölçümleri bozmasın
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                time.sleep(server._delay())
+                if server._fail():
+                    self._respond(503, {"error": "Hizmet geçici olarak kullanılamıyor"})
+                    return
+                    
+                url = urlparse(self.path)
+                isbn_match = ISBN_PATH.match(url.path)
+                author_match = AUTHOR_PATH.match(url.path)
+                if isbn_match:
+                    body = server.edition(isbn_match.group(1))
+                elif author_match:
+                    body = server.author(author_match.group(1))
+                elif url.path == "/api/books":
+                    body = server.bibkeys(url.query)
+                else:
+                    body = None
+                if body is None:
+                    self._respond(404, {"error": "notfound"})
+                else:
+                    self._respond(200, body)
+            
+            def _respond(self, status: int, body: dict):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                # Benchmark çıktısını kirletmemek için istek günlüğü yazılmaz
+                pass
+                
+        return Handler
+    
+    def start(self) -> 'FakeOpenLibrary':
+        """Sunucuyu arka plandaki bir iş parçacığında başlatır."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self) -> None:
+        """Sunucuyu bu iş parçacığında, durdurulana kadar çalıştırır."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+    
+    def stop(self) -> None:
+        """Sunucuyu durdurur."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def __enter__(self) -> 'FakeOpenLibrary':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Sahte sunucuyu komut satırından başlatır."""
+    parser = argparse.ArgumentParser(description="Yerel sahte Open Library sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Ortalama gecikme (saniye)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Rastgele ek gecikme üst sınırı (saniye)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 döndürülecek istek oranı")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="404 döndürülecek ISBN oranı")
+    parser.add_argument("--fixtures", help="editions/authors içeren JSON fixture dosyası")
+    args = parser.parse_args()
+    
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, "r", encoding="utf-8") as file:
+            fixtures = json.load(file)
+            
+    server = FakeOpenLibrary(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                             error_rate=args.error_rate, not_found_rate=args.not_found_rate,
+                             fixtures=fixtures)
+    print(f"Sahte Open Library {server.base_url} adresinde çalışıyor (Ctrl+C ile durdurun)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,188 @@
+import asyncio
+import csv
+import io
+import itertools
 import json
-import os
 import html
+import threading
 import httpx
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from book import Book
+from circuit_breaker import CircuitOpenError
+from author_memo import AuthorMemo
+from metadata_cache import MetadataCache
+from negative_cache import NegativeCache
+from offline_index import OfflineIndex
+from openlibrary import OpenLibraryClient
+from storage import StorageBackend, open_storage, write_binary_catalog
+
+
+CONFLICT_POLICIES = ("skip", "replace", "error")
+EXPORT_FORMATS = ("ndjson", "csv")
+NOT_FOUND_MESSAGE = "Kitap Open Library'de bulunamadı"
+UNAVAILABLE_MESSAGE = "Open Library geçici olarak kullanılamıyor, lütfen daha sonra tekrar deneyin"
+
+# Toplu işlemlerin özetinde sayılan durumlar
+ADD_STATUSES = ("added", "replaced", "skipped", "failed")
+REMOVE_STATUSES = ("removed", "not_found", "failed")
+PREFETCH_STATUSES = ("fetched", "cached", "skipped", "not_found", "failed")
+
+
+def count_statuses(statuses: Iterable[str], names: Tuple[str, ...]) -> Dict[str, int]:
+    """
+    Toplu işlem sonuçlarının durumlarını sayar; "error" durumu failed olarak sayılır.
+    
+    Args:
+        statuses (Iterable[str]): Her sonucun durumu
+        names (Tuple[str, ...]): Özette yer alacak durumlar (sayılmayanlar 0 olur)
+        
+    Returns:
+        Dict[str, int]: Durum -> sonuç sayısı
+    """
+    counts = dict.fromkeys(names, 0)
+    for status in statuses:
+        counts["failed" if status == "error" else status] += 1
+    return counts
+
+
+class OpenLibraryUnavailableError(ValueError):
+    """
+    Open Library'ye ulaşılamadığında (devre kesici açık, ağ hatası veya sunucu
+    hatası) fırlatılır; kitabın bulunamadığı durumlardan ayırt edilebilmesi için
+    ValueError'ın alt sınıfıdır.
+    """
 
 
 class Library:
     """
     Kütüphane yönetim sınıfı.
     
-    Kitapları yönetir, JSON dosyasına kaydeder ve yükler.
+    Kitapları yönetir; saklama işini bir depolama arka ucuna (varsayılan olarak
+    JSON dosyası) devreder. Depolamaya erişim tek bir kilitle korunduğundan aynı
+    nesne birden çok iş parçacığından kullanılabilir.
     """
     
-    def __init__(self, filename: str = "library.json"):
+    def __init__(self, filename: str = "library.json",
+                 backend: Union[str, StorageBackend, None] = None,
+                 openlibrary: Optional[OpenLibraryClient] = None,
+                 metadata_cache: Union[str, MetadataCache, None] = None,
+                 author_memo: Optional[AuthorMemo] = None,
+                 negative_cache: Optional[NegativeCache] = None,
+                 offline_index: Union[str, OfflineIndex, None] = None, **storage_options):
         """
         Library sınıfının constructor'ı.
         
         Args:
-            filename (str): Kitapların saklanacağı JSON dosyasının adı
+            filename (str): Kitapların saklanacağı dosyanın adı
+            backend (Union[str, StorageBackend, None]): "json", "sqlite", "binary"
+                veya hazır bir StorageBackend nesnesi; None ise dosya uzantısına göre
+                seçilir (.db/.sqlite/.sqlite3 için SQLite, .bcat için salt okunur
+                ikili katalog, diğerleri için JSON)
+            openlibrary (Optional[OpenLibraryClient]): Open Library istekleri için
+                kullanılacak istemci; None ise varsayılan ayarlarla oluşturulur ve
+                close() ile kapatılır
+            metadata_cache (Union[str, MetadataCache, None]): Open Library kitap ve
+                yazar yanıtları için kalıcı önbellek veya önbellek dosyasının adı;
+                None ise önbellek kullanılmaz
+            author_memo (Optional[AuthorMemo]): Yazar adları için bellek; None ise
+                varsayılan ayarlarla (1 saat TTL) oluşturulur
+            negative_cache (Optional[NegativeCache]): Open Library'de bulunamayan
+                ISBN'lerin listesi; None ise varsayılan ayarlarla (5 dakika TTL)
+                oluşturulur
+            offline_index (Union[str, OfflineIndex, None]): Open Library dump'larından
+                oluşturulmuş yerel ISBN indeksi veya indeks dosyasının adı; verilirse
+                kitaplar önce burada aranır
+            **storage_options: Depolama arka ucuna iletilen ek ayarlar (ör. JSON
+                için journal, write_policy, file_format; bkz. storage.JSONStorage)
         """
         self.filename = filename
-        self.books: List[Book] = []
+        if isinstance(backend, StorageBackend):
+            self.storage = backend
+        else:
+            self.storage = open_storage(filename, backend, **storage_options)
+        self._owns_openlibrary = openlibrary is None
+        self.openlibrary = openlibrary if openlibrary is not None else OpenLibraryClient()
+        self._owns_metadata_cache = isinstance(metadata_cache, str)
+        self.metadata_cache = MetadataCache(metadata_cache) if self._owns_metadata_cache else metadata_cache
+        self.author_memo = author_memo if author_memo is not None else AuthorMemo()
+        self.negative_cache = negative_cache if negative_cache is not None else NegativeCache()
+        self._owns_offline_index = isinstance(offline_index, str)
+        self.offline_index = OfflineIndex(offline_index) if self._owns_offline_index else offline_index
+        # Bu süreçteki her değişiklikte artan sürüm numarası; bkz. version
+        self._version = 0
+        self._version_lock = threading.Lock()
+        # Depolamaya erişen tüm okuma ve yazma işlemleri bu kilitle sıralanır;
+        # API'de değişiklikler iş parçacığı havuzunda, okumalar olay döngüsünde
+        # çalışır ve arka ucun sözlükleri, arama indeksi ile yazar sayıları
+        # aynı anda değiştirilip okunmamalıdır
+        self._lock = threading.RLock()
         self.load_books()
     
+    def __enter__(self) -> 'Library':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _bump_version(self) -> None:
+        """Katalog sürümünü bir artırır; kitap ekleyen veya silen her işlemden sonra çağrılır."""
+        with self._version_lock:
+            self._version += 1
+    
+    @property
+    def version(self) -> int:
+        """
+        Katalog her değiştiğinde artan sürüm numarası (ör. HTTP ETag'leri ve
+        yanıt önbelleği için).
+        
+        Başka süreçlerle paylaşılabilen arka uçlarda (SQLite) sürüm depodan
+        okunur; böylece başka bir sürecin yaptığı değişiklikler de sürümü artırır.
+        
+        Returns:
+            int: Katalog sürümü
+        """
+        with self._lock:
+            shared = self.storage.shared_version()
+        return self._version if shared is None else shared
+    
+    @property
+    def books(self) -> List[Book]:
+        """
+        Kütüphanedeki kitapları ekleme sırasıyla döndürür.
+        
+        Returns:
+            List[Book]: Kitapların listesi
+        """
+        with self._lock:
+            return list(self.storage.iter_books())
+    
+    def get_books_page(self, limit: int, after: Optional[str] = None) -> Tuple[List[Book], Optional[str]]:
+        """
+        Kitapları ISBN sırasına göre sayfa sayfa döndürür; yalnızca istenen
+        sayfadaki kitaplar okunur.
+        
+        Args:
+            limit (int): Sayfadaki en fazla kitap sayısı
+            after (Optional[str]): Önceki sayfanın son ISBN'i; None ise ilk sayfa
+            
+        Returns:
+            Tuple[List[Book], Optional[str]]: Sayfadaki kitaplar ve sonraki sayfa
+                için after değeri (son sayfada None)
+                
+        Raises:
+            ValueError: limit 1'den küçükse
+        """
+        if limit < 1:
+            raise ValueError("limit en az 1 olmalıdır")
+        
+        # Sonraki sayfa olup olmadığını anlamak için bir kitap fazla okunur
+        with self._lock:
+            books = self.storage.page(after, limit + 1)
+        if len(books) > limit:
+            return books[:limit], books[limit - 1].isbn
+        return books, None
+    
     def add_book(self, book: Book) -> bool:
         """
         Kütüphaneye yeni bir kitap ekler.
@@ -38,20 +197,323 @@ class Library:
             ValueError: Kitap eklenirken bir hata oluştuğunda
         """
         try:
-            # ISBN kontrolü - aynı ISBN'li kitap varsa ekleme
-            if self.find_book(book.isbn):
-                print(f"Hata: {book.isbn} ISBN'li kitap zaten mevcut")
-                return False
-            
-            self.books.append(book)
-            self.save_books()
-            return True
+            with self._lock:
+                # ISBN kontrolü - aynı ISBN'li kitap varsa ekleme
+                if self.storage.contains(book.isbn):
+                    print(f"Hata: {book.isbn} ISBN'li kitap zaten mevcut")
+                    return False
+                
+                self.storage.add(book)
+                self._bump_version()
+                return True
             
         except Exception as e:
             # Log the error (in a real app, use proper logging)
             print(f"Hata: Kitap eklenirken bir hata oluştu: {str(e)}")
             raise
     
+    def add_books(self, books: Iterable[Union[Book, dict]], on_conflict: str = "skip") -> dict:
+        """
+        Birden çok kitabı tek doğrulama geçişi ve tek kayıt işlemiyle ekler.
+        
+        Args:
+            books (Iterable[Union[Book, dict]]): Eklenecek kitaplar veya
+                title/author/isbn anahtarlı sözlükler
+            on_conflict (str): ISBN zaten varsa (kütüphanede veya aynı toplu
+                işlemde) yapılacak işlem: "skip" (atla), "replace" (yenisiyle
+                değiştir) veya "error" (hiçbir kitabı eklemeden hata ver)
+            
+        Returns:
+            dict: added, replaced, skipped ve failed sayıları ile her satır için
+                index, isbn, status ("added", "replaced", "skipped", "error") ve
+                gerekirse error bilgisini içeren results listesi
+            
+        Raises:
+            ValueError: Geçersiz on_conflict değerinde veya on_conflict="error"
+                iken çakışan bir ISBN bulunduğunda
+        """
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"Geçersiz çakışma politikası: {on_conflict}")
+        
+        results = []
+        valid: List[Tuple[int, Book]] = []
+        
+        for index, item in enumerate(books):
+            if isinstance(item, Book):
+                valid.append((index, item))
+                continue
+            try:
+                valid.append((index, Book.from_dict(item)))
+            except (KeyError, TypeError, ValueError) as e:
+                isbn = item.get("isbn") if isinstance(item, dict) else None
+                results.append({"index": index, "isbn": isbn, "status": "error", "error": str(e)})
+        
+        # Çakışma kontrolü ile yazma arasında başka bir işlem araya girmemeli
+        with self._lock:
+            to_write: Dict[str, Book] = {}
+            conflicts = []
+            for index, book in valid:
+                if book.isbn not in to_write and not self.storage.contains(book.isbn):
+                    status = "added"
+                elif on_conflict == "replace":
+                    status = "replaced"
+                elif on_conflict == "skip":
+                    results.append({"index": index, "isbn": book.isbn, "status": "skipped"})
+                    continue
+                else:
+                    conflicts.append(book.isbn)
+                    continue
+                
+                to_write[book.isbn] = book
+                results.append({"index": index, "isbn": book.isbn, "status": status})
+            
+            if conflicts:
+                raise ValueError(f"{', '.join(conflicts)} ISBN'li kitap zaten mevcut")
+            
+            self.storage.add_many(list(to_write.values()))
+            if to_write:
+                self._bump_version()
+        
+        results.sort(key=lambda result: result["index"])
+        
+        summary = count_statuses((result["status"] for result in results), ADD_STATUSES)
+        summary["results"] = results
+        return summary
+    
+    def add_books_by_isbn(self, isbns: Iterable[str], concurrency: int = 8,
+                          batch_size: int = 50) -> dict:
+        """
+        Birden çok ISBN için kitap bilgilerini Open Library'den çeker ve tek kayıt
+        işlemiyle ekler.
+        
+        Kitaplar önce /api/books?bibkeys=... uç noktasıyla batch_size'lık gruplar
+        halinde sorgulanır; bu istek başarısız olursa ya da bir ISBN yanıtta yoksa
+        o ISBN'ler tek tek (/isbn/{isbn}.json) çekilir. Aynı yazar toplu işlem
+        boyunca yalnızca bir kez sorgulanır; çevrimdışı indekste veya önbellekte
+        bulunan kitaplar ağa çıkmadan okunur.
+        
+        Args:
+            isbns (Iterable[str]): Eklenecek kitapların ISBN numaraları
+            concurrency (int): Aynı anda yapılacak en fazla istek sayısı
+            batch_size (int): Tek bir bibkeys isteğindeki en fazla ISBN sayısı
+            
+        Returns:
+            dict: add_books ile aynı biçimde added, replaced, skipped ve failed
+                sayıları ile her ISBN için index, isbn, status ve gerekirse error
+                bilgisini içeren results listesi
+                
+        Raises:
+            ValueError: concurrency veya batch_size 1'den küçükse
+        """
+        if concurrency < 1 or batch_size < 1:
+            raise ValueError("concurrency ve batch_size en az 1 olmalıdır")
+            
+        results: Dict[int, dict] = {}
+        to_fetch: Dict[str, int] = {}
+        
+        for index, isbn in enumerate(isbns):
+            try:
+                isbn = Book._validate_isbn(isbn)
+            except (AttributeError, ValueError) as e:
+                results[index] = {"index": index, "isbn": isbn, "status": "error", "error": str(e)}
+                continue
+                
+            if isbn in to_fetch or self._contains(isbn):
+                results[index] = {"index": index, "isbn": isbn, "status": "skipped"}
+            elif isbn in self.negative_cache:
+                results[index] = {"index": index, "isbn": isbn, "status": "error", "error": NOT_FOUND_MESSAGE}
+            else:
+                to_fetch[isbn] = index
+                
+        fetched: Dict[str, dict] = {}
+        errors: Dict[str, str] = {}
+        author_keys: Dict[str, Optional[str]] = {}
+        
+        # 0. Çevrimdışı indekste bulunan kitaplar için ağa çıkılmaz
+        for isbn in to_fetch:
+            entry = self._offline_entry(isbn)
+            if entry is not None:
+                fetched[isbn] = self._book_data(isbn, entry, entry['author'] or 'Bilinmeyen Yazar')
+                if not entry['author']:
+                    author_keys[isbn] = entry['author_key']
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # 1. Toplu sorgu: her grup için tek istek
+            pending = [isbn for isbn in to_fetch if isbn not in fetched]
+            if self.metadata_cache is not None:
+                # Önbellekte olan ISBN'ler ağa çıkmadan tek tek yoldan okunur
+                pending = [isbn for isbn in pending if f"/isbn/{isbn}.json" not in self.metadata_cache]
+            groups = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            for group_data in executor.map(self._fetch_books_bibkeys, groups):
+                fetched.update(group_data)
+                
+            # 2. Toplu sorguda bulunamayan ISBN'ler için tek tek kitap (edition) isteği
+            missing = [isbn for isbn in to_fetch if isbn not in fetched]
+            for isbn, outcome in zip(missing, executor.map(self._fetch_edition, missing)):
+                if isinstance(outcome, Exception):
+                    errors[isbn] = str(outcome)
+                    continue
+                author_keys[isbn] = self._author_key(outcome)
+                fetched[isbn] = self._book_data(isbn, outcome, 'Bilinmeyen Yazar')
+                
+            # 3. Yazar adları: her farklı yazar için tek istek
+            unique_keys = list({key for key in author_keys.values() if key})
+            names = dict(zip(unique_keys, executor.map(self._fetch_author_name, unique_keys)))
+            for isbn, key in author_keys.items():
+                if names.get(key):
+                    fetched[isbn]['author'] = names[key][:200]
+                    
+        books = []
+        for isbn, index in to_fetch.items():
+            if isbn in errors:
+                results[index] = {"index": index, "isbn": isbn, "status": "error", "error": errors[isbn]}
+                continue
+            try:
+                books.append((index, Book(**fetched[isbn])))
+            except ValueError as e:
+                results[index] = {"index": index, "isbn": isbn, "status": "error", "error": str(e)}
+                
+        # Tüm kitaplar tek kayıt işlemiyle eklenir
+        added = self.add_books([book for _, book in books])
+        for (index, _), result in zip(books, added["results"]):
+            results[index] = dict(result, index=index)
+            
+        summary = count_statuses((result["status"] for result in results.values()), ADD_STATUSES)
+        summary["results"] = [results[index] for index in sorted(results)]
+        return summary
+    
+    def prefetch_isbns(self, isbns: Iterable[str], concurrency: int = 8,
+                       progress_callback: Optional[Callable[[int, int], None]] = None) -> dict:
+        """
+        ISBN'lerin kitap ve yazar bilgilerini kütüphaneye eklemeden önbelleğe
+        çeker; sonraki add_book_by_isbn çağrıları ağ isteği beklemeden tamamlanır.
+        
+        Kitaplar add_book_by_isbn'in okuduğu /isbn/{isbn}.json yanıtları olarak
+        saklanır; bulunamayan ISBN'ler bulunamayan ISBN önbelleğine yazılır.
+        
+        Args:
+            isbns (Iterable[str]): Önbelleğe alınacak ISBN numaraları
+            concurrency (int): Aynı anda yapılacak en fazla istek sayısı
+            progress_callback (Optional[Callable[[int, int], None]]): Her ISBN
+                tamamlandığında (tamamlanan, toplam) ile çağrılan fonksiyon
+                
+        Returns:
+            dict: total ile fetched (ağdan çekilen), cached (zaten önbellekte
+                olan), skipped (kütüphanede olan), not_found ve failed sayıları
+                
+        Raises:
+            ValueError: Önbellek (metadata_cache) yoksa veya concurrency 1'den küçükse
+        """
+        if self.metadata_cache is None:
+            raise ValueError("Ön yükleme için metadata_cache ayarlanmalıdır")
+        if concurrency < 1:
+            raise ValueError("concurrency en az 1 olmalıdır")
+            
+        unique = list(dict.fromkeys(isbn.strip() for isbn in isbns if isbn.strip()))
+        statuses = []
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for done, status in enumerate(executor.map(self._prefetch_isbn, unique), 1):
+                statuses.append(status)
+                if progress_callback:
+                    progress_callback(done, len(unique))
+        summary = count_statuses(statuses, PREFETCH_STATUSES)
+        summary["total"] = len(unique)
+        return summary
+    
+    def _prefetch_isbn(self, isbn: str) -> str:
+        """Tek bir ISBN'i önbelleğe çeker ve prefetch_isbns sonuç durumunu döndürür."""
+        try:
+            isbn = Book._validate_isbn(isbn)
+        except ValueError:
+            return "failed"
+        if self._contains(isbn):
+            return "skipped"
+            
+        entry = self._offline_entry(isbn)
+        cached = entry is not None or f"/isbn/{isbn}.json" in self.metadata_cache
+        try:
+            author_key = entry['author_key'] if entry is not None else self._author_key(self._get_edition(isbn))
+        except ValueError as e:
+            return "not_found" if str(e) == NOT_FOUND_MESSAGE else "failed"
+        except (httpx.RequestError, json.JSONDecodeError):
+            return "failed"
+            
+        if author_key and not (entry is not None and entry['author']):
+            self._fetch_author_name(author_key)
+        return "cached" if cached else "fetched"
+    
+    def _fetch_books_bibkeys(self, isbns: List[str]) -> Dict[str, dict]:
+        """
+        Open Library'nin /api/books uç noktasıyla birden çok ISBN'i tek istekte sorgular.
+        
+        Returns:
+            Dict[str, dict]: Bulunan ISBN'ler için kitap bilgileri; istek
+                başarısız olursa boş sözlük (ISBN'ler tek tek çekilir)
+        """
+        bibkeys = ",".join(f"ISBN:{isbn}" for isbn in isbns)
+        try:
+            response = self.openlibrary.get(f"/api/books?bibkeys={bibkeys}&format=json&jscmd=data")
+            if response.status_code != 200:
+                return {}
+            data = response.json()
+        except (httpx.RequestError, json.JSONDecodeError) as e:
+            print(f"Toplu kitap sorgusu başarısız oldu, ISBN'ler tek tek çekilecek: {e}")
+            return {}
+            
+        books = {}
+        for isbn in isbns:
+            entry = data.get(f"ISBN:{isbn}") if isinstance(data, dict) else None
+            if not isinstance(entry, dict):
+                continue
+            author = 'Bilinmeyen Yazar'
+            authors = entry.get('authors') or []
+            if authors and authors[0].get('name'):
+                author = str(authors[0]['name']).strip()
+            books[isbn] = self._book_data(isbn, entry, author)
+        return books
+    
+    def _fetch_edition(self, isbn: str) -> Union[dict, Exception]:
+        """Tek bir ISBN için kitap (edition) verisini çeker; hata durumunda hatayı döndürür."""
+        try:
+            return self._get_edition(isbn)
+        except Exception as e:
+            return self._fetch_error(e)
+    
+    def _fetch_author_name(self, author_key: str) -> Optional[str]:
+        """
+        Yazar adını döndürür; yazar belleğinde yoksa Open Library'den çeker.
+        Aynı yazar için eş zamanlı çağrılar tek bir isteği paylaşır.
+        """
+        return self.author_memo.resolve(author_key, lambda: self._request_author_name(author_key))
+    
+    async def _fetch_author_name_async(self, author_key: str) -> Optional[str]:
+        """_fetch_author_name'in asenkron karşılığı."""
+        return await self.author_memo.resolve_async(
+            author_key, lambda: self._request_author_name_async(author_key)
+        )
+    
+    def _request_author_name(self, author_key: str) -> Optional[str]:
+        """Yazar adını Open Library'den çeker; hata durumunda None döndürür."""
+        try:
+            return self._author_name(
+                self._openlibrary_get(f"{author_key}.json", timeout=self.openlibrary.author_timeout)
+            )
+        except Exception as e:
+            # Hata durumunda çağıran varsayılan yazar adını kullanır
+            print(f"Yazar bilgisi alınırken hata oluştu: {e}")
+            return None
+    
+    async def _request_author_name_async(self, author_key: str) -> Optional[str]:
+        """_request_author_name'in asenkron karşılığı."""
+        try:
+            return self._author_name(
+                await self._openlibrary_aget(f"{author_key}.json", timeout=self.openlibrary.author_timeout)
+            )
+        except Exception as e:
+            print(f"Yazar bilgisi alınırken hata oluştu: {e}")
+            return None
+    
     def add_book_by_isbn(self, isbn: str) -> bool:
         """
         ISBN numarasına göre Open Library API'sinden kitap bilgilerini çeker ve ekler.
@@ -67,23 +529,11 @@ class Library:
         """
         try:
             # ISBN kontrolü - aynı ISBN'li kitap varsa ekleme
-            if self.find_book(isbn):
-                raise ValueError(f"{isbn} ISBN'li kitap zaten mevcut")
+            self._check_not_exists(isbn)
             
             # Open Library API'sinden kitap bilgilerini çek
             book_data = self.fetch_book_from_api(isbn)
-            if not book_data:
-                raise ValueError("Kitap bilgileri alınamadı")
-            
-            # Yeni kitap oluştur ve ekle
-            book = Book(
-                title=book_data.get('title', 'Bilinmeyen Başlık'),
-                author=book_data.get('author', 'Bilinmeyen Yazar'),
-                isbn=isbn
-            )
-            
-            self.books.append(book)
-            self.save_books()
+            self._add_fetched_book(isbn, book_data)
             return True
             
         except Exception as e:
@@ -91,6 +541,60 @@ class Library:
             print(f"Hata: ISBN ile kitap eklenirken bir hata oluştu: {str(e)}")
             raise
     
+    async def add_book_by_isbn_async(self, isbn: str) -> bool:
+        """
+        add_book_by_isbn'in asenkron karşılığı; HTTP istekleri beklenirken olay
+        döngüsünü (event loop) bloklamaz.
+        
+        Args:
+            isbn (str): Eklenecek kitabın ISBN numarası
+            
+        Returns:
+            bool: Ekleme işlemi başarılıysa True
+            
+        Raises:
+            ValueError: Geçersiz ISBN veya API'den veri çekilemediğinde
+        """
+        try:
+            # Depo erişimi (immediate politikasında tüm dosyanın yeniden yazılması
+            # ve fsync) olay döngüsünü bloklamasın diye ayrı iş parçacığında yapılır
+            await asyncio.to_thread(self._check_not_exists, isbn)
+            book_data = await self.fetch_book_from_api_async(isbn)
+            await asyncio.to_thread(self._add_fetched_book, isbn, book_data)
+            return True
+            
+        except Exception as e:
+            print(f"Hata: ISBN ile kitap eklenirken bir hata oluştu: {str(e)}")
+            raise
+    
+    def _contains(self, isbn: str) -> bool:
+        with self._lock:
+            return self.storage.contains(isbn)
+    
+    def _check_not_exists(self, isbn: str) -> None:
+        """ISBN kütüphanede varsa ValueError fırlatır."""
+        if self._contains(isbn):
+            raise ValueError(f"{isbn} ISBN'li kitap zaten mevcut")
+    
+    def _add_fetched_book(self, isbn: str, book_data: Optional[dict]) -> Book:
+        """API'den gelen bilgilerle kitap oluşturur ve ekler."""
+        if not book_data:
+            raise ValueError("Kitap bilgileri alınamadı")
+        
+        # Yeni kitap oluştur ve ekle
+        book = Book(
+            title=book_data.get('title', 'Bilinmeyen Başlık'),
+            author=book_data.get('author', 'Bilinmeyen Yazar'),
+            isbn=isbn
+        )
+        
+        with self._lock:
+            # İstek sürerken aynı ISBN başka bir istekle eklenmiş olabilir
+            self._check_not_exists(isbn)
+            self.storage.add(book)
+            self._bump_version()
+        return book
+    
     def fetch_book_from_api(self, isbn: str) -> Optional[dict]:
         """
         Open Library API'sinden kitap bilgilerini çeker.
@@ -106,95 +610,233 @@ class Library:
         """
         if not isbn or not isbn.strip():
             raise ValueError("Geçersiz ISBN numarası")
+        
+        # Önce çevrimdışı indekse bak; yazar adı eksikse yalnızca yazar sorgulanır
+        entry = self._offline_entry(isbn)
+        if entry is not None:
+            author = entry['author'] or (entry['author_key'] and self._fetch_author_name(entry['author_key']))
+            return self._book_data(isbn, entry, author or 'Bilinmeyen Yazar')
             
         try:
-            # Open Library API URL'si
-            url = f"https://openlibrary.org/isbn/{isbn}.json"
+            # Open Library API'sine paylaşılan istemciyle HTTP isteği gönder
+            data = self._get_edition(isbn)
             
-            # HTTP isteği gönder
-            with httpx.Client(follow_redirects=True) as client:
-                response = client.get(url, timeout=10.0)
-                
-                if response.status_code not in [200, 302]:
-                    raise ValueError(f"API isteği başarısız oldu. Durum kodu: {response.status_code}")
-                
-                data = response.json()
-                
-                # Kitap başlığını al ve temizle
-                title = str(data.get('title', 'Bilinmeyen Başlık')).strip()
-                # HTML escaping Book sınıfında yapılacak, burada yapmıyoruz
-                
-                # Yazar bilgisini al
-                author = 'Bilinmeyen Yazar'
-                if 'authors' in data and data['authors']:
-                    try:
-                        # Yazar ID'sini al
-                        author_id = data['authors'][0].get('key')
-                        if author_id:
-                            author_url = f"https://openlibrary.org{author_id}.json"
-                            
-                            # Yazar detaylarını getir
-                            with httpx.Client(follow_redirects=True, timeout=5.0) as client:
-                                author_response = client.get(author_url)
-                                if author_response.status_code in [200, 302]:
-                                    author_data = author_response.json()
-                                    author_name = author_data.get('name')
-                                    if author_name:
-                                        author = str(author_name).strip()
-                    except Exception as e:
-                        # Hata durumunda varsayılan yazar adını kullan
-                        print(f"Yazar bilgisi alınırken hata oluştu: {e}")
-                
-                return {
-                    'title': title[:500],  # Maksimum 500 karakter
-                    'author': author[:200],  # Maksimum 200 karakter
-                    'isbn': isbn
-                }
-                
-        except httpx.RequestError as e:
-            error_msg = f"API isteği sırasında bir ağ hatası oluştu"
-            print(f"{error_msg}: {str(e)}")
-            raise ValueError(error_msg)
+            # Yazar bilgisini al
+            author = 'Bilinmeyen Yazar'
+            author_key = self._author_key(data)
+            if author_key:
+                # Yazar detaylarını getir (hata durumunda varsayılan yazar adı kalır)
+                author = self._fetch_author_name(author_key) or author
             
-        except json.JSONDecodeError as e:
-            error_msg = "API yanıtı geçersiz JSON formatında"
-            print(f"{error_msg}: {str(e)}")
-            raise ValueError(error_msg)
+            return self._book_data(isbn, data, author)
             
         except Exception as e:
-            error_msg = f"Beklenmeyen bir hata oluştu: {type(e).__name__}"
-            print(f"{error_msg}: {str(e)}")
-            # Re-raise the original exception if it's already a ValueError
-            if isinstance(e, ValueError):
-                raise e
-            raise ValueError("Kitap bilgileri alınırken bir hata oluştu")
+            raise self._fetch_error(e)
     
-    def fetch_author_from_api(self, author_key: str) -> Optional[str]:
+    async def fetch_book_from_api_async(self, isbn: str) -> Optional[dict]:
         """
-        Open Library API'sinden yazar bilgilerini çeker.
+        fetch_book_from_api'nin httpx.AsyncClient kullanan asenkron karşılığı.
         
         Args:
-            author_key (str): Yazarın API anahtarı (örn: /authors/OL23919A)
+            isbn (str): Aranacak kitabın ISBN numarası
             
         Returns:
-            Optional[str]: Yazar adı veya None
+            Optional[dict]: Kitap bilgileri
+            
+        Raises:
+            ValueError: API isteği başarısız olduğunda veya geçersiz yanıt alındığında
         """
+        if not isbn or not isbn.strip():
+            raise ValueError("Geçersiz ISBN numarası")
+        
+        entry = await asyncio.to_thread(self._offline_entry, isbn) if self.offline_index is not None else None
+        if entry is not None:
+            author = entry['author'] or (entry['author_key'] and await self._fetch_author_name_async(entry['author_key']))
+            return self._book_data(isbn, entry, author or 'Bilinmeyen Yazar')
+        
         try:
-            url = f"https://openlibrary.org{author_key}.json"
+            data = await self._get_edition_async(isbn)
             
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(url)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get('name', 'Bilinmeyen Yazar')
-                
-        except Exception:
-            # Yazar bilgisi alınamazsa sessizce geç
+            author = 'Bilinmeyen Yazar'
+            author_key = self._author_key(data)
+            if author_key:
+                author = await self._fetch_author_name_async(author_key) or author
+            
+            return self._book_data(isbn, data, author)
+            
+        except Exception as e:
+            raise self._fetch_error(e)
+    
+    def _openlibrary_get(self, path: str, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        Open Library'ye GET isteği gönderir; önbellek varsa önce ona bakar ve
+        başarılı JSON yanıtlarını önbelleğe yazar.
+        """
+        cached = self.metadata_cache.get(path) if self.metadata_cache is not None else None
+        if cached is not None:
+            return httpx.Response(200, json=cached)
+        
+        response = self.openlibrary.get(path, timeout=timeout)
+        self._cache_response(path, response)
+        return response
+    
+    async def _openlibrary_aget(self, path: str, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        _openlibrary_get'in asenkron karşılığı; SQLite önbelleğine erişim olay
+        döngüsünü bloklamamak için ayrı bir iş parçacığında yapılır.
+        """
+        cached = None
+        if self.metadata_cache is not None:
+            cached = await asyncio.to_thread(self.metadata_cache.get, path)
+        if cached is not None:
+            return httpx.Response(200, json=cached)
+        
+        response = await self.openlibrary.aget(path, timeout=timeout)
+        if self.metadata_cache is not None and response.status_code == 200:
+            await asyncio.to_thread(self._cache_response, path, response)
+        return response
+    
+    def _cache_response(self, path: str, response: httpx.Response) -> None:
+        """Başarılı ve geçerli JSON içeren yanıtı önbelleğe yazar."""
+        if self.metadata_cache is None or response.status_code != 200:
+            return
+        try:
+            self.metadata_cache.set(path, response.json())
+        except json.JSONDecodeError:
+            # Geçersiz yanıt önbelleğe alınmaz; hata çağıran tarafta ele alınır
             pass
+    
+    def cache_stats(self) -> dict:
+        """
+        Open Library önbelleklerinin istatistiklerini döndürür.
+        
+        Returns:
+            dict: Önbellek adı -> istatistikler (metadata: kalıcı yanıt önbelleği,
+                authors: yazar adı belleği, not_found: bulunamayan ISBN'ler)
+        """
+        stats = {}
+        if self.metadata_cache is not None:
+            stats["metadata"] = self.metadata_cache.stats()
+        stats["authors"] = self.author_memo.stats()
+        stats["not_found"] = self.negative_cache.stats()
+        return stats
+    
+    def _offline_entry(self, isbn: str) -> Optional[dict]:
+        """Çevrimdışı indeksteki kaydı döndürür; indeks yoksa veya ISBN bulunamazsa None."""
+        if self.offline_index is None:
+            return None
+        return self.offline_index.lookup(isbn)
+    
+    def _get_edition(self, isbn: str) -> dict:
+        """
+        ISBN'e ait kitap (edition) verisini çeker. Open Library'nin 404 döndürdüğü
+        ISBN'ler bir süre hatırlanır ve tekrar sorulduğunda ağa çıkılmaz.
+        """
+        if isbn in self.negative_cache:
+            raise ValueError(NOT_FOUND_MESSAGE)
+        
+        response = self._openlibrary_get(f"/isbn/{isbn}.json")
+        if response.status_code == 404:
+            self.negative_cache.add(isbn)
+        return self._edition_data(response)
+    
+    async def _get_edition_async(self, isbn: str) -> dict:
+        """_get_edition'ın asenkron karşılığı."""
+        if isbn in self.negative_cache:
+            raise ValueError(NOT_FOUND_MESSAGE)
         
+        response = await self._openlibrary_aget(f"/isbn/{isbn}.json")
+        if response.status_code == 404:
+            self.negative_cache.add(isbn)
+        return self._edition_data(response)
+    
+    def purge_negative_cache(self, isbn: Optional[str] = None) -> int:
+        """
+        Bulunamayan ISBN kayıtlarını siler; ISBN'ler tekrar Open Library'de aranır.
+        
+        Args:
+            isbn (Optional[str]): Silinecek ISBN; None ise tüm kayıtlar silinir
+            
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        return self.negative_cache.purge(isbn)
+    
+    @staticmethod
+    def _edition_data(response: httpx.Response) -> dict:
+        """Kitap (edition) yanıtının durum kodunu kontrol eder ve JSON içeriğini döndürür."""
+        if response.status_code == 404:
+            raise ValueError(NOT_FOUND_MESSAGE)
+        if response.status_code >= 500:
+            raise OpenLibraryUnavailableError(f"API isteği başarısız oldu. Durum kodu: {response.status_code}")
+        if response.status_code not in [200, 302]:
+            raise ValueError(f"API isteği başarısız oldu. Durum kodu: {response.status_code}")
+        return response.json()
+    
+    @staticmethod
+    def _author_key(data: dict) -> Optional[str]:
+        """Kitap verisindeki ilk yazarın anahtarını döndürür (örn: /authors/OL1A)."""
+        if 'authors' in data and data['authors']:
+            return data['authors'][0].get('key')
         return None
     
+    @staticmethod
+    def _author_name(response: httpx.Response) -> Optional[str]:
+        """Yazar yanıtındaki yazar adını döndürür, yoksa None."""
+        if response.status_code in [200, 302]:
+            author_name = response.json().get('name')
+            if author_name:
+                return str(author_name).strip()
+        return None
+    
+    @staticmethod
+    def _book_data(isbn: str, data: dict, author: str) -> dict:
+        """API verisinden Book oluşturmaya uygun sözlük hazırlar."""
+        # Kitap başlığını al ve temizle
+        title = str(data.get('title', 'Bilinmeyen Başlık')).strip()
+        # HTML escaping Book sınıfında yapılacak, burada yapmıyoruz
+        return {
+            'title': title[:500],  # Maksimum 500 karakter
+            'author': author[:200],  # Maksimum 200 karakter
+            'isbn': isbn
+        }
+    
+    @staticmethod
+    def _fetch_error(e: Exception) -> ValueError:
+        """API isteği sırasında oluşan hatayı kullanıcıya gösterilecek ValueError'a çevirir."""
+        if isinstance(e, CircuitOpenError):
+            # Devre kesici açık: istek hiç gönderilmedi
+            return OpenLibraryUnavailableError(UNAVAILABLE_MESSAGE)
+        
+        if isinstance(e, httpx.RequestError):
+            error_msg = f"API isteği sırasında bir ağ hatası oluştu"
+            print(f"{error_msg}: {str(e)}")
+            return OpenLibraryUnavailableError(error_msg)
+        
+        if isinstance(e, json.JSONDecodeError):
+            error_msg = "API yanıtı geçersiz JSON formatında"
+            print(f"{error_msg}: {str(e)}")
+            return ValueError(error_msg)
+        
+        error_msg = f"Beklenmeyen bir hata oluştu: {type(e).__name__}"
+        print(f"{error_msg}: {str(e)}")
+        # Re-raise the original exception if it's already a ValueError
+        if isinstance(e, ValueError):
+            return e
+        return ValueError("Kitap bilgileri alınırken bir hata oluştu")
+    
+    def fetch_author_from_api(self, author_key: str) -> Optional[str]:
+        """
+        Open Library API'sinden yazar bilgilerini çeker.
+        
+        Args:
+            author_key (str): Yazarın API anahtarı (örn: /authors/OL23919A)
+            
+        Returns:
+            Optional[str]: Yazar adı veya None
+        """
+        return self._fetch_author_name(author_key)
+    
     def remove_book(self, isbn: str) -> bool:
         """
         ISBN numarasına göre kitabı kütüphaneden siler.
@@ -205,26 +847,69 @@ class Library:
         Returns:
             bool: Silme işlemi başarılıysa True, kitap bulunamazsa False
         """
-        book = self.find_book(isbn)
+        with self._lock:
+            book = self.storage.remove(isbn)
+            if book:
+                self._bump_version()
         if book:
-            self.books.remove(book)
-            self.save_books()
             print(f"Kitap başarıyla silindi: {book}")
             return True
         else:
             print(f"Hata: {isbn} ISBN'li kitap bulunamadı!")
             return False
     
+    def remove_books(self, isbns: Iterable[str]) -> dict:
+        """
+        Birden çok kitabı tek kayıt işlemiyle siler.
+        
+        Args:
+            isbns (Iterable[str]): Silinecek kitapların ISBN numaraları
+            
+        Returns:
+            dict: removed, not_found ve failed sayıları ile her ISBN için index,
+                isbn, status ("removed", "not_found", "error") ve gerekirse error
+                bilgisini içeren results listesi
+        """
+        results = []
+        to_remove: Dict[str, int] = {}
+        
+        with self._lock:
+            for index, isbn in enumerate(isbns):
+                try:
+                    isbn = Book._validate_isbn(isbn)
+                except (AttributeError, ValueError) as e:
+                    results.append({"index": index, "isbn": isbn, "status": "error", "error": str(e)})
+                    continue
+                if isbn in to_remove or not self.storage.contains(isbn):
+                    # Aynı toplu işlemde ikinci kez geçen ISBN de artık bulunamaz
+                    results.append({"index": index, "isbn": isbn, "status": "not_found"})
+                else:
+                    to_remove[isbn] = index
+                    results.append({"index": index, "isbn": isbn, "status": "removed"})
+            
+            # Tüm kitaplar tek kayıt işlemiyle silinir
+            removed = {book.isbn for book in self.storage.remove_many(list(to_remove))}
+            if removed:
+                self._bump_version()
+        for result in results:
+            if result["status"] == "removed" and result["isbn"] not in removed:
+                result["status"] = "not_found"
+        
+        summary = count_statuses((result["status"] for result in results), REMOVE_STATUSES)
+        summary["results"] = results
+        return summary
+    
     def list_books(self) -> None:
         """
         Kütüphanedeki tüm kitapları listeler.
         """
-        if not self.books:
+        book_count = self.get_book_count()
+        if not book_count:
             print("Kütüphanede hiç kitap yok.")
             return
         
-        print(f"\n=== Kütüphanedeki Kitaplar ({len(self.books)} adet) ===")
-        for i, book in enumerate(self.books, 1):
+        print(f"\n=== Kütüphanedeki Kitaplar ({book_count} adet) ===")
+        for i, book in enumerate(self._iter_books(), 1):
             print(f"{i}. {book}")
         print()
     
@@ -238,10 +923,8 @@ class Library:
         Returns:
             Optional[Book]: Bulunan kitap nesnesi veya None
         """
-        for book in self.books:
-            if book.isbn == isbn:
-                return book
-        return None
+        with self._lock:
+            return self.storage.get(isbn)
     
     def search_books(self, query: str) -> List[Book]:
         """
@@ -253,47 +936,138 @@ class Library:
         Returns:
             List[Book]: Bulunan kitapların listesi
         """
-        query = query.lower()
-        found_books = []
-        
-        for book in self.books:
-            if (query in book.title.lower() or 
-                query in book.author.lower() or 
-                query in book.isbn):
-                found_books.append(book)
+        with self._lock:
+            return self.storage.search(query)
+    
+    def stats(self) -> dict:
+        """
+        Kütüphane istatistiklerini döndürür.
         
-        return found_books
+        Returns:
+            dict: total_books, unique_authors, authors_with_most_books ve
+                most_books_count anahtarlarını içeren sözlük
+        """
+        with self._lock:
+            return self.storage.stats()
     
     def load_books(self) -> None:
         """
-        JSON dosyasından kitapları yükler.
+        Kitapları depolama arka ucundan yükler.
         """
-        if not os.path.exists(self.filename):
-            print(f"Veri dosyası ({self.filename}) bulunamadı. Yeni bir kütüphane oluşturuluyor.")
-            return
-        
-        try:
-            with open(self.filename, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                self.books = [Book.from_dict(book_data) for book_data in data]
-                print(f"{len(self.books)} kitap başarıyla yüklendi.")
-        except json.JSONDecodeError:
-            print(f"Hata: {self.filename} dosyası bozuk. Yeni bir kütüphane oluşturuluyor.")
-            self.books = []
-        except Exception as e:
-            print(f"Dosya okuma hatası: {e}")
-            self.books = []
+        with self._lock:
+            self.storage.load()
+            self._bump_version()
     
     def save_books(self) -> None:
         """
-        Kitapları JSON dosyasına kaydeder.
+        Tüm kitapları depolama arka ucuna kaydeder.
         """
-        try:
-            with open(self.filename, 'w', encoding='utf-8') as file:
-                books_data = [book.to_dict() for book in self.books]
-                json.dump(books_data, file, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Dosya kaydetme hatası: {e}")
+        with self._lock:
+            self.storage.save()
+    
+    def _iter_books(self, chunk_size: int = 1000) -> Iterator[Book]:
+        """
+        Kitapları ekleme sırasıyla döndürür; kilit tüm yineleme boyunca değil,
+        her chunk_size kitap okunurken kısa süreliğine tutulur.
+        """
+        books = self.storage.iter_books()
+        while True:
+            with self._lock:
+                chunk = list(itertools.islice(books, chunk_size))
+            if not chunk:
+                return
+            yield from chunk
+    
+    def iter_export(self, file_format: str = "ndjson", chunk_size: int = 1000) -> Iterator[str]:
+        """
+        Kataloğu dışa aktarım için metin parçaları halinde üretir; kitaplar
+        depolama arka ucundan tek tek okunur, tüm katalog belleğe alınmaz.
+        
+        Args:
+            file_format (str): "ndjson" (satır başına bir JSON nesnesi) veya
+                "csv" (başlık satırı title,author,isbn)
+            chunk_size (int): Bir parçadaki en fazla kitap sayısı
+            
+        Yields:
+            str: chunk_size kitaba kadar satır içeren metin parçası
+            
+        Raises:
+            ValueError: Bilinmeyen bir format verildiğinde
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Geçersiz dışa aktarım formatı: {file_format}")
+        return self._iter_export(file_format, max(1, chunk_size))
+    
+    def _iter_export(self, file_format: str, chunk_size: int) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n") if file_format == "csv" else None
+        if writer:
+            writer.writerow(["title", "author", "isbn"])
+        
+        rows = 0
+        for book in self._iter_books(chunk_size):
+            if writer:
+                writer.writerow([book.title, book.author, book.isbn])
+            else:
+                buffer.write(json.dumps(book.to_dict(), ensure_ascii=False) + "\n")
+            rows += 1
+            if rows == chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    def export_binary(self, filename: str) -> int:
+        """
+        Kataloğu salt okunur, mmap ile açılabilen ikili formatta dışa aktarır.
+        
+        Oluşturulan dosya Library(filename) ile (.bcat uzantısı) veya
+        backend="binary" ile açılabilir.
+        
+        Args:
+            filename (str): Oluşturulacak ikili katalog dosyasının adı
+            
+        Returns:
+            int: Dışa aktarılan kitap sayısı
+        """
+        return write_binary_catalog(self._iter_books(), filename)
+    
+    def flush(self) -> None:
+        """
+        Yazma politikası nedeniyle bekleyen değişiklikleri diske yazar.
+        """
+        with self._lock:
+            self.storage.flush()
+    
+    def compact(self) -> None:
+        """
+        Depolama arka ucunu sıkıştırır (ör. JSON günlüğünü ana dosyaya katlar).
+        """
+        with self._lock:
+            self.storage.compact()
+    
+    def close(self) -> None:
+        """
+        Bekleyen değişiklikleri yazar, Open Library bağlantılarını ve önbelleği kapatır.
+        """
+        with self._lock:
+            self.storage.close()
+        if self._owns_openlibrary:
+            self.openlibrary.close()
+        if self._owns_metadata_cache:
+            self.metadata_cache.close()
+        if self._owns_offline_index:
+            self.offline_index.close()
+    
+    async def aclose(self) -> None:
+        """
+        close()'un asenkron karşılığı; asenkron HTTP istemcisini de kapatır.
+        """
+        if self._owns_openlibrary:
+            await self.openlibrary.aclose()
+        self.close()
     
     def get_book_count(self) -> int:
         """
@@ -302,7 +1076,8 @@ class Library:
         Returns:
             int: Kitap sayısı
         """
-        return len(self.books)
+        with self._lock:
+            return self.storage.count()
     
     def get_all_books(self) -> List[Book]:
         """
@@ -311,4 +1086,5 @@ class Library:
         Returns:
             List[Book]: Kitapların listesi
         """
-        return self.books.copy()
+        with self._lock:
+            return list(self.storage.iter_books())
@@ -4,6 +4,8 @@ Kütüphane Yönetim Sistemi - Ana Uygulama
 Global AI Hub Python 202 Bootcamp Projesi - Aşama 1
 """
 
+import argparse
+import os
 from library import Library
 from book import Book
 
@@ -41,9 +43,10 @@ def add_book_menu(library: Library):
     print("\n--- Kitap Ekleme ---")
     print("1. ISBN ile otomatik ekleme (Open Library API)")
     print("2. Manuel kitap ekleme")
+    print("3. Toplu ISBN ile ekleme (Open Library API)")
     
     try:
-        choice = input("Seçiminizi yapın (1-2): ").strip()
+        choice = input("Seçiminizi yapın (1-3): ").strip()
         
         if choice == '1':
             # API ile otomatik ekleme
@@ -82,6 +85,9 @@ def add_book_menu(library: Library):
             new_book = Book(title, author, isbn)
             library.add_book(new_book)
         
+        elif choice == '3':
+            add_books_by_isbn_menu(library)
+        
         else:
             print("Geçersiz seçim!")
         
@@ -89,6 +95,31 @@ def add_book_menu(library: Library):
         print("\nKitap ekleme iptal edildi.")
 
 
+def read_isbn_file(path: str) -> list:
+    """ISBN dosyasını okur; ISBN'ler satır, virgül veya boşlukla ayrılabilir."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read().replace(',', ' ').split()
+
+
+def add_books_by_isbn_menu(library: Library):
+    """Toplu ISBN ekleme menüsü."""
+    source = input("ISBN numaraları (virgül/boşlukla ayırın) veya ISBN dosyası: ").strip()
+    if not source:
+        print("Hata: En az bir ISBN girilmelidir!")
+        return
+    
+    # Dosya verildiyse her satırdan ISBN'leri oku
+    isbns = read_isbn_file(source) if os.path.isfile(source) else source.replace(',', ' ').split()
+    
+    print(f"{len(isbns)} ISBN için kitap bilgileri Open Library'den çekiliyor...")
+    summary = library.add_books_by_isbn(isbns)
+    
+    print(f"Eklenen: {summary['added']}, Atlanan: {summary['skipped']}, Hatalı: {summary['failed']}")
+    for result in summary["results"]:
+        if result["status"] == "error":
+            print(f"  {result['isbn']}: {result['error']}")
+
+
 def remove_book_menu(library: Library):
     """Kitap silme menüsü."""
     print("\n--- Kitap Silme ---")
@@ -164,33 +195,54 @@ def show_statistics(library: Library):
     """Kütüphane istatistiklerini gösterir."""
     print("\n--- Kütüphane İstatistikleri ---")
     
-    book_count = library.get_book_count()
+    stats = library.stats()
+    book_count = stats["total_books"]
     print(f"Toplam kitap sayısı: {book_count}")
     
     if book_count > 0:
-        # Yazarlara göre grupla
-        authors = {}
-        for book in library.get_all_books():
-            if book.author in authors:
-                authors[book.author] += 1
-            else:
-                authors[book.author] = 1
-        
-        print(f"Farklı yazar sayısı: {len(authors)}")
+        print(f"Farklı yazar sayısı: {stats['unique_authors']}")
         
         # En çok kitabı olan yazar
-        if authors:
-            max_author = max(authors, key=authors.get)
-            max_count = authors[max_author]
-            print(f"En çok kitabı olan yazar: {max_author} ({max_count} kitap)")
+        max_author = stats["authors_with_most_books"]
+        max_count = stats["most_books_count"]
+        print(f"En çok kitabı olan yazar: {max_author} ({max_count} kitap)")
+
+
+def prefetch(library: Library, path: str, concurrency: int):
+    """ISBN dosyasındaki kitapların bilgilerini kütüphaneye eklemeden önbelleğe çeker."""
+    isbns = read_isbn_file(path)
+    print(f"{len(isbns)} ISBN için kitap bilgileri önbelleğe çekiliyor...")
+    
+    def report(done: int, total: int):
+        print(f"\r  {done}/{total} ISBN işlendi", end="", flush=True)
+    
+    summary = library.prefetch_isbns(isbns, concurrency=concurrency, progress_callback=report)
+    print()
+    print(f"Çekilen: {summary['fetched']}, Zaten önbellekte: {summary['cached']}, "
+          f"Kütüphanede olan: {summary['skipped']}, Bulunamayan: {summary['not_found']}, "
+          f"Hatalı: {summary['failed']}")
 
 
 def main():
     """Ana program döngüsü."""
-    print("Kütüphane Yönetim Sistemi'ne Hoş Geldiniz!")
+    parser = argparse.ArgumentParser(description="Kütüphane Yönetim Sistemi")
+    parser.add_argument("--prefetch", metavar="ISBN_DOSYASI",
+                        help="Dosyadaki ISBN'lerin bilgilerini önbelleğe çekip çıkar")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Ön yüklemede aynı anda yapılacak en fazla istek sayısı")
+    args = parser.parse_args()
     
     # Kütüphane nesnesini oluştur
-    library = Library()
+    library = Library(metadata_cache="openlibrary_cache.db")
+    
+    if args.prefetch:
+        try:
+            prefetch(library, args.prefetch, args.concurrency)
+        finally:
+            library.close()
+        return
+    
+    print("Kütüphane Yönetim Sistemi'ne Hoş Geldiniz!")
     
     while True:
         display_menu()
@@ -213,6 +265,8 @@ def main():
             show_statistics(library)
         
         elif choice == '6':
+            # Bekleyen değişiklikleri diske yaz
+            library.close()
             print("\nKütüphane Yönetim Sistemi kapatılıyor...")
             print("Görüşmek üzere!")
             break
@@ -0,0 +1,173 @@
+"""
+Kütüphane Yönetim Sistemi - Open Library Yanıt Önbelleği
+
+Open Library'den gelen kitap (edition) ve yazar yanıtlarını bir SQLite
+dosyasında saklar. Böylece silinip yeniden eklenen kitaplar veya aynı dosyayı
+paylaşan birden çok sunucu için openlibrary.org'a tekrar istek gönderilmez.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+class MetadataCache:
+    """
+    Süre sınırlı (TTL) ve en fazla max_entries kayıt tutan kalıcı önbellek.
+    
+    Kayıt sayısı sınırı aşıldığında en uzun süredir kullanılmayan (LRU)
+    kayıtlar silinir. Her isabette diske yazmamak için bir kaydın son kullanım
+    zamanı en fazla touch_interval saniyede bir güncellenir; LRU sırası bu
+    çözünürlükte yaklaşıktır. Kayıt sayısı bellekte tutulur ve yalnızca sınır
+    aşıldığında veritabanından yeniden sayılır (aynı dosyayı başka süreçler de
+    kullanıyor olabilir); silme, her eklemede tekrarlanmaması için sınırın
+    %10 altına inene kadar toplu yapılır. Önbellek isabet (hit) ve ıskalama
+    (miss) sayılarını tutar.
+    """
+    
+    def __init__(self, filename: str = "openlibrary_cache.db", ttl: float = 7 * 24 * 3600,
+                 max_entries: int = 10000, touch_interval: float = 60.0):
+        """
+        MetadataCache sınıfının constructor'ı.
+        
+        Args:
+            filename (str): Önbellek veritabanı dosyasının adı (":memory:" ile
+                yalnızca bellekte tutulur)
+            ttl (float): Bir kaydın geçerli kalacağı süre (saniye)
+            max_entries (int): Önbellekte tutulacak en fazla kayıt sayısı
+            touch_interval (float): Bir kaydın son kullanım zamanının en sık
+                güncellenme aralığı (saniye)
+            
+        Raises:
+            ValueError: ttl veya max_entries pozitif değilse
+        """
+        if ttl <= 0 or max_entries < 1:
+            raise ValueError("ttl ve max_entries pozitif olmalıdır")
+            
+        self.filename = filename
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        with self._conn:
+            if filename != ":memory:":
+                # Birden çok süreç aynı dosyayı okurken yazabilsin
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+            self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Anahtara karşılık gelen geçerli kaydı döndürür.
+        
+        Args:
+            key (str): Önbellek anahtarı (ör. /isbn/9780451524935.json)
+            
+        Returns:
+            Optional[Any]: Saklanan JSON değeri; kayıt yoksa veya süresi dolmuşsa None
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, stored_at, accessed_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._count = max(0, self._count - 1)
+                self.misses += 1
+                return None
+                
+            # Yalnızca okuma yapılan isabetlerde işlem (commit) açılmaz
+            if now - row[2] >= self.touch_interval:
+                self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        Değeri önbelleğe yazar; sınır aşılırsa en eski kullanılan kayıtları siler.
+        
+        Args:
+            key (str): Önbellek anahtarı
+            value (Any): JSON'a çevrilebilir değer
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            exists = self._conn.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            if not exists:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+    
+    def _evict(self) -> None:
+        """Kayıt sayısını sınırın %10 altına indirir; kilit ve işlem içinde çağrılmalıdır."""
+        # Başka süreçlerin ekledikleri veya sildikleri de hesaba katılsın
+        self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        excess = self._count - (self.max_entries - self.max_entries // 10)
+        self._conn.execute(
+            "DELETE FROM cache WHERE key IN"
+            " (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)", (excess,)
+        )
+        self._count -= excess
+        self.evictions += excess
+    
+    def __contains__(self, key: str) -> bool:
+        """Anahtar için geçerli bir kayıt olup olmadığını sayaçları değiştirmeden döndürür."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    
+    def clear(self) -> None:
+        """Tüm kayıtları siler."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+            self._count = 0
+    
+    def stats(self) -> dict:
+        """
+        Önbellek istatistiklerini döndürür.
+        
+        Returns:
+            dict: entries, max_entries, ttl, hits, misses, evictions ve hit_ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+    
+    def close(self) -> None:
+        """Veritabanı bağlantısını kapatır."""
+        with self._lock:
+            self._conn.close()
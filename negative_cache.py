@@ -0,0 +1,93 @@
+"""
+Kütüphane Yönetim Sistemi - Bulunamayan ISBN Önbelleği
+
+Open Library'nin 404 döndürdüğü ISBN'leri kısa bir süre hatırlar; böylece
+aynı hatalı ISBN ile tekrar tekrar yapılan istekler ağa çıkmadan yanıtlanır.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class NegativeCache:
+    """
+    Süre sınırlı (TTL) ve en fazla max_entries kayıt tutan bulunamayan ISBN listesi.
+    
+    Sınır aşıldığında en eski kayıt silinir.
+    """
+    
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000):
+        """
+        NegativeCache sınıfının constructor'ı.
+        
+        Args:
+            ttl (float): Bir ISBN'in bulunamadı olarak hatırlanacağı süre (saniye)
+            max_entries (int): Tutulacak en fazla ISBN sayısı
+            
+        Raises:
+            ValueError: ttl veya max_entries pozitif değilse
+        """
+        if ttl <= 0 or max_entries < 1:
+            raise ValueError("ttl ve max_entries pozitif olmalıdır")
+            
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self._expires: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def add(self, isbn: str) -> None:
+        """ISBN'i bulunamadı olarak kaydeder."""
+        with self._lock:
+            self._expires.pop(isbn, None)
+            self._expires[isbn] = time.monotonic() + self.ttl
+            if len(self._expires) > self.max_entries:
+                self._expires.popitem(last=False)
+    
+    def __contains__(self, isbn: str) -> bool:
+        """ISBN'in süresi dolmamış bir kaydı varsa True döndürür."""
+        with self._lock:
+            expires = self._expires.get(isbn)
+            if expires is None:
+                return False
+            if time.monotonic() > expires:
+                del self._expires[isbn]
+                return False
+            self.hits += 1
+            return True
+    
+    def __len__(self) -> int:
+        return len(self._expires)
+    
+    def purge(self, isbn: Optional[str] = None) -> int:
+        """
+        Kayıtları siler.
+        
+        Args:
+            isbn (Optional[str]): Silinecek ISBN; None ise tüm kayıtlar silinir
+            
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        with self._lock:
+            if isbn is not None:
+                return 1 if self._expires.pop(isbn, None) is not None else 0
+            count = len(self._expires)
+            self._expires.clear()
+            return count
+    
+    def stats(self) -> dict:
+        """
+        Önbellek istatistiklerini döndürür.
+        
+        Returns:
+            dict: entries, max_entries, ttl ve hits (ağa çıkmadan yanıtlanan istek sayısı)
+        """
+        return {
+            "entries": len(self._expires),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits
+        }
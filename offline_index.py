@@ -0,0 +1,231 @@
+"""
+Kütüphane Yönetim Sistemi - Çevrimdışı Open Library İndeksi
+
+Open Library'nin toplu veri dosyalarından (editions ve authors dump'ları;
+gzip'li, sekmeyle ayrılmış ve son sütunu JSON olan satırlar) yerel bir
+ISBN -> (başlık, yazar) indeksi oluşturur. Library bu indeksi ağa çıkmadan
+önce kullanır.
+
+Kullanım:
+    python offline_index.py --authors ol_dump_authors.txt.gz \\
+        --editions ol_dump_editions.txt.gz --index ol_index.db
+"""
+
+import argparse
+import gzip
+import json
+import sqlite3
+import threading
+from typing import Callable, Iterator, Optional, Tuple
+
+
+def normalize_isbn(isbn: str) -> str:
+    """ISBN'den tire ve boşlukları kaldırır (örn: 978-0451524935 -> 9780451524935)."""
+    return isbn.replace("-", "").replace(" ", "").upper()
+
+
+def _open_dump(path: str):
+    """Dump dosyasını (gzip'li veya düz metin) satır satır okumak için açar."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_dump_records(path: str) -> Iterator[Tuple[str, dict]]:
+    """
+    Dump dosyasındaki kayıtları sırayla döndürür; bozuk satırlar atlanır.
+    
+    Satır biçimi: type, key, revision, last_modified ve JSON (sekmeyle ayrılmış).
+    
+    Yields:
+        Tuple[str, dict]: Kayıt anahtarı (örn: /authors/OL23919A) ve JSON verisi
+    """
+    with _open_dump(path) as dump:
+        for line in dump:
+            columns = line.rstrip("\n").split("\t", 4)
+            if len(columns) != 5:
+                continue
+            try:
+                data = json.loads(columns[4])
+            except json.JSONDecodeError:
+                continue
+            if isinstance(data, dict):
+                yield columns[1], data
+
+
+class OfflineIndex:
+    """
+    Open Library dump'larından oluşturulan SQLite tabanlı ISBN indeksi.
+    
+    editions tablosu normalize edilmiş ISBN'i başlık ve yazar anahtarına,
+    authors tablosu yazar anahtarını yazar adına eşler.
+    """
+    
+    def __init__(self, filename: str = "ol_index.db"):
+        """
+        OfflineIndex sınıfının constructor'ı.
+        
+        Args:
+            filename (str): İndeks veritabanı dosyasının adı
+        """
+        self.filename = filename
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS editions ("
+                " isbn TEXT PRIMARY KEY,"
+                " title TEXT NOT NULL,"
+                " author_key TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS authors ("
+                " key TEXT PRIMARY KEY,"
+                " name TEXT NOT NULL)"
+            )
+    
+    def _import(self, path: str, sql: str, rows: Callable[[str, dict], list],
+                progress_callback: Optional[Callable[[int], None]], progress_every: int,
+                batch_size: int) -> int:
+        """Dump dosyasını okuyup satırları batch_size'lık gruplar halinde yazar."""
+        progress_every = max(1, progress_every)
+        count = 0
+        batch = []
+        with self._lock:
+            # İçe aktarma sırasında her grup için fsync beklenmez
+            self._conn.execute("PRAGMA synchronous=OFF")
+            try:
+                for key, data in iter_dump_records(path):
+                    batch.extend(rows(key, data))
+                    count += 1
+                    if len(batch) >= batch_size:
+                        with self._conn:
+                            self._conn.executemany(sql, batch)
+                        batch = []
+                    if progress_callback and count % progress_every == 0:
+                        progress_callback(count)
+                if batch:
+                    with self._conn:
+                        self._conn.executemany(sql, batch)
+            finally:
+                self._conn.execute("PRAGMA synchronous=FULL")
+        if progress_callback:
+            progress_callback(count)
+        return count
+    
+    def import_authors(self, path: str, progress_callback: Optional[Callable[[int], None]] = None,
+                       progress_every: int = 100000, batch_size: int = 10000) -> int:
+        """
+        Authors dump dosyasını indekse aktarır.
+        
+        Args:
+            path (str): Dump dosyasının yolu (.txt veya .txt.gz)
+            progress_callback (Optional[Callable[[int], None]]): İşlenen kayıt
+                sayısıyla çağrılan fonksiyon
+            progress_every (int): progress_callback'in kaç kayıtta bir çağrılacağı
+            batch_size (int): Tek işlemde yazılacak satır sayısı
+            
+        Returns:
+            int: Okunan kayıt sayısı
+        """
+        def rows(key: str, data: dict) -> list:
+            name = data.get("name")
+            return [(key, str(name).strip())] if name else []
+            
+        return self._import(path, "INSERT OR REPLACE INTO authors (key, name) VALUES (?, ?)",
+                            rows, progress_callback, progress_every, batch_size)
+    
+    def import_editions(self, path: str, progress_callback: Optional[Callable[[int], None]] = None,
+                        progress_every: int = 100000, batch_size: int = 10000) -> int:
+        """
+        Editions dump dosyasını indekse aktarır. Her kitabın isbn_10 ve isbn_13
+        numaralarının tümü indekse eklenir.
+        
+        Args:
+            path (str): Dump dosyasının yolu (.txt veya .txt.gz)
+            progress_callback (Optional[Callable[[int], None]]): İşlenen kayıt
+                sayısıyla çağrılan fonksiyon
+            progress_every (int): progress_callback'in kaç kayıtta bir çağrılacağı
+            batch_size (int): Tek işlemde yazılacak satır sayısı
+            
+        Returns:
+            int: Okunan kayıt sayısı
+        """
+        def rows(key: str, data: dict) -> list:
+            title = data.get("title")
+            if not title:
+                return []
+            authors = data.get("authors") or [None]
+            author_key = authors[0].get("key") if isinstance(authors[0], dict) else None
+            isbns = list(data.get("isbn_13") or []) + list(data.get("isbn_10") or [])
+            return [(normalize_isbn(str(isbn)), str(title).strip(), author_key) for isbn in isbns]
+            
+        return self._import(path, "INSERT OR REPLACE INTO editions (isbn, title, author_key) VALUES (?, ?, ?)",
+                            rows, progress_callback, progress_every, batch_size)
+    
+    def lookup(self, isbn: str) -> Optional[dict]:
+        """
+        ISBN'e ait kitabı indekste arar.
+        
+        Args:
+            isbn (str): Kitabın ISBN numarası (tireli veya tiresiz)
+            
+        Returns:
+            Optional[dict]: title, author_key ve author (indekste yoksa None)
+                anahtarlı sözlük; kitap bulunamazsa None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT e.title, e.author_key, a.name FROM editions e"
+                " LEFT JOIN authors a ON a.key = e.author_key WHERE e.isbn = ?",
+                (normalize_isbn(isbn),)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"title": row[0], "author_key": row[1], "author": row[2]}
+    
+    def stats(self) -> dict:
+        """
+        İndeksteki kayıt sayılarını döndürür.
+        
+        Returns:
+            dict: editions (ISBN sayısı) ve authors
+        """
+        with self._lock:
+            editions = self._conn.execute("SELECT COUNT(*) FROM editions").fetchone()[0]
+            authors = self._conn.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+        return {"editions": editions, "authors": authors}
+    
+    def close(self) -> None:
+        """Veritabanı bağlantısını kapatır."""
+        with self._lock:
+            self._conn.close()
+
+
+def main() -> None:
+    """Komut satırından dump dosyalarını indekse aktarır."""
+    parser = argparse.ArgumentParser(description="Open Library dump dosyalarından yerel ISBN indeksi oluşturur")
+    parser.add_argument("--authors", help="Authors dump dosyası (.txt.gz)")
+    parser.add_argument("--editions", help="Editions dump dosyası (.txt.gz)")
+    parser.add_argument("--index", default="ol_index.db", help="İndeks dosyası (varsayılan: ol_index.db)")
+    args = parser.parse_args()
+    
+    if not args.authors and not args.editions:
+        parser.error("En az bir dump dosyası (--authors veya --editions) verilmelidir")
+        
+    index = OfflineIndex(args.index)
+    try:
+        for kind, path, importer in (("Yazar", args.authors, index.import_authors),
+                                     ("Kitap", args.editions, index.import_editions)):
+            if path:
+                print(f"{kind} kayıtları aktarılıyor: {path}")
+                count = importer(path, progress_callback=lambda n: print(f"  {n} kayıt işlendi"))
+                print(f"{kind} kayıtları tamamlandı: {count}")
+        stats = index.stats()
+        print(f"İndeks: {stats['editions']} ISBN, {stats['authors']} yazar")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""
+Kütüphane Yönetim Sistemi - Open Library HTTP İstemcisi
+
+Open Library isteklerinde her seferinde yeni bir bağlantı açmak yerine, bağlantı
+havuzu (keep-alive) ve mümkünse HTTP/2 kullanan uzun ömürlü bir istemci sağlar.
+Geçici hatalarda istekler rastgele gecikmeyle tekrar denenir, yavaş isteklere
+isteğe bağlı olarak ikinci (hedged) bir istek eklenir ve hata oranı yükseldiğinde
+devre kesici istekleri hemen başarısız sayar.
+"""
+
+import asyncio
+import importlib.util
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Optional
+import httpx
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+OPEN_LIBRARY_URL = "https://openlibrary.org"
+
+# HTTP/2 desteği isteğe bağlı 'h2' paketine bağlıdır (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Tekrar denenecek geçici sunucu yanıtları (500 tekrar denenmez ama devre kesicide hata sayılır)
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Bağlantı sayısı sınırsızken hedging için kullanılacak en fazla iş parçacığı
+HEDGE_MAX_WORKERS = 100
+
+
+class OpenLibraryClient:
+    """
+    Open Library API'sine yapılan istekler için paylaşılan HTTP istemcisi.
+    
+    httpx.Client ilk istekte oluşturulur ve close() çağrılana kadar açık kalır;
+    böylece art arda yapılan isteklerde TCP/TLS bağlantıları yeniden kullanılır.
+    Testlerde gerçek ağ yerine httpx.MockTransport gibi bir transport verilebilir.
+    """
+    
+    def __init__(self, base_url: str = OPEN_LIBRARY_URL, timeout: float = 10.0,
+                 author_timeout: float = 5.0, connect_timeout: float = 5.0,
+                 max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 30.0, http2: bool = True,
+                 transport: Optional[httpx.BaseTransport] = None,
+                 async_transport: Optional[httpx.AsyncBaseTransport] = None,
+                 retries: int = 2, backoff: float = 0.1, max_backoff: float = 2.0,
+                 hedge_after: Optional[float] = None, hedge_percentile: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        OpenLibraryClient sınıfının constructor'ı.
+        
+        Args:
+            base_url (str): Open Library sunucusunun adresi
+            timeout (float): Kitap (edition) istekleri için zaman aşımı (saniye)
+            author_timeout (float): Yazar istekleri için zaman aşımı (saniye)
+            connect_timeout (float): Bağlantı kurma zaman aşımı (saniye)
+            max_connections (int): Havuzdaki en fazla eş zamanlı bağlantı sayısı
+            max_keepalive_connections (int): Açık tutulacak boşta bağlantı sayısı
+            keepalive_expiry (float): Boşta bağlantının açık tutulacağı süre (saniye)
+            http2 (bool): True ise ve 'h2' paketi kuruluysa HTTP/2 kullanılır
+            transport (Optional[httpx.BaseTransport]): İsteklerin gönderileceği
+                transport (testler için)
+            async_transport (Optional[httpx.AsyncBaseTransport]): Asenkron istekler
+                için transport; None ise transport asenkron da çalışabiliyorsa
+                (örn. httpx.MockTransport) o kullanılır
+            retries (int): Ağ hatası, zaman aşımı veya 429/502/503/504 yanıtında
+                yapılacak en fazla tekrar deneme sayısı
+            backoff (float): İlk tekrar denemeden önceki en fazla bekleme (saniye);
+                her denemede iki katına çıkar, gerçek bekleme 0 ile bu değer
+                arasında rastgele seçilir
+            max_backoff (float): Bir tekrar denemeden önceki en fazla bekleme (saniye)
+            hedge_after (Optional[float]): Yanıt bu süre (saniye) içinde gelmezse
+                aynı istek ikinci kez gönderilir ve önce gelen yanıt kullanılır
+            hedge_percentile (Optional[float]): hedge_after verilmemişse ikinci
+                istek, son isteklerin bu yüzdelik gecikmesinden (örn. 0.95) sonra
+                gönderilir
+            breaker (Optional[CircuitBreaker]): Devre kesici; None ise varsayılan
+                ayarlarla oluşturulur
+        """
+        if retries < 0 or backoff < 0 or max_backoff < 0:
+            raise ValueError("retries, backoff ve max_backoff negatif olamaz")
+        if hedge_percentile is not None and not 0 < hedge_percentile < 1:
+            raise ValueError("hedge_percentile 0 ile 1 arasında olmalıdır")
+        
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.author_timeout = author_timeout
+        self.connect_timeout = connect_timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE and transport is None
+        self.transport = transport
+        if async_transport is None and isinstance(transport, httpx.AsyncBaseTransport):
+            async_transport = transport
+        self.async_transport = async_transport
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        # İstemciler ilk kullanımda oluşturulur; aynı anda gelen ilk istekler
+        # ayrı istemciler (ve bağlantı havuzları) açmasın
+        self._client_lock = threading.Lock()
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.retried = 0
+        self.hedged = 0
+        self._latencies: deque = deque(maxlen=200)
+        self._lock = threading.Lock()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+    
+    def _timeout(self, timeout: Optional[float]) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout if timeout is None else timeout, connect=self.connect_timeout)
+    
+    @property
+    def client(self) -> httpx.Client:
+        """Paylaşılan httpx.Client nesnesi (ilk kullanımda oluşturulur)."""
+        client = self._client
+        if client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        follow_redirects=True,
+                        timeout=self._timeout(None),
+                        limits=self.limits,
+                        http2=self.http2,
+                        transport=self.transport
+                    )
+                client = self._client
+        return client
+    
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Paylaşılan httpx.AsyncClient nesnesi (ilk kullanımda oluşturulur)."""
+        client = self._async_client
+        if client is None:
+            with self._client_lock:
+                if self._async_client is None:
+                    self._async_client = httpx.AsyncClient(
+                        follow_redirects=True,
+                        timeout=self._timeout(None),
+                        limits=self.limits,
+                        http2=self.http2 and self.async_transport is None,
+                        transport=self.async_transport
+                    )
+                client = self._async_client
+        return client
+    
+    def url(self, path: str) -> str:
+        """Verilen yol için tam Open Library adresini döndürür."""
+        return f"{self.base_url}{path}"
+    
+    def get(self, path: str, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        Open Library'ye GET isteği gönderir; geçici hatalarda tekrar dener.
+        
+        Args:
+            path (str): İstek yolu (örn: /isbn/9780451524935.json)
+            timeout (Optional[float]): Bu istek için zaman aşımı; None ise varsayılan
+            
+        Returns:
+            httpx.Response: Sunucu yanıtı
+            
+        Raises:
+            CircuitOpenError: Devre kesici açıkken
+            httpx.RequestError: Ağ hatası veya zaman aşımında (tekrar denemelerden sonra)
+        """
+        url = self.url(path)
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow_request():
+                raise CircuitOpenError("Open Library devre kesicisi açık")
+            try:
+                response = self._send(lambda: self.client.get(url, timeout=self._timeout(timeout)))
+            except httpx.RequestError:
+                self.breaker.record_failure()
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code < 500 and response.status_code not in RETRY_STATUS_CODES:
+                    self.breaker.record_success()
+                    return response
+                # Her 5xx yanıtı devre kesicide hata sayılır, 500 ise tekrar denenmez
+                self.breaker.record_failure()
+                if attempt == self.retries or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+            finally:
+                # Sonuç kaydedilmeden biten deneme isteği devreyi kilitlemesin
+                self.breaker.release_trial()
+            self._count_retry()
+            time.sleep(self._backoff_delay(attempt))
+    
+    async def aget(self, path: str, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        get'in asenkron karşılığı.
+        
+        Args:
+            path (str): İstek yolu (örn: /isbn/9780451524935.json)
+            timeout (Optional[float]): Bu istek için zaman aşımı; None ise varsayılan
+            
+        Returns:
+            httpx.Response: Sunucu yanıtı
+            
+        Raises:
+            CircuitOpenError: Devre kesici açıkken
+            httpx.RequestError: Ağ hatası veya zaman aşımında (tekrar denemelerden sonra)
+        """
+        url = self.url(path)
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow_request():
+                raise CircuitOpenError("Open Library devre kesicisi açık")
+            try:
+                response = await self._asend(lambda: self.async_client.get(url, timeout=self._timeout(timeout)))
+            except httpx.RequestError:
+                self.breaker.record_failure()
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code < 500 and response.status_code not in RETRY_STATUS_CODES:
+                    self.breaker.record_success()
+                    return response
+                # Her 5xx yanıtı devre kesicide hata sayılır, 500 ise tekrar denenmez
+                self.breaker.record_failure()
+                if attempt == self.retries or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+            finally:
+                # Sonuç kaydedilmeden biten deneme isteği devreyi kilitlemesin
+                self.breaker.release_trial()
+            self._count_retry()
+            await asyncio.sleep(self._backoff_delay(attempt))
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Tekrar denemeden önce beklenecek süre ("full jitter")."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+    
+    def _count_retry(self) -> None:
+        with self._lock:
+            self.retried += 1
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """İkinci isteğin gönderileceği gecikmeyi döndürür; hedging kapalıysa None."""
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            latencies = sorted(self._latencies)
+        # Yeterli ölçüm yoksa yalnızca tek istek gönderilir
+        if len(latencies) < 20:
+            return None
+        return latencies[int(self.hedge_percentile * (len(latencies) - 1))]
+    
+    def _timed(self, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """İsteği gönderir ve başarılı isteklerin süresini kaydeder."""
+        started = time.monotonic()
+        response = send()
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+        return response
+    
+    def _send(self, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Tek bir denemeyi gönderir. Hedging açıksa ve yanıt gecikirse aynı istek
+        bir kez daha gönderilir; önce başarılı olan yanıt döndürülür.
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._timed(send)
+        
+        if self._hedge_executor is None:
+            with self._lock:
+                if self._hedge_executor is None:
+                    # Bağlantı havuzundan fazla iş parçacığı istekleri yalnızca havuzda bekletir
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=self.limits.max_connections or HEDGE_MAX_WORKERS,
+                        thread_name_prefix="openlibrary-hedge"
+                    )
+        
+        started = threading.Event()
+        
+        def first() -> httpx.Response:
+            started.set()
+            return self._timed(send)
+        
+        pending = {self._hedge_executor.submit(first)}
+        # Gecikme, istek kuyrukta beklerken değil gönderilmeye başladığında işlemeye başlar
+        started.wait()
+        done, _ = wait(pending, timeout=delay)
+        if not done:
+            with self._lock:
+                self.hedged += 1
+            pending.add(self._hedge_executor.submit(self._timed, send))
+        
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # Geride kalan istek arka planda tamamlanır, sonucu kullanılmaz
+                    return future.result()
+                error = future.exception()
+        raise error
+    
+    async def _asend(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """_send'in asenkron karşılığı; geride kalan istek iptal edilir."""
+        async def timed() -> httpx.Response:
+            started = time.monotonic()
+            response = await send()
+            with self._lock:
+                self._latencies.append(time.monotonic() - started)
+            return response
+        
+        delay = self._hedge_delay()
+        if delay is None:
+            return await timed()
+        
+        pending = {asyncio.ensure_future(timed())}
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            with self._lock:
+                self.hedged += 1
+            pending.add(asyncio.ensure_future(timed()))
+        
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def stats(self) -> dict:
+        """
+        İstemcinin dayanıklılık istatistiklerini döndürür.
+        
+        Returns:
+            dict: circuit (devre kesici durumu), retried, hedged ve son isteklerin
+                p50/p95/p99 gecikmeleri (saniye)
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        
+        def percentile(p: float) -> Optional[float]:
+            return latencies[int(p * (len(latencies) - 1))] if latencies else None
+        
+        return {
+            "circuit": self.breaker.stats(),
+            "retried": self.retried,
+            "hedged": self.hedged,
+            "latency": {"p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99)}
+        }
+    
+    def close(self) -> None:
+        """Senkron istemcinin açık bağlantılarını kapatır."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+    
+    async def aclose(self) -> None:
+        """Senkron ve asenkron istemcilerin açık bağlantılarını kapatır."""
+        with self._client_lock:
+            client, self._async_client = self._async_client, None
+        if client is not None:
+            await client.aclose()
+        self.close()
@@ -0,0 +1,134 @@
+"""
+Kütüphane Yönetim Sistemi - Hazır Yanıt Önbelleği
+
+Sık okunan uç noktaların JSON'a çevrilmiş yanıt gövdelerini katalog sürümüyle
+birlikte saklar; katalog değişmediği sürece aynı istek model oluşturma ve JSON
+kodlama yapılmadan yanıtlanır.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Toplam boyutu max_bytes ile sınırlı, LRU sıralı yanıt önbelleği.
+    
+    Kayıtlar tek bir katalog sürümüne aittir: daha yeni bir sürümle yapılan ilk
+    get veya set çağrısı tüm eski kayıtları siler, eski sürümle yapılan set
+    çağrıları yok sayılır. Sınır aşıldığında en uzun süredir kullanılmayan
+    kayıtlar silinir.
+    """
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        ResponseCache sınıfının constructor'ı.
+        
+        Args:
+            max_bytes (int): Saklanacak yanıt gövdeleri ve başlıklarının toplam
+                en fazla boyutu (bayt)
+                
+        Raises:
+            ValueError: max_bytes pozitif değilse
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes pozitif olmalıdır")
+            
+        self.max_bytes = max_bytes
+        self.version: Optional[int] = None
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, Dict[str, str], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _sync_version(self, version: int) -> bool:
+        """
+        Önbelleği verilen sürüme taşır; kilit tutulurken çağrılmalıdır.
+        
+        Returns:
+            bool: Sürüm önbelleğin sürümünden eski değilse True
+        """
+        if self.version is not None and version < self.version:
+            return False
+        if version != self.version:
+            self._entries.clear()
+            self.size = 0
+            self.version = version
+        return True
+    
+    def get(self, version: int, key: Hashable) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """
+        Sürüm ve anahtara ait hazır yanıtı döndürür.
+        
+        Args:
+            version (int): Yanıtın ait olması gereken katalog sürümü
+            key (Hashable): Uç nokta ve parametrelerden oluşan anahtar
+            
+        Returns:
+            Optional[Tuple[bytes, Dict[str, str]]]: Yanıt gövdesi ve ek başlıklar;
+                kayıt yoksa None
+        """
+        with self._lock:
+            entry = self._entries.get(key) if self._sync_version(version) else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+    
+    def set(self, version: int, key: Hashable, body: bytes,
+            headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Hazır yanıtı kaydeder. Tek başına max_bytes'ı aşan yanıtlar saklanmaz.
+        
+        Args:
+            version (int): Yanıtın üretildiği katalog sürümü
+            key (Hashable): Uç nokta ve parametrelerden oluşan anahtar
+            body (bytes): Kodlanmış yanıt gövdesi
+            headers (Optional[Dict[str, str]]): Yanıtla birlikte gönderilecek ek başlıklar
+        """
+        headers = headers or {}
+        size = len(body) + sum(len(name) + len(value) for name, value in headers.items())
+        with self._lock:
+            if size > self.max_bytes or not self._sync_version(version):
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[2]
+            self._entries[key] = (body, headers, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self) -> None:
+        """Tüm kayıtları siler."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+    
+    def stats(self) -> dict:
+        """
+        Önbellek istatistiklerini döndürür.
+        
+        Returns:
+            dict: entries, size, max_bytes, version, hits, misses ve evictions
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "max_bytes": self.max_bytes,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,129 @@
+"""
+Kütüphane Yönetim Sistemi - Arama İndeksi
+
+Başlık, yazar ve ISBN içinde alt dizi (substring) aramasını, her sorguda tüm
+kitapları taramak yerine üçlü karakter (trigram) indeksiyle hızlandırır.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set
+from book import Book
+
+
+class TrigramIndex:
+    """
+    Kitapların normalize edilmiş başlık, yazar ve ISBN alanları için trigram indeksi.
+    
+    Her kitaba ekleme sırasını veren bir tamsayı kimlik atanır ve her trigram,
+    onu içeren kitapların kimliklerinden oluşan sıralı bir diziye (array) eşlenir;
+    ISBN dizgilerini kümelerde tutmaya göre kitap başına birkaç kat daha az
+    bellek kullanır. Bir sorgunun tüm trigramlarını içeren kitaplar aday olarak
+    döndürülür; adayların gerçekten eşleşip eşleşmediği çağıran tarafından
+    doğrulanmalıdır.
+    """
+    
+    def __init__(self):
+        """TrigramIndex sınıfının constructor'ı."""
+        self._postings: Dict[str, array] = {}
+        # ISBN -> kimlik ve kimlik -> ISBN; kimlikler ekleme sırasıyla artar
+        self._ids: Dict[str, int] = {}
+        self._isbns: Dict[int, str] = {}
+        self._next_id = 0
+    
+    @staticmethod
+    def _trigrams(text: str) -> Set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    @classmethod
+    def _book_trigrams(cls, book: Book) -> Set[str]:
+        """Kitabın arama yapılan alanlarındaki tüm trigramları döndürür."""
+        # Arama sorgusu küçük harfe çevrilir; ISBN ise olduğu gibi karşılaştırılır
+        return (cls._trigrams(book.title.lower())
+                | cls._trigrams(book.author.lower())
+                | cls._trigrams(book.isbn))
+    
+    @staticmethod
+    def _contains(ids: array, book_id: int) -> bool:
+        position = bisect_left(ids, book_id)
+        return position < len(ids) and ids[position] == book_id
+    
+    def _insert(self, trigrams: Set[str], book_id: int) -> None:
+        for trigram in trigrams:
+            ids = self._postings.get(trigram)
+            if ids is None:
+                self._postings[trigram] = array("I", [book_id])
+            elif not ids or ids[-1] < book_id:
+                ids.append(book_id)
+            else:
+                # Yerinde güncellenen kitabın eski kimliği sıralı konumuna girer
+                ids.insert(bisect_left(ids, book_id), book_id)
+    
+    def _delete(self, trigrams: Set[str], book_id: int) -> None:
+        for trigram in trigrams:
+            ids = self._postings.get(trigram)
+            if ids is not None and self._contains(ids, book_id):
+                del ids[bisect_left(ids, book_id)]
+                if not ids:
+                    del self._postings[trigram]
+    
+    def add(self, book: Book) -> None:
+        """Kitabı indekse ekler."""
+        book_id = self._next_id
+        self._next_id += 1
+        self._ids[book.isbn] = book_id
+        self._isbns[book_id] = book.isbn
+        self._insert(self._book_trigrams(book), book_id)
+    
+    def replace(self, old_book: Book, new_book: Book) -> None:
+        """
+        Aynı ISBN'li kitabın indeks kaydını günceller; kitap sonuçlardaki
+        (ekleme sırasındaki) yerini korur.
+        """
+        book_id = self._ids.get(old_book.isbn)
+        if book_id is None:
+            self.add(new_book)
+            return
+        old_trigrams = self._book_trigrams(old_book)
+        new_trigrams = self._book_trigrams(new_book)
+        self._delete(old_trigrams - new_trigrams, book_id)
+        self._insert(new_trigrams - old_trigrams, book_id)
+    
+    def remove(self, book: Book) -> None:
+        """Kitabı indeksten çıkarır."""
+        book_id = self._ids.pop(book.isbn, None)
+        if book_id is None:
+            return
+        del self._isbns[book_id]
+        self._delete(self._book_trigrams(book), book_id)
+    
+    def clear(self) -> None:
+        """İndeksi boşaltır."""
+        self._postings = {}
+        self._ids = {}
+        self._isbns = {}
+        self._next_id = 0
+    
+    def candidates(self, query: str) -> Optional[List[str]]:
+        """
+        Küçük harfe çevrilmiş sorgu için aday kitapların ISBN'lerini döndürür.
+        
+        Args:
+            query (str): Küçük harfe çevrilmiş arama sorgusu
+            
+        Returns:
+            Optional[List[str]]: Ekleme sırasına göre aday ISBN'ler; sorgu üç
+                karakterden kısaysa indeks kullanılamaz ve None döner
+        """
+        trigrams = self._trigrams(query)
+        if not trigrams:
+            return None
+            
+        # En kısa listeden başlayarak diğer sıralı listelerde ikili arama yap
+        postings = sorted((self._postings.get(trigram, array("I")) for trigram in trigrams), key=len)
+        result = postings[0].tolist()
+        for ids in postings[1:]:
+            if not result:
+                break
+            result = [book_id for book_id in result if self._contains(ids, book_id)]
+        return [self._isbns[book_id] for book_id in result]
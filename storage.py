@@ -0,0 +1,1029 @@
+"""
+Kütüphane Yönetim Sistemi - Depolama Arka Uçları
+
+Library sınıfı kitapları doğrudan tutmak yerine bir depolama arka ucuna
+(StorageBackend) devreder. Varsayılan arka uç JSON dosyası (JSONStorage),
+büyük kataloglar için SQLite (SQLiteStorage) kullanılabilir.
+"""
+
+import atexit
+import bisect
+import heapq
+import json
+import mmap
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from author_stats import AuthorStats
+from book import Book
+from book_store import BookStore
+from search_index import TrigramIndex
+
+
+WRITE_POLICIES = ("immediate", "batch", "interval")
+FILE_FORMATS = ("auto", "json", "ndjson")
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+BINARY_EXTENSIONS = (".bcat",)
+
+# İkili katalog düzeni: başlık | sıralı ISBN anahtarları | ofset tablosu | kayıtlar
+BINARY_MAGIC = b"LIBCAT01"
+BINARY_HEADER = struct.Struct("<8sII")  # sihirli değer, kitap sayısı, anahtar genişliği
+BINARY_KEY_WIDTH = 20  # Book sınıfındaki en uzun ISBN
+BINARY_OFFSET = struct.Struct("<Q")
+BINARY_RECORD_HEADER = struct.Struct("<HHB")  # başlık, yazar ve ISBN bayt uzunlukları
+
+
+class StorageBackend:
+    """
+    Kitapların saklandığı arka uçlar için temel sınıf.
+    
+    Alt sınıflar ISBN ile erişim, ekleme, silme, listeleme, arama ve istatistik
+    işlemlerini kendi veri yapılarına uygun şekilde gerçekler.
+    """
+    
+    def get(self, isbn: str) -> Optional[Book]:
+        """ISBN numarasına göre kitabı döndürür, yoksa None."""
+        raise NotImplementedError
+    
+    def contains(self, isbn: str) -> bool:
+        """Verilen ISBN'li kitabın var olup olmadığını döndürür."""
+        return self.get(isbn) is not None
+    
+    def add(self, book: Book) -> None:
+        """Kitabı ekler. ISBN'in daha önce eklenmemiş olduğu varsayılır."""
+        raise NotImplementedError
+    
+    def add_many(self, books: List[Book]) -> None:
+        """
+        Kitapları toplu olarak ekler ve tek seferde kalıcı hale getirir.
+        
+        Zaten var olan ISBN'lerin kayıtları yerinde güncellenir.
+        """
+        for book in books:
+            if self.contains(book.isbn):
+                self.remove(book.isbn)
+            self.add(book)
+    
+    def remove(self, isbn: str) -> Optional[Book]:
+        """Kitabı siler ve silinen kitabı döndürür, yoksa None."""
+        raise NotImplementedError
+    
+    def remove_many(self, isbns: List[str]) -> List[Book]:
+        """
+        Kitapları toplu olarak siler ve tek seferde kalıcı hale getirir.
+        
+        Returns:
+            List[Book]: Silinen kitaplar (bulunamayan ISBN'ler atlanır)
+        """
+        removed = []
+        for isbn in isbns:
+            book = self.remove(isbn)
+            if book is not None:
+                removed.append(book)
+        return removed
+    
+    def iter_books(self) -> Iterator[Book]:
+        """Kitapları ekleme sırasıyla tek tek döndürür."""
+        raise NotImplementedError
+    
+    def count(self) -> int:
+        """Toplam kitap sayısını döndürür."""
+        raise NotImplementedError
+    
+    def page(self, after: Optional[str], limit: int) -> List[Book]:
+        """
+        ISBN sırasına göre after'dan sonra gelen en fazla limit kitabı döndürür.
+        
+        Args:
+            after (Optional[str]): Önceki sayfanın son ISBN'i; None ise baştan başlanır
+            limit (int): Döndürülecek en fazla kitap sayısı
+            
+        Returns:
+            List[Book]: ISBN'e göre sıralı kitaplar
+        """
+        books = (book for book in self.iter_books() if after is None or book.isbn > after)
+        return heapq.nsmallest(limit, books, key=lambda book: book.isbn)
+    
+    def search(self, query: str) -> List[Book]:
+        """
+        Başlık, yazar veya ISBN içinde geçen (büyük/küçük harf duyarsız) kitapları döndürür.
+        """
+        query = query.lower()
+        return [
+            book for book in self.iter_books()
+            if query in book.title.lower() or query in book.author.lower() or query in book.isbn
+        ]
+    
+    def stats(self) -> dict:
+        """
+        Kitap sayısı, farklı yazar sayısı ve en çok kitabı olan yazarı döndürür.
+        
+        Returns:
+            dict: total_books, unique_authors, authors_with_most_books ve
+                most_books_count anahtarlarını içeren sözlük
+        """
+        authors: Dict[str, int] = {}
+        for book in self.iter_books():
+            authors[book.author] = authors.get(book.author, 0) + 1
+            
+        stats = {
+            "total_books": sum(authors.values()),
+            "unique_authors": len(authors),
+            "authors_with_most_books": None,
+            "most_books_count": 0
+        }
+        if authors:
+            max_author = max(authors, key=authors.get)
+            stats["authors_with_most_books"] = max_author
+            stats["most_books_count"] = authors[max_author]
+        return stats
+    
+    def shared_version(self) -> Optional[int]:
+        """
+        Depo başka süreçlerle paylaşılabiliyorsa, her değişiklikte (hangi süreçten
+        yapılırsa yapılsın) artan kalıcı sürüm sayacını döndürür. Yalnızca bu
+        süreçten değiştirilebilen arka uçlar None döndürür.
+        """
+        return None
+    
+    def load(self) -> None:
+        """Kalıcı depodaki kitapları yükler."""
+    
+    def save(self) -> None:
+        """Tüm kitapları kalıcı depoya yazar."""
+    
+    def flush(self) -> None:
+        """Bekleyen değişiklikleri kalıcı depoya yazar."""
+    
+    def compact(self) -> None:
+        """Kalıcı depoyu sıkıştırır."""
+    
+    def close(self) -> None:
+        """Bekleyen değişiklikleri yazar ve kaynakları serbest bırakır."""
+        self.flush()
+
+
+class JSONStorage(StorageBackend):
+    """
+    Kitapları bellekte tutup JSON veya NDJSON dosyasına kaydeden arka uç.
+    
+    İsteğe bağlı günlük (journal) modu ve yazma politikaları ile her değişiklikte
+    tüm dosyanın yeniden yazılması önlenebilir.
+    """
+    
+    def __init__(self, filename: str, journal: bool = False,
+                 journal_compact_threshold: int = 1000,
+                 write_policy: str = "immediate", flush_every: int = 100,
+                 flush_interval_ms: int = 1000, file_format: str = "auto",
+                 progress_callback: Optional[Callable[[int], None]] = None,
+                 progress_every: int = 10000, columnar: bool = False,
+                 search_index: bool = True):
+        """
+        JSONStorage sınıfının constructor'ı.
+        
+        Args:
+            filename (str): Kitapların saklanacağı dosyanın adı
+            journal (bool): True ise her değişiklik tüm dosyayı yeniden yazmak
+                yerine günlük (journal) dosyasına tek satır olarak eklenir
+            journal_compact_threshold (int): Günlük bu kadar kayda ulaştığında
+                ana dosyaya katlanır (compaction)
+            write_policy (str): Değişikliklerin ne zaman diske yazılacağı:
+                "immediate" (her değişiklikte), "batch" (her flush_every
+                değişiklikte) veya "interval" (en geç flush_interval_ms içinde)
+            flush_every (int): "batch" politikasında yazma için değişiklik sayısı
+            flush_interval_ms (int): "interval" politikasında en uzun bekleme süresi
+            file_format (str): "json" (tek JSON dizisi), "ndjson" (satır başına
+                bir kitap) veya "auto" (.ndjson/.jsonl uzantısında ndjson)
+            progress_callback (Optional[Callable[[int], None]]): Yükleme sırasında
+                o ana kadar okunan kitap sayısıyla çağrılır
+            progress_every (int): progress_callback'in kaç kitapta bir çağrılacağı
+            columnar (bool): True ise kitaplar Book nesneleri yerine sütun tabanlı
+                BookStore içinde tutulur (çok büyük kataloglar için daha az bellek)
+            search_index (bool): True ise search için trigram indeksi tutulur;
+                False ise her aramada tüm kitaplar taranır
+            
+        Raises:
+            ValueError: Bilinmeyen bir yazma politikası veya dosya formatı verildiğinde
+        """
+        if write_policy not in WRITE_POLICIES:
+            raise ValueError(f"Geçersiz yazma politikası: {write_policy}")
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Geçersiz dosya formatı: {file_format}")
+        if file_format == "auto":
+            file_format = "ndjson" if filename.endswith(NDJSON_EXTENSIONS) else "json"
+            
+        self.filename = filename
+        self.file_format = file_format
+        self.progress_callback = progress_callback
+        self.progress_every = max(1, progress_every)
+        self.journal = journal
+        self.journal_filename = f"{filename}.journal"
+        self.journal_compact_threshold = journal_compact_threshold
+        self._journal_entries = 0
+        self.write_policy = write_policy
+        self.flush_every = max(1, flush_every)
+        self.flush_interval_ms = flush_interval_ms
+        # Henüz diske yazılmamış değişiklikler
+        self._pending: List[dict] = []
+        self._flush_lock = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._closed = False
+        self.columnar = columnar
+        # ISBN -> Book eşlemesi; ekleme sırasını korur ve O(1) arama sağlar
+        self._books_by_isbn = self._new_index()
+        # Sayfalama için sıralı ISBN listesi; değişiklikte silinir, ilk sayfada oluşturulur
+        self._sorted_isbns: Optional[List[str]] = None
+        # Ana dosya okunamadıysa ilk kayıtta üzerine yazılmadan önce kenara alınır
+        self._unreadable_snapshot = False
+        self._search_index: Optional[TrigramIndex] = TrigramIndex() if search_index else None
+        self._author_stats = AuthorStats()
+        
+        if self.write_policy != "immediate":
+            # Program kapanırken bekleyen değişiklikler kaybolmasın
+            atexit.register(self.close)
+    
+    def _new_index(self) -> Union[Dict[str, Book], BookStore]:
+        """Boş bir ISBN -> Book eşlemesi oluşturur."""
+        return BookStore() if self.columnar else {}
+    
+    def get(self, isbn: str) -> Optional[Book]:
+        return self._books_by_isbn.get(isbn)
+    
+    def contains(self, isbn: str) -> bool:
+        return isbn in self._books_by_isbn
+    
+    def _index_book(self, book: Book) -> None:
+        self._sorted_isbns = None
+        if self._search_index is not None:
+            self._search_index.add(book)
+        self._author_stats.add(book)
+    
+    def _unindex_book(self, book: Book) -> None:
+        self._sorted_isbns = None
+        if self._search_index is not None:
+            self._search_index.remove(book)
+        self._author_stats.remove(book)
+    
+    def _reindex_book(self, old_book: Book, new_book: Book) -> None:
+        """Yerinde güncellenen kitabın indekslerini, kitabın sırasını koruyarak günceller."""
+        if self._search_index is not None:
+            self._search_index.replace(old_book, new_book)
+        self._author_stats.replace(old_book, new_book)
+    
+    def add(self, book: Book) -> None:
+        self._books_by_isbn[book.isbn] = book
+        self._index_book(book)
+        self._persist({"op": "add", "book": book.to_dict()})
+    
+    def add_many(self, books: List[Book]) -> None:
+        records = []
+        for book in books:
+            old_book = self._books_by_isbn.get(book.isbn)
+            # Var olan anahtar yerinde güncellenir, ekleme sırası değişmez
+            self._books_by_isbn[book.isbn] = book
+            if old_book is not None:
+                self._reindex_book(old_book, book)
+            else:
+                self._index_book(book)
+            records.append({"op": "add", "book": book.to_dict()})
+        self._persist(*records)
+    
+    def remove(self, isbn: str) -> Optional[Book]:
+        book = self._books_by_isbn.pop(isbn, None)
+        if book:
+            self._unindex_book(book)
+            self._persist({"op": "remove", "isbn": isbn})
+        return book
+    
+    def remove_many(self, isbns: List[str]) -> List[Book]:
+        removed = []
+        for isbn in isbns:
+            book = self._books_by_isbn.pop(isbn, None)
+            if book:
+                self._unindex_book(book)
+                removed.append(book)
+        self._persist(*({"op": "remove", "isbn": book.isbn} for book in removed))
+        return removed
+    
+    def iter_books(self) -> Iterator[Book]:
+        # Yalnızca ISBN'lerin kopyası alınır; yineleme sırasında yapılan
+        # değişiklikler hata vermez, kitaplar (columnar modda) tek tek oluşturulur
+        for isbn in list(self._books_by_isbn):
+            book = self._books_by_isbn.get(isbn)
+            if book is not None:
+                yield book
+    
+    def count(self) -> int:
+        return len(self._books_by_isbn)
+    
+    def page(self, after: Optional[str], limit: int) -> List[Book]:
+        isbns = self._sorted_isbns
+        if isbns is None:
+            isbns = self._sorted_isbns = sorted(self._books_by_isbn)
+        start = 0 if after is None else bisect.bisect_right(isbns, after)
+        return [self._books_by_isbn.get(isbn) for isbn in isbns[start:start + limit]]
+    
+    def search(self, query: str) -> List[Book]:
+        """
+        Trigram indeksinden gelen adayları doğrulayarak arama yapar.
+        
+        Üç karakterden kısa sorgularda veya indeks kapalıyken tüm kitaplar taranır.
+        """
+        if self._search_index is None:
+            return super().search(query)
+        
+        query = query.lower()
+        candidates = self._search_index.candidates(query)
+        if candidates is None:
+            return super().search(query)
+        
+        found_books = []
+        for isbn in candidates:
+            book = self._books_by_isbn.get(isbn)
+            if book and (query in book.title.lower() or
+                         query in book.author.lower() or
+                         query in book.isbn):
+                found_books.append(book)
+        return found_books
+    
+    def stats(self) -> dict:
+        """Ekleme ve silmelerle güncel tutulan yazar sayılarından istatistik döndürür."""
+        return self._author_stats.stats()
+    
+    def load(self) -> None:
+        """
+        JSON veya NDJSON dosyasından kitapları yükler.
+        
+        Günlük modu açıksa, son tam kayıt (snapshot) yüklendikten sonra günlükteki
+        değişiklikler sırayla yeniden uygulanır.
+        """
+        migrate = self._load_snapshot()
+        if self.journal:
+            self._replay_journal()
+        self._rebuild_indexes()
+            
+        if migrate:
+            print(f"{self.filename} dosyası satır tabanlı (NDJSON) formata dönüştürülüyor.")
+            self.save()
+    
+    def _rebuild_indexes(self) -> None:
+        """Arama indeksini ve yazar istatistiklerini yüklenmiş kitaplardan yeniden oluşturur."""
+        if self._search_index is not None:
+            self._search_index.clear()
+        self._author_stats.clear()
+        for book in self._books_by_isbn.values():
+            self._index_book(book)
+    
+    def _load_snapshot(self) -> bool:
+        """
+        Ana dosyadaki tam kaydı yükler.
+        
+        NDJSON formatında kitaplar satır satır, tek tek oluşturulur. NDJSON
+        beklenirken eski tip bir JSON dizisi bulunursa dosya yine yüklenir.
+        
+        Returns:
+            bool: Dosyanın NDJSON formatına dönüştürülmesi gerekiyorsa True
+        """
+        self._unreadable_snapshot = False
+        if not os.path.exists(self.filename):
+            print(f"Veri dosyası ({self.filename}) bulunamadı. Yeni bir kütüphane oluşturuluyor.")
+            return False
+            
+        migrate = False
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as file:
+                self._books_by_isbn = self._new_index()
+                if self.file_format == "ndjson" and not self._is_json_array(file):
+                    books = self._iter_ndjson_books(file)
+                else:
+                    books = (Book.from_dict(book_data) for book_data in json.load(file))
+                    migrate = self.file_format == "ndjson"
+                    
+                for count, book in enumerate(books, 1):
+                    self._books_by_isbn[book.isbn] = book
+                    if self.progress_callback and count % self.progress_every == 0:
+                        self.progress_callback(count)
+                if self.progress_callback:
+                    self.progress_callback(len(self._books_by_isbn))
+                print(f"{len(self._books_by_isbn)} kitap başarıyla yüklendi.")
+        except json.JSONDecodeError:
+            print(f"Hata: {self.filename} dosyası bozuk. Yeni bir kütüphane oluşturuluyor.")
+            self._books_by_isbn = self._new_index()
+            self._unreadable_snapshot = True
+            migrate = False
+        except Exception as e:
+            print(f"Dosya okuma hatası: {e}")
+            self._books_by_isbn = self._new_index()
+            self._unreadable_snapshot = True
+            migrate = False
+            
+        return migrate
+    
+    @staticmethod
+    def _is_json_array(file: TextIO) -> bool:
+        """
+        Dosyanın eski tip JSON dizisi olup olmadığını ilk karakterine bakarak anlar.
+        
+        Args:
+            file (TextIO): Başında konumlanmış, okunmak üzere açık dosya
+            
+        Returns:
+            bool: Dosya '[' ile başlıyorsa True
+        """
+        first_char = ""
+        while True:
+            char = file.read(1)
+            if not char or not char.isspace():
+                first_char = char
+                break
+        file.seek(0)
+        return first_char == "["
+    
+    def _iter_ndjson_books(self, file: TextIO) -> Iterator[Book]:
+        """
+        NDJSON dosyasındaki kitapları tek tek okur.
+        
+        Args:
+            file (TextIO): Okunmak üzere açık NDJSON dosyası
+            
+        Yields:
+            Book: Her geçerli satır için oluşturulan kitap
+        """
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("satır bir JSON nesnesi değil")
+                yield Book.from_dict(record)
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                print(f"Hata: {self.filename} dosyasının {line_number}. satırı atlanıyor: {e}")
+    
+    def _replay_journal(self) -> None:
+        """
+        Günlük dosyasındaki değişiklikleri yüklenmiş kaydın üzerine uygular.
+        
+        Yarım yazılmış (bozuk) bir satırda durulur; önceki kayıtlar geçerli kalır.
+        Günlük son geçerli kaydın sonundan kesilir, böylece sonraki eklemeler
+        bozuk satırın devamına yazılıp bir sonraki açılışta kaybolmaz.
+        """
+        self._journal_entries = 0
+        if not os.path.exists(self.journal_filename):
+            return
+            
+        try:
+            good_offset = 0
+            torn = False
+            with open(self.journal_filename, 'rb') as file:
+                for raw_line in file:
+                    try:
+                        # Satır sonu olmayan son satır tamamlanmamış bir yazmadır
+                        if not raw_line.endswith(b"\n"):
+                            raise ValueError("satır sonu eksik")
+                        line = raw_line.decode('utf-8')
+                        if line.strip():
+                            record = json.loads(line)
+                            if not isinstance(record, dict):
+                                raise ValueError("kayıt bir JSON nesnesi değil")
+                            if record["op"] == "add":
+                                book = Book.from_dict(record["book"])
+                                self._books_by_isbn[book.isbn] = book
+                            elif record["op"] == "remove":
+                                self._books_by_isbn.pop(record["isbn"], None)
+                            self._journal_entries += 1
+                    except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+                        print(f"Hata: Günlük kaydı okunamadı, kalan kayıtlar atlanıyor: {e}")
+                        torn = True
+                        break
+                    good_offset += len(raw_line)
+                    
+            if torn:
+                with open(self.journal_filename, 'r+b') as file:
+                    file.truncate(good_offset)
+        except Exception as e:
+            print(f"Günlük okuma hatası: {e}")
+    
+    def _persist(self, *records: dict) -> None:
+        """
+        Değişiklikleri yazma politikasına göre kalıcı hale getirir.
+        
+        Args:
+            *records (dict): Değişiklik kayıtları ({"op": "add", "book": ...} veya
+                {"op": "remove", "isbn": ...})
+        """
+        if not records:
+            return
+        
+        with self._flush_lock:
+            self._pending.extend(records)
+            
+            if self.write_policy == "immediate":
+                self.flush()
+            elif self.write_policy == "batch":
+                if len(self._pending) >= self.flush_every:
+                    self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval_ms / 1000.0, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self) -> None:
+        """
+        Bekleyen tüm değişiklikleri diske yazar.
+        
+        Günlük modunda bekleyen kayıtlar tek seferde günlüğe eklenir, aksi halde
+        tüm katalog atomik olarak yeniden yazılır.
+        """
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+                
+            if not self._pending:
+                return
+                
+            if not self.journal:
+                self.save()
+                return
+                
+            try:
+                with open(self.journal_filename, 'a', encoding='utf-8') as file:
+                    file.write("".join(json.dumps(record, ensure_ascii=False) + "\n"
+                                       for record in self._pending))
+                self._journal_entries += len(self._pending)
+                self._pending = []
+            except Exception as e:
+                print(f"Günlük yazma hatası: {e}")
+                self.save()
+                return
+                
+            if self._journal_entries >= self.journal_compact_threshold:
+                self.compact()
+    
+    def close(self) -> None:
+        """
+        Bekleyen değişiklikleri yazar ve depoyu kapatır.
+        """
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+    
+    def compact(self) -> None:
+        """
+        Günlükteki değişiklikleri ana dosyaya katlar ve günlüğü boşaltır.
+        """
+        self.save()
+    
+    def save(self) -> None:
+        """
+        Kitapları dosya formatına göre JSON veya NDJSON dosyasına kaydeder.
+        
+        Dosya önce geçici bir dosyaya yazılır ve ardından os.replace ile yerine
+        konur; böylece yazma sırasında oluşan bir çökme mevcut dosyayı bozamaz.
+        Günlük modu açıksa tam kayıt yazıldıktan sonra günlük boşaltılır.
+        Yüklemede okunamayan ana dosya üzerine yazılmaz; önce yanına
+        (.corrupt uzantısıyla) taşınır.
+        """
+        with self._flush_lock:
+            books = list(self._books_by_isbn.values())
+            try:
+                if self._unreadable_snapshot:
+                    self._set_aside_unreadable_snapshot()
+                if self.file_format == "ndjson":
+                    self._atomic_write(lambda file: file.writelines(
+                        json.dumps(book.to_dict(), ensure_ascii=False) + "\n" for book in books
+                    ))
+                else:
+                    self._atomic_write(lambda file: json.dump(
+                        [book.to_dict() for book in books], file, ensure_ascii=False, indent=2
+                    ))
+            except Exception as e:
+                print(f"Dosya kaydetme hatası: {e}")
+                return
+                
+            self._pending = []
+            self._truncate_journal()
+    
+    def _set_aside_unreadable_snapshot(self) -> None:
+        """Okunamayan ana dosyayı, içindeki veriler kaybolmasın diye yeni bir adla saklar."""
+        if os.path.exists(self.filename):
+            backup = f"{self.filename}.corrupt"
+            suffix = 1
+            while os.path.exists(backup):
+                backup = f"{self.filename}.corrupt.{suffix}"
+                suffix += 1
+            os.replace(self.filename, backup)
+            print(f"Okunamayan {self.filename} dosyası {backup} olarak saklandı.")
+        self._unreadable_snapshot = False
+    
+    def _atomic_write(self, write: Callable[[TextIO], None]) -> None:
+        """
+        Ana dosyayı geçici bir dosya üzerinden atomik olarak yeniden yazar.
+        
+        Args:
+            write (Callable[[TextIO], None]): Açık dosya nesnesine içeriği yazan fonksiyon
+        """
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, temp_path = tempfile.mkstemp(prefix=".library-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                write(file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.filename)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+    
+    def _truncate_journal(self) -> None:
+        """Tam kayıt yazıldıktan sonra artık gereksiz olan günlüğü siler."""
+        if self.journal and os.path.exists(self.journal_filename):
+            try:
+                os.remove(self.journal_filename)
+            except OSError as e:
+                print(f"Günlük temizleme hatası: {e}")
+        self._journal_entries = 0
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Kitapları SQLite veritabanında saklayan arka uç.
+    
+    Kitaplar belleğe yüklenmez; arama, sayma ve istatistikler SQL sorgularıyla
+    veritabanında yapılır. isbn, başlık ve yazar sütunları indekslidir.
+    """
+    
+    def __init__(self, filename: str):
+        """
+        SQLiteStorage sınıfının constructor'ı.
+        
+        Args:
+            filename (str): SQLite veritabanı dosyasının adı
+        """
+        self.filename = filename
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        with self._conn:
+            # title_norm ve author_norm, Python'un lower() sonucudur; SQLite'ın
+            # lower() fonksiyonu yalnızca ASCII harfleri küçültür
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS books ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " isbn TEXT NOT NULL UNIQUE,"
+                " title TEXT NOT NULL,"
+                " author TEXT NOT NULL,"
+                " title_norm TEXT NOT NULL,"
+                " author_norm TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_books_title ON books (title_norm)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_books_author ON books (author)")
+            # Veritabanını paylaşan tüm süreçlerin gördüğü değişiklik sayacı
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS catalog_version ("
+                " id INTEGER PRIMARY KEY CHECK (id = 0),"
+                " version INTEGER NOT NULL)"
+            )
+            self._conn.execute("INSERT OR IGNORE INTO catalog_version (id, version) VALUES (0, 0)")
+    
+    def _bump_version(self) -> None:
+        """Sürüm sayacını artırır; değişikliği yapan işlemin içinde çağrılmalıdır."""
+        self._conn.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 0")
+    
+    @staticmethod
+    def _row_to_book(row: tuple) -> Book:
+        # Satırlar Book nesnelerinden yazılmıştır; yeniden HTML escape yapılmaz
+        return Book._from_validated(row[0], row[1], row[2])
+    
+    def get(self, isbn: str) -> Optional[Book]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, author, isbn FROM books WHERE isbn = ?", (isbn,)
+            ).fetchone()
+        return self._row_to_book(row) if row else None
+    
+    def contains(self, isbn: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM books WHERE isbn = ?", (isbn,)
+            ).fetchone() is not None
+    
+    def add(self, book: Book) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO books (isbn, title, author, title_norm, author_norm) VALUES (?, ?, ?, ?, ?)",
+                (book.isbn, book.title, book.author, book.title.lower(), book.author.lower())
+            )
+            self._bump_version()
+    
+    def add_many(self, books: List[Book]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO books (isbn, title, author, title_norm, author_norm) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (isbn) DO UPDATE SET title = excluded.title, author = excluded.author,"
+                " title_norm = excluded.title_norm, author_norm = excluded.author_norm",
+                [(book.isbn, book.title, book.author, book.title.lower(), book.author.lower())
+                 for book in books]
+            )
+            self._bump_version()
+    
+    def remove(self, isbn: str) -> Optional[Book]:
+        with self._lock, self._conn:
+            book = self.get(isbn)
+            if book:
+                self._conn.execute("DELETE FROM books WHERE isbn = ?", (isbn,))
+                self._bump_version()
+        return book
+    
+    def remove_many(self, isbns: List[str]) -> List[Book]:
+        with self._lock, self._conn:
+            removed = [book for book in map(self.get, dict.fromkeys(isbns)) if book]
+            self._conn.executemany("DELETE FROM books WHERE isbn = ?", [(book.isbn,) for book in removed])
+            if removed:
+                self._bump_version()
+        return removed
+    
+    def iter_books(self) -> Iterator[Book]:
+        with self._lock:
+            cursor = self._conn.execute("SELECT title, author, isbn FROM books ORDER BY seq")
+            rows = cursor.fetchmany(1000)
+        while rows:
+            for row in rows:
+                yield self._row_to_book(row)
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+    
+    def page(self, after: Optional[str], limit: int) -> List[Book]:
+        # isbn sütunundaki UNIQUE indeksi sıralı tarama için kullanılır
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, author, isbn FROM books WHERE isbn > ? ORDER BY isbn LIMIT ?",
+                (after if after is not None else "", limit)
+            ).fetchall()
+        return [self._row_to_book(row) for row in rows]
+    
+    def search(self, query: str) -> List[Book]:
+        query = query.lower()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, author, isbn FROM books"
+                " WHERE instr(title_norm, ?) > 0 OR instr(author_norm, ?) > 0 OR instr(isbn, ?) > 0"
+                " ORDER BY seq",
+                (query, query, query)
+            ).fetchall()
+        return [self._row_to_book(row) for row in rows]
+    
+    def stats(self) -> dict:
+        with self._lock:
+            total, unique_authors = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT author) FROM books"
+            ).fetchone()
+            # Eşitlikte ilk eklenen yazar seçilir (bellekteki davranışla aynı)
+            top = self._conn.execute(
+                "SELECT author, COUNT(*) AS c FROM books GROUP BY author"
+                " ORDER BY c DESC, MIN(seq) ASC LIMIT 1"
+            ).fetchone()
+            
+        return {
+            "total_books": total,
+            "unique_authors": unique_authors,
+            "authors_with_most_books": top[0] if top else None,
+            "most_books_count": top[1] if top else 0
+        }
+    
+    def shared_version(self) -> Optional[int]:
+        with self._lock:
+            return self._conn.execute("SELECT version FROM catalog_version WHERE id = 0").fetchone()[0]
+    
+    def load(self) -> None:
+        print(f"{self.count()} kitap veritabanında ({self.filename}) mevcut.")
+    
+    def compact(self) -> None:
+        with self._lock:
+            self._conn.execute("VACUUM")
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BinaryStorage(StorageBackend):
+    """
+    write_binary_catalog ile üretilen ikili kataloğu mmap ile açan salt okunur arka uç.
+    
+    Dosya belleğe okunmaz; ISBN aramaları sıralı anahtar tablosunda ikili arama
+    ile yapılır ve Book nesneleri yalnızca döndürülen kayıtlar için oluşturulur.
+    Aynı dosyayı açan süreçler işletim sisteminin sayfa önbelleğini paylaşır.
+    """
+    
+    def __init__(self, filename: str):
+        """
+        BinaryStorage sınıfının constructor'ı.
+        
+        Args:
+            filename (str): İkili katalog dosyasının adı
+            
+        Raises:
+            ValueError: Dosya geçerli bir ikili katalog değilse
+        """
+        self.filename = filename
+        with open(filename, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, self._count, self._key_width = BINARY_HEADER.unpack_from(self._mm, 0)
+        if magic != BINARY_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{filename} geçerli bir ikili katalog değil")
+        
+        self._keys_start = BINARY_HEADER.size
+        self._offsets_start = self._keys_start + self._count * self._key_width
+        self._data_start = self._offsets_start + self._count * BINARY_OFFSET.size
+    
+    def _key_at(self, index: int) -> bytes:
+        start = self._keys_start + index * self._key_width
+        return self._mm[start:start + self._key_width]
+    
+    def _read_record(self, position: int) -> Tuple[Book, int]:
+        """
+        Verilen konumdaki kaydı okur.
+        
+        Returns:
+            Tuple[Book, int]: Oluşturulan kitap ve bir sonraki kaydın konumu
+        """
+        title_len, author_len, isbn_len = BINARY_RECORD_HEADER.unpack_from(self._mm, position)
+        position += BINARY_RECORD_HEADER.size
+        title = self._mm[position:position + title_len].decode('utf-8')
+        position += title_len
+        author = self._mm[position:position + author_len].decode('utf-8')
+        position += author_len
+        isbn = self._mm[position:position + isbn_len].decode('ascii')
+        position += isbn_len
+        # Kayıtlar Book nesnelerinden yazılmıştır; yeniden HTML escape yapılmaz
+        return Book._from_validated(title, author, isbn), position
+    
+    def _find_index(self, isbn: str) -> Optional[int]:
+        """ISBN'in anahtar tablosundaki sırasını ikili arama ile bulur."""
+        try:
+            key = isbn.encode('ascii')
+        except UnicodeEncodeError:
+            return None
+        if len(key) > self._key_width:
+            return None
+        key = key.ljust(self._key_width, b"\0")
+        
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key_at(low) == key:
+            return low
+        return None
+    
+    def _book_at(self, index: int) -> Book:
+        """Anahtar tablosunda verilen sıradaki kitabı okur."""
+        offset, = BINARY_OFFSET.unpack_from(self._mm, self._offsets_start + index * BINARY_OFFSET.size)
+        return self._read_record(self._data_start + offset)[0]
+    
+    def get(self, isbn: str) -> Optional[Book]:
+        index = self._find_index(isbn)
+        return None if index is None else self._book_at(index)
+    
+    def contains(self, isbn: str) -> bool:
+        return self._find_index(isbn) is not None
+    
+    def add(self, book: Book) -> None:
+        raise ValueError("İkili katalog salt okunurdur")
+    
+    def add_many(self, books: List[Book]) -> None:
+        raise ValueError("İkili katalog salt okunurdur")
+    
+    def remove(self, isbn: str) -> Optional[Book]:
+        raise ValueError("İkili katalog salt okunurdur")
+    
+    def remove_many(self, isbns: List[str]) -> List[Book]:
+        raise ValueError("İkili katalog salt okunurdur")
+    
+    def iter_books(self) -> Iterator[Book]:
+        position = self._data_start
+        for _ in range(self._count):
+            book, position = self._read_record(position)
+            yield book
+    
+    def count(self) -> int:
+        return self._count
+    
+    def page(self, after: Optional[str], limit: int) -> List[Book]:
+        # Anahtar tablosu zaten ISBN'e göre sıralıdır
+        start = 0
+        if after is not None:
+            key = after.encode('ascii', 'replace')[:self._key_width].ljust(self._key_width, b"\0")
+            low, high = 0, self._count
+            while low < high:
+                middle = (low + high) // 2
+                if self._key_at(middle) <= key:
+                    low = middle + 1
+                else:
+                    high = middle
+            start = low
+        return [self._book_at(index) for index in range(start, min(start + limit, self._count))]
+    
+    def load(self) -> None:
+        print(f"{self._count} kitaplık ikili katalog ({self.filename}) açıldı.")
+    
+    def close(self) -> None:
+        self._mm.close()
+
+
+def write_binary_catalog(books: Iterable[Book], filename: str) -> int:
+    """
+    Kitapları BinaryStorage'ın okuyabildiği ikili katalog formatında yazar.
+    
+    Kayıtlar verilen sırayla yazılır; ISBN anahtarları ve kayıt ofsetleri ise
+    ikili arama için sıralanır. Dosya geçici bir dosya üzerinden atomik olarak
+    yerine konur.
+    
+    Args:
+        books (Iterable[Book]): Yazılacak kitaplar
+        filename (str): Oluşturulacak dosyanın adı
+        
+    Returns:
+        int: Yazılan kitap sayısı
+    """
+    keys: List[Tuple[bytes, int]] = []
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(prefix=".library-", suffix=".tmp", dir=directory)
+    try:
+        with tempfile.TemporaryFile() as data, os.fdopen(fd, 'wb') as file:
+            offset = 0
+            for book in books:
+                title = book.title.encode('utf-8')
+                author = book.author.encode('utf-8')
+                isbn = book.isbn.encode('ascii')
+                record = BINARY_RECORD_HEADER.pack(len(title), len(author), len(isbn)) + title + author + isbn
+                data.write(record)
+                keys.append((isbn.ljust(BINARY_KEY_WIDTH, b"\0"), offset))
+                offset += len(record)
+            keys.sort()
+            
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, len(keys), BINARY_KEY_WIDTH))
+            file.write(b"".join(key for key, _ in keys))
+            file.write(b"".join(BINARY_OFFSET.pack(offset) for _, offset in keys))
+            data.seek(0)
+            shutil.copyfileobj(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    
+    return len(keys)
+
+
+def open_storage(filename: str, backend: Optional[str] = None, **options) -> StorageBackend:
+    """
+    Dosya uzantısına veya verilen arka uç adına göre depolama nesnesi oluşturur.
+    
+    Args:
+        filename (str): Veri dosyasının adı
+        backend (Optional[str]): "json", "sqlite" veya "binary"; None ise
+            .db/.sqlite/.sqlite3 uzantılarında SQLite, .bcat uzantısında salt
+            okunur ikili katalog, diğerlerinde JSON seçilir
+        **options: Seçilen arka ucun constructor'ına iletilen ek ayarlar
+        
+    Returns:
+        StorageBackend: Oluşturulan depolama nesnesi
+        
+    Raises:
+        ValueError: Bilinmeyen bir arka uç adı verildiğinde
+    """
+    if backend is None:
+        if filename.endswith(SQLITE_EXTENSIONS):
+            backend = "sqlite"
+        elif filename.endswith(BINARY_EXTENSIONS):
+            backend = "binary"
+        else:
+            backend = "json"
+            
+    if backend == "json":
+        return JSONStorage(filename, **options)
+    if backend == "sqlite":
+        return SQLiteStorage(filename, **options)
+    if backend == "binary":
+        return BinaryStorage(filename, **options)
+    raise ValueError(f"Geçersiz depolama arka ucu: {backend}")
@@ -4,14 +4,45 @@ Kütüphane Yönetim Sistemi - Pytest Testleri
 Global AI Hub Python 202 Bootcamp Projesi - Aşama 1
 """
 
+import asyncio
+import gc
+import gzip
+import importlib
+import threading
+import time
+import tracemalloc
 import pytest
 import os
 import json
 import tempfile
 import httpx
-from unittest.mock import patch, Mock
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from unittest.mock import patch
 from book import Book
-from library import Library
+from library import Library, OpenLibraryUnavailableError
+from metadata_cache import MetadataCache
+from negative_cache import NegativeCache
+from response_cache import ResponseCache
+from offline_index import OfflineIndex
+from fake_openlibrary import FakeOpenLibrary
+from openlibrary import OpenLibraryClient
+from author_memo import AuthorMemo
+from author_stats import AuthorStats
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from book_store import BookStore
+from search_index import TrigramIndex
+from storage import BinaryStorage, JSONStorage, SQLiteStorage
+
+
+@pytest.fixture
+def temp_path(request, tmp_path):
+    """
+    Her test için geçici dizinde bir dosya yolu döndürür; dosya adı test
+    sınıfının FILENAME niteliğinden alınır (varsayılan library.json).
+    """
+    return str(tmp_path / getattr(request.cls, "FILENAME", "library.json"))
 
 
 class TestBook:
@@ -85,6 +116,247 @@ class TestBook:
         assert book.title == "Test Title"
         assert book.author == "Test Author"
         assert book.isbn == "123456789"
+    
+    def test_book_slots_and_interned_author(self):
+        """Book nesnelerinin __dict__ taşımadığını ve yazar adlarının paylaşıldığını test eder."""
+        book1 = Book("1984", "".join(["George ", "Orwell"]), "978-0451524935")
+        book2 = Book("Animal Farm", "".join(["George", " Orwell"]), "978-0451526342")
+        
+        assert not hasattr(book1, "__dict__")
+        assert book1.author is book2.author
+
+
+class TestBookStore:
+    """Sütun tabanlı BookStore için test sınıfı."""
+    
+    def test_add_get_pop(self):
+        """Ekleme, bulma, güncelleme ve silmenin sözlük gibi çalıştığını test eder."""
+        store = BookStore()
+        store["1"] = Book("Tom &amp; Jerry", "Yazar", "1")
+        store["2"] = Book("İkinci", "Yazar", "2")
+        store["1"] = Book("Güncel", "Başka Yazar", "1")
+        
+        assert len(store) == 2
+        assert "1" in store and "3" not in store
+        assert store.get("1").title == "Güncel"
+        assert store.pop("1").author == "Başka Yazar"
+        assert store.pop("1") is None
+        assert [b.isbn for b in store.values()] == ["2"]
+        assert store.get("2").title == "İkinci"
+    
+    def test_compaction_keeps_order(self):
+        """Çok sayıda silmeden sonra sıkıştırmanın sırayı ve aramaları koruduğunu test eder."""
+        store = BookStore()
+        for i in range(3000):
+            store[str(i)] = Book(f"Kitap {i}", f"Yazar {i % 7}", str(i))
+        for i in range(0, 3000, 3):
+            store.pop(str(i))
+        for i in range(1, 3000, 3):
+            store.pop(str(i))
+            
+        assert store._dead_rows < 2000
+        assert len(store) == 1000
+        assert [b.isbn for b in store.values()][:3] == ["2", "5", "8"]
+        assert store.get("2999").author == "Yazar 3"
+    
+    def test_columnar_footprint(self):
+        """Sütun tabanlı deponun Book nesneleriyle tutulan kataloğa göre belirgin şekilde az bellek kullandığını test eder."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "library.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump([{"title": f"Kitabın Başlığı {i} Cilt {i % 7}", "author": f"Yazar {i % 300}",
+                        "isbn": f"978-{i:010d}"} for i in range(5000)], file)
+        
+        footprint = {}
+        for columnar in (False, True):
+            gc.collect()
+            tracemalloc.start()
+            storage = JSONStorage(path, columnar=columnar, search_index=False)
+            storage.load()
+            gc.collect()
+            footprint[columnar] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert storage.count() == 5000
+            assert storage.get("978-0000000042").title == "Kitabın Başlığı 42 Cilt 0"
+            del storage
+        
+        assert footprint[True] < 0.7 * footprint[False]
+        os.unlink(path)
+        os.rmdir(temp_dir)
+    
+    def test_library_columnar_roundtrip(self):
+        """Library'nin sütun tabanlı depoyla kaydedip yükleyebildiğini test eder."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "library.json")
+        
+        library = Library(path, columnar=True)
+        library.add_book(Book("Tom & Jerry", "Yazar", "1"))
+        library.add_book(Book("İkinci", "Yazar", "2"))
+        library.remove_book("2")
+        # Saklanan değerler okunurken yeniden escape edilmez
+        assert [b.title for b in library.books] == ["Tom &amp; Jerry"]
+        
+        reloaded = Library(path, columnar=True)
+        assert isinstance(reloaded.storage._books_by_isbn, BookStore)
+        assert [b.isbn for b in reloaded.books] == ["1"]
+        
+        os.unlink(path)
+        os.rmdir(temp_dir)
+
+
+class TestTrigramSearch:
+    """Trigram indeksli arama için test sınıfı."""
+    
+    @pytest.fixture
+    def indexed_library(self):
+        """Örnek kitaplarla doldurulmuş geçici bir kütüphane oluşturur."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "library.json")
+        library = Library(path, journal=True)
+        authors = ["George Orwell", "Yaşar Kemal", "Orhan Pamuk", "Sabahattin Ali"]
+        for i in range(60):
+            library.add_book(Book(f"Kitap {i} Cilt {i % 5}", authors[i % 4], f"978-{i:05d}"))
+        
+        yield library
+        
+        # Test sonrası temizlik
+        for name in os.listdir(temp_dir):
+            os.unlink(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+    
+    @staticmethod
+    def brute_force(library, query):
+        query = query.lower()
+        return [b.isbn for b in library.books
+                if query in b.title.lower() or query in b.author.lower() or query in b.isbn]
+    
+    def test_matches_linear_scan(self, indexed_library):
+        """İndeksli aramanın tüm kitapları taramakla aynı sonucu verdiğini test eder."""
+        for query in ["orwell", "YAŞAR", "cilt 3", "978-0004", "0005", "ka", "a", "pamuk kitap", "xyz"]:
+            found = [b.isbn for b in indexed_library.search_books(query)]
+            assert found == self.brute_force(indexed_library, query), query
+    
+    def test_index_follows_mutations_and_reload(self, indexed_library):
+        """İndeksin silme, ekleme ve yeniden yüklemeyle güncel kaldığını test eder."""
+        indexed_library.remove_book("978-00000")
+        indexed_library.add_book(Book("Kürk Mantolu Madonna", "Sabahattin Ali", "978-99999"))
+        
+        assert "978-00000" not in [b.isbn for b in indexed_library.search_books("orwell")]
+        assert [b.isbn for b in indexed_library.search_books("madonna")] == ["978-99999"]
+        
+        reloaded = Library(indexed_library.filename, journal=True)
+        for query in ["madonna", "orwell", "sabahattin"]:
+            assert [b.isbn for b in reloaded.search_books(query)] == self.brute_force(reloaded, query)
+    
+    def test_replaced_book_keeps_its_position(self, indexed_library):
+        """Yerinde güncellenen kitabın arama sonuçlarındaki sırasını koruduğunu test eder."""
+        indexed_library.add_books([Book("Kitap Yeni Baskı", "Orhan Pamuk", "978-00001")], on_conflict="replace")
+        
+        for query in ["pamuk", "kitap", "yeni baskı", "orwell"]:
+            found = [b.isbn for b in indexed_library.search_books(query)]
+            assert found == self.brute_force(indexed_library, query), query
+        assert [b.isbn for b in indexed_library.search_books("pamuk")][:2] == ["978-00001", "978-00002"]
+        assert indexed_library.stats()["most_books_count"] == 16
+    
+    def test_candidates(self):
+        """Kısa sorgularda indeksin kullanılmadığını test eder."""
+        index = TrigramIndex()
+        index.add(Book("Abcd", "Yazar", "1"))
+        
+        assert index.candidates("ab") is None
+        assert index.candidates("bcd") == ["1"]
+        assert index.candidates("bce") == []
+
+
+class TestAuthorStats:
+    """Artımlı yazar istatistikleri için test sınıfı."""
+    
+    def test_matches_recount(self):
+        """Rastgele ekleme/güncelleme/silmelerden sonra sonucun baştan hesaplamayla aynı olduğunu test eder."""
+        import random
+        rng = random.Random(7)
+        stats = AuthorStats()
+        books = []
+        for i in range(2000):
+            roll = rng.random()
+            if books and roll < 0.3:
+                stats.remove(books.pop(rng.randrange(len(books))))
+            elif books and roll < 0.4:
+                position = rng.randrange(len(books))
+                new_book = Book("Kitap", f"Yazar {rng.randrange(30)}", books[position].isbn)
+                stats.replace(books[position], new_book)
+                books[position] = new_book
+            else:
+                book = Book("Kitap", f"Yazar {rng.randrange(30)}", str(i))
+                books.append(book)
+                stats.add(book)
+            
+            # Eşitlikte katalogda en önce eklenmiş kitabı olan yazar seçilir
+            counts, first = {}, {}
+            for position, book in enumerate(books):
+                counts[book.author] = counts.get(book.author, 0) + 1
+                first.setdefault(book.author, position)
+            result = stats.stats()
+            assert result["total_books"] == len(books)
+            assert result["unique_authors"] == len(counts)
+            assert result["most_books_count"] == max(counts.values(), default=0)
+            if counts:
+                expected = min(counts, key=lambda author: (-counts[author], first[author]))
+                assert result["authors_with_most_books"] == expected
+    
+    def test_ties_pick_first_inserted_author_on_every_backend(self):
+        """Eşitlikte JSON ve SQLite arka uçlarının aynı (ilk eklenen) yazarı seçtiğini test eder."""
+        temp_dir = tempfile.mkdtemp()
+        for filename in ("library.json", "library.db"):
+            path = os.path.join(temp_dir, filename)
+            with Library(path) as library:
+                for isbn, author in enumerate(["A", "B", "B", "A", "C", "C"]):
+                    library.add_book(Book(f"Kitap {isbn}", author, str(isbn)))
+                assert library.stats()["authors_with_most_books"] == "A", filename
+                
+                # A tamamen silinip yeniden eklenince B ondan önce gelir
+                library.remove_book("0")
+                library.remove_book("3")
+                library.add_book(Book("Kitap 6", "A", "6"))
+                library.add_book(Book("Kitap 7", "A", "7"))
+                assert library.stats()["authors_with_most_books"] == "B", filename
+                library.remove_book("1")
+                assert library.stats()["authors_with_most_books"] == "C", filename
+                
+            # Yazarın en eski kitabı silinince sırası kalan kitaplarına göre belirlenir
+            with Library(path) as library:
+                for book in library.get_all_books():
+                    library.remove_book(book.isbn)
+                for isbn, author in ((1, "X"), (2, "Y"), (3, "Y"), (4, "X")):
+                    library.add_book(Book(f"Kitap {isbn}", author, f"9{isbn}"))
+                library.remove_book("91")
+                library.add_book(Book("Kitap 5", "X", "95"))
+                assert library.stats()["authors_with_most_books"] == "Y", filename
+            with Library(path) as reloaded:
+                assert reloaded.stats()["authors_with_most_books"] == "Y", filename
+            os.unlink(path)
+        os.rmdir(temp_dir)
+    
+    def test_library_stats_after_remove(self):
+        """Library.stats() sonucunun silmelerden sonra güncellendiğini test eder."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "library.json")
+        library = Library(path)
+        library.add_book(Book("1984", "George Orwell", "1"))
+        library.add_book(Book("Animal Farm", "George Orwell", "2"))
+        library.add_book(Book("İnce Memed", "Yaşar Kemal", "3"))
+        library.remove_book("1")
+        library.remove_book("2")
+        
+        assert Library(path).stats() == library.stats() == {
+            "total_books": 1,
+            "unique_authors": 1,
+            "authors_with_most_books": "Yaşar Kemal",
+            "most_books_count": 1
+        }
+        
+        os.unlink(path)
+        os.rmdir(temp_dir)
 
 
 class TestLibrary:
@@ -169,6 +441,21 @@ class TestLibrary:
         assert found_book.title == book.title
         assert found_book.author == book.author
     
+    def test_find_book_index_after_remove_and_readd(self, temp_library, sample_books):
+        """ISBN indeksinin silme ve yeniden eklemeden sonra güncel kaldığını test eder."""
+        for book in sample_books:
+            temp_library.add_book(book)
+            
+        temp_library.remove_book(sample_books[0].isbn)
+        assert temp_library.find_book(sample_books[0].isbn) is None
+        
+        replacement = Book("Nineteen Eighty-Four", "George Orwell", sample_books[0].isbn)
+        assert temp_library.add_book(replacement) is True
+        assert temp_library.find_book(replacement.isbn) is replacement
+        assert [b.isbn for b in temp_library.books] == [
+            sample_books[1].isbn, sample_books[2].isbn, replacement.isbn
+        ]
+    
     def test_find_book_not_found(self, temp_library):
         """Olmayan kitap arandığında None döndürdüğünü test eder."""
         result = temp_library.find_book("nonexistent-isbn")
@@ -218,6 +505,19 @@ class TestLibrary:
         assert len(results) == 0
         assert results == []
     
+    def test_stats(self, temp_library, sample_books):
+        """Kütüphane istatistiklerini test eder."""
+        for book in sample_books:
+            temp_library.add_book(book)
+        temp_library.add_book(Book("Animal Farm", "George Orwell", "978-0451526342"))
+        
+        stats = temp_library.stats()
+        
+        assert stats["total_books"] == 4
+        assert stats["unique_authors"] == 3
+        assert stats["authors_with_most_books"] == "George Orwell"
+        assert stats["most_books_count"] == 2
+    
     def test_get_all_books(self, temp_library, sample_books):
         """Tüm kitapları alma işlemini test eder."""
         for book in sample_books:
@@ -278,31 +578,1225 @@ class TestLibrary:
         
         # Temizlik
         os.unlink(temp_file.name)
+    
+    def test_get_books_page(self, temp_library, sample_books):
+        """Kitapların ISBN sırasına göre sayfalandığını ve değişikliklerin yansıdığını test eder."""
+        for book in sample_books:
+            temp_library.add_book(book)
+        
+        books, after = temp_library.get_books_page(2)
+        assert [book.isbn for book in books] == ["978-0061120084", "978-0451524935"]
+        assert after == "978-0451524935"
+        
+        temp_library.add_book(Book("Kürk Mantolu Madonna", "Sabahattin Ali", "978-0500000000"))
+        books, after = temp_library.get_books_page(2, after)
+        assert [book.isbn for book in books] == ["978-0500000000", "978-0743273565"]
+        assert after is None
+        
+        with pytest.raises(ValueError):
+            temp_library.get_books_page(0)
+    
+    def test_iter_export(self, temp_library, sample_books):
+        """Kataloğun NDJSON ve CSV parçaları halinde dışa aktarıldığını test eder."""
+        for book in sample_books:
+            temp_library.add_book(book)
+        
+        chunks = list(temp_library.iter_export(chunk_size=2))
+        assert len(chunks) == 2
+        lines = "".join(chunks).splitlines()
+        assert [json.loads(line) for line in lines] == [book.to_dict() for book in sample_books]
+        
+        csv_text = "".join(temp_library.iter_export("csv"))
+        assert csv_text.splitlines()[0] == "title,author,isbn"
+        assert csv_text.splitlines()[1] == "1984,George Orwell,978-0451524935"
+        
+        with pytest.raises(ValueError):
+            temp_library.iter_export("xml")
+    
+    def test_concurrent_reads_and_writes(self, temp_library):
+        """Eşzamanlı ekleme/silme sırasında okumaların hata vermediğini ve sayıların tutarlı kaldığını test eder."""
+        errors = []
+        
+        def writer(offset):
+            try:
+                for i in range(100):
+                    isbn = f"{offset}-{i}"
+                    temp_library.add_books([Book(f"Kitap {isbn}", f"Yazar {i % 5}", isbn)])
+                    if i % 2:
+                        temp_library.remove_books([isbn])
+            except Exception as e:
+                errors.append(e)
+        
+        def reader():
+            try:
+                for _ in range(50):
+                    temp_library.search_books("kitap")
+                    stats = temp_library.stats()
+                    assert stats["total_books"] >= stats["most_books_count"]
+                    temp_library.get_books_page(50)
+                    "".join(temp_library.iter_export(chunk_size=7))
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(1, 4)]
+        threads += [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert temp_library.get_book_count() == len(temp_library.search_books("kitap")) == 150
+        assert temp_library.stats()["total_books"] == 150
+    
+    def test_storage_access_waits_for_lock(self, temp_library, sample_books):
+        """Okuma ve yazma işlemlerinin kütüphane kilidi serbest kalana kadar beklediğini test eder."""
+        calls = [
+            lambda: temp_library.find_book("1"),
+            lambda: temp_library.search_books("orwell"),
+            lambda: temp_library.stats(),
+            lambda: temp_library.get_books_page(10),
+            lambda: temp_library.add_book(sample_books[0]),
+            lambda: temp_library.remove_books(["1"]),
+        ]
+        done = []
+        with temp_library._lock:
+            threads = [threading.Thread(target=lambda call=call: done.append(call())) for call in calls]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.1)
+            assert done == []
+        for thread in threads:
+            thread.join()
+        assert len(done) == len(calls)
+    
+    def test_version_bumped_by_mutations(self, temp_library, sample_books):
+        """Katalog sürümünün yalnızca değişikliklerde arttığını test eder."""
+        version = temp_library.version
+        temp_library.add_book(sample_books[0])
+        assert temp_library.version == version + 1
+        
+        temp_library.add_book(sample_books[0])
+        temp_library.remove_book("yok")
+        temp_library.add_books([sample_books[0]])
+        temp_library.find_book(sample_books[0].isbn)
+        assert temp_library.version == version + 1
+        
+        temp_library.add_books(sample_books[1:])
+        temp_library.remove_book(sample_books[0].isbn)
+        assert temp_library.version == version + 3
+
+
+class TestLibraryBulkAdd:
+    """Library.add_books toplu ekleme işlemi için test sınıfı."""
+    
+    @pytest.fixture
+    def temp_library(self):
+        """Bir kitap içeren geçici bir kütüphane oluşturur."""
+        temp_dir = tempfile.mkdtemp()
+        library = Library(os.path.join(temp_dir, "library.json"), journal=True)
+        library.add_book(Book("1984", "George Orwell", "1"))
+        
+        yield library
+        
+        # Test sonrası temizlik
+        for name in os.listdir(temp_dir):
+            os.unlink(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+    
+    @pytest.fixture
+    def rows(self):
+        """Çakışan, tekrarlanan ve geçersiz satırlar içeren örnek veri."""
+        return [
+            {"title": "Nineteen Eighty-Four", "author": "George Orwell", "isbn": "1"},
+            Book("Animal Farm", "George Orwell", "2"),
+            {"title": "", "author": "Yazar", "isbn": "3"},
+            {"title": "Eksik"},
+            {"title": "İnce Memed", "author": "Yaşar Kemal", "isbn": "4"},
+            {"title": "İnce Memed 2", "author": "Yaşar Kemal", "isbn": "4"}
+        ]
+    
+    def test_skip(self, temp_library, rows):
+        """Çakışan satırların atlandığını ve sonuçların raporlandığını test eder."""
+        summary = temp_library.add_books(rows)
+        
+        assert (summary["added"], summary["replaced"], summary["skipped"], summary["failed"]) == (2, 0, 2, 2)
+        assert [r["status"] for r in summary["results"]] == [
+            "skipped", "added", "error", "error", "added", "skipped"
+        ]
+        assert summary["results"][2]["isbn"] == "3"
+        assert temp_library.find_book("1").title == "1984"
+        assert temp_library.find_book("4").title == "İnce Memed"
+        assert temp_library.get_book_count() == 3
+    
+    def test_replace(self, temp_library, rows):
+        """Çakışan satırların yenisiyle değiştirildiğini test eder."""
+        summary = temp_library.add_books(rows, on_conflict="replace")
+        
+        assert (summary["added"], summary["replaced"], summary["failed"]) == (2, 2, 2)
+        assert temp_library.find_book("1").title == "Nineteen Eighty-Four"
+        assert temp_library.find_book("4").title == "İnce Memed 2"
+        assert [b.isbn for b in temp_library.books] == ["1", "2", "4"]
+        assert temp_library.search_books("1984") == []
+        assert temp_library.stats()["most_books_count"] == 2
+        
+        reloaded = Library(temp_library.filename, journal=True)
+        assert reloaded.find_book("1").title == "Nineteen Eighty-Four"
+    
+    def test_error_adds_nothing(self, temp_library, rows):
+        """on_conflict="error" iken çakışmada hiçbir kitabın eklenmediğini test eder."""
+        with pytest.raises(ValueError):
+            temp_library.add_books(rows, on_conflict="error")
+        
+        assert temp_library.get_book_count() == 1
+        
+        with pytest.raises(ValueError):
+            temp_library.add_books(rows, on_conflict="merge")
+    
+    def test_single_write(self, temp_library):
+        """Toplu eklemenin kaydı tek seferde yaptığını test eder."""
+        books = [Book(f"Kitap {i}", "Yazar", f"10{i}") for i in range(50)]
+        
+        with patch.object(temp_library.storage, "flush", wraps=temp_library.storage.flush) as flush:
+            summary = temp_library.add_books(books)
+        
+        assert summary["added"] == 50
+        assert flush.call_count == 1
+    
+    def test_remove_books_single_write(self, temp_library):
+        """Toplu silmenin satır satır sonuç verdiğini ve kaydı tek seferde yaptığını test eder."""
+        temp_library.add_books([Book(f"Kitap {i}", "Yazar", f"10{i}") for i in range(5)])
+        
+        with patch.object(temp_library.storage, "flush", wraps=temp_library.storage.flush) as flush:
+            summary = temp_library.remove_books(["100", "101", "100", "999", "x!"])
+        
+        assert (summary["removed"], summary["not_found"], summary["failed"]) == (2, 2, 1)
+        assert [r["status"] for r in summary["results"]] == ["removed", "removed", "not_found", "not_found", "error"]
+        assert flush.call_count == 1
+        reloaded = Library(temp_library.filename, journal=True)
+        assert sorted(book.isbn for book in reloaded.books) == ["1", "102", "103", "104"]
+    
+    def test_sqlite_remove_books(self):
+        """SQLite arka ucunda toplu silmeyi test eder."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "library.db")
+        library = Library(path)
+        library.add_books([Book("1984", "George Orwell", "1"), Book("İkinci", "Yazar", "2")])
+        
+        assert library.remove_books(["1", "3"])["removed"] == 1
+        assert [b.isbn for b in library.books] == ["2"]
+        library.close()
+        os.unlink(path)
+        os.rmdir(temp_dir)
+    
+    def test_sqlite_upsert(self):
+        """SQLite arka ucunda toplu eklemenin değiştirme yapabildiğini test eder."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "library.db")
+        library = Library(path)
+        library.add_book(Book("1984", "George Orwell", "1"))
+        
+        summary = library.add_books([Book("Yeni", "Yazar", "1"), Book("İkinci", "Yazar", "2")],
+                                    on_conflict="replace")
+        
+        assert (summary["added"], summary["replaced"]) == (1, 1)
+        assert [b.title for b in library.books] == ["Yeni", "İkinci"]
+        library.close()
+        os.unlink(path)
+        os.rmdir(temp_dir)
+
+
+class TestLibraryJournal:
+    """Library sınıfının günlük (journal) modu için test sınıfı."""
+    
+    def test_mutations_are_appended_to_journal(self, temp_path):
+        """Değişikliklerin ana dosya yerine günlüğe eklendiğini test eder."""
+        library = Library(temp_path, journal=True)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        library.add_book(Book("Ulysses", "James Joyce", "978-0199535675"))
+        library.remove_book("978-0451524935")
+        
+        assert not os.path.exists(temp_path)
+        with open(library.storage.journal_filename, encoding='utf-8') as file:
+            records = [json.loads(line) for line in file]
+        assert [r["op"] for r in records] == ["add", "add", "remove"]
+    
+    def test_load_replays_journal_over_snapshot(self, temp_path):
+        """Yüklemede günlüğün son tam kaydın üzerine uygulandığını test eder."""
+        library = Library(temp_path, journal=True)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        library.compact()
+        library.add_book(Book("Ulysses", "James Joyce", "978-0199535675"))
+        library.remove_book("978-0451524935")
+        
+        reloaded = Library(temp_path, journal=True)
+        
+        assert [b.isbn for b in reloaded.books] == ["978-0199535675"]
+    
+    def test_compaction_after_threshold(self, temp_path):
+        """Eşik aşıldığında günlüğün ana dosyaya katlandığını test eder."""
+        library = Library(temp_path, journal=True, journal_compact_threshold=2)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        assert os.path.exists(library.storage.journal_filename)
+        
+        library.add_book(Book("Ulysses", "James Joyce", "978-0199535675"))
+        
+        assert not os.path.exists(library.storage.journal_filename)
+        with open(temp_path, encoding='utf-8') as file:
+            assert len(json.load(file)) == 2
+    
+    def test_truncated_journal_line_is_ignored(self, temp_path):
+        """Yarım yazılmış son günlük satırının yüklemeyi bozmadığını test eder."""
+        library = Library(temp_path, journal=True)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        with open(library.storage.journal_filename, 'a', encoding='utf-8') as file:
+            file.write('{"op": "add", "book": {"title"')
+            
+        reloaded = Library(temp_path, journal=True)
+        
+        assert reloaded.get_book_count() == 1
+    
+    def test_changes_after_torn_write_survive_reload(self, temp_path):
+        """Bozuk satırdan sonra yapılan değişikliklerin kaybolmadığını test eder."""
+        library = Library(temp_path, journal=True)
+        library.add_book(Book("1984", "George Orwell", "1"))
+        with open(library.storage.journal_filename, 'a', encoding='utf-8') as file:
+            file.write('{"op": "add", "book": {"title"')
+        
+        # Çökme sonrası açılış, ardından yeni değişiklikler
+        recovered = Library(temp_path, journal=True)
+        recovered.add_book(Book("Animal Farm", "George Orwell", "2"))
+        recovered.remove_book("1")
+        
+        reloaded = Library(temp_path, journal=True)
+        assert [book.isbn for book in reloaded.books] == ["2"]
+    
+    def test_non_object_journal_record_stops_replay(self, temp_path):
+        """Nesne olmayan bir günlük kaydının yüklenmiş kataloğu silmediğini test eder."""
+        library = Library(temp_path, journal=True)
+        library.add_book(Book("1984", "George Orwell", "1"))
+        library.compact()
+        library.add_book(Book("Ulysses", "James Joyce", "2"))
+        with open(library.storage.journal_filename, 'a', encoding='utf-8') as file:
+            file.write("5\n")
+            
+        reloaded = Library(temp_path, journal=True)
+        assert [book.isbn for book in reloaded.books] == ["1", "2"]
+        
+        reloaded.add_book(Book("Animal Farm", "George Orwell", "3"))
+        assert [book.isbn for book in Library(temp_path, journal=True).books] == ["1", "2", "3"]
+
+
+class TestLibraryWritePolicy:
+    """Library sınıfının yazma politikaları için test sınıfı."""
+    
+    def test_invalid_write_policy(self, temp_path):
+        """Bilinmeyen yazma politikasında hata verdiğini test eder."""
+        with pytest.raises(ValueError):
+            Library(temp_path, write_policy="sometimes")
+    
+    def test_batch_policy_writes_every_n_mutations(self, temp_path):
+        """"batch" politikasının N değişiklikte bir yazdığını test eder."""
+        library = Library(temp_path, write_policy="batch", flush_every=2)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        assert not os.path.exists(temp_path)
+        
+        library.add_book(Book("Ulysses", "James Joyce", "978-0199535675"))
+        assert Library(temp_path).get_book_count() == 2
+    
+    def test_interval_policy_flushes_after_timeout(self, temp_path):
+        """"interval" politikasının süre dolunca yazdığını test eder."""
+        library = Library(temp_path, write_policy="interval", flush_interval_ms=50)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        assert not os.path.exists(temp_path)
+        
+        library.storage._flush_timer.join(timeout=2)
+        
+        assert Library(temp_path).get_book_count() == 1
+    
+    def test_close_flushes_pending_changes(self, temp_path):
+        """close() çağrısının bekleyen değişiklikleri yazdığını test eder."""
+        with Library(temp_path, journal=True, write_policy="batch", flush_every=100) as library:
+            library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+            assert not os.path.exists(library.storage.journal_filename)
+            
+        assert Library(temp_path, journal=True).get_book_count() == 1
+    
+    def test_save_books_failure_keeps_existing_file(self, temp_path):
+        """Yazma sırasında hata olursa mevcut dosyanın bozulmadığını test eder."""
+        library = Library(temp_path)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        
+        with patch('storage.json.dump', side_effect=RuntimeError("disk dolu")):
+            library.add_book(Book("Ulysses", "James Joyce", "978-0199535675"))
+            
+        assert Library(temp_path).get_book_count() == 1
+        assert os.listdir(os.path.dirname(temp_path)) == ["library.json"]
+
+
+class TestLibraryNDJSON:
+    """Library sınıfının satır tabanlı (NDJSON) dosya formatı için test sınıfı."""
+    
+    FILENAME = "library.ndjson"
+    
+    def test_format_selected_by_extension(self, temp_path):
+        """.ndjson uzantısında satır tabanlı formatın seçildiğini test eder."""
+        library = Library(temp_path)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        library.add_book(Book("Ulysses", "James Joyce", "978-0199535675"))
+        
+        with open(temp_path, encoding='utf-8') as file:
+            lines = file.read().splitlines()
+            
+        assert library.storage.file_format == "ndjson"
+        assert [json.loads(line)["isbn"] for line in lines] == ["978-0451524935", "978-0199535675"]
+        assert Library(temp_path).get_book_count() == 2
+    
+    def test_legacy_json_array_is_migrated(self, temp_path):
+        """Eski JSON dizisi dosyasının yüklenip NDJSON'a dönüştürüldüğünü test eder."""
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump([{"title": "1984", "author": "George Orwell", "isbn": "978-0451524935"}], file, indent=2)
+            
+        library = Library(temp_path)
+        
+        assert library.get_book_count() == 1
+        with open(temp_path, encoding='utf-8') as file:
+            assert json.loads(file.readline())["isbn"] == "978-0451524935"
+    
+    def test_progress_callback_and_bad_lines(self, temp_path):
+        """Yükleme ilerlemesinin bildirildiğini ve bozuk satırların atlandığını test eder."""
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            for i in range(5):
+                file.write(json.dumps({"title": f"Kitap {i}", "author": "Yazar", "isbn": f"100{i}"}) + "\n")
+            file.write("not json\n")
+            
+        progress = []
+        library = Library(temp_path, progress_callback=progress.append, progress_every=2)
+        
+        assert library.get_book_count() == 5
+        assert progress == [2, 4, 5]
+    
+    def test_non_object_line_is_skipped(self, temp_path):
+        """Nesne olmayan bir satırın yalnızca kendisinin atlandığını ve verinin korunduğunu test eder."""
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({"title": "1984", "author": "George Orwell", "isbn": "1"}) + "\n")
+            file.write("5\n")
+            file.write("[1, 2]\n")
+            file.write(json.dumps({"title": "Ulysses", "author": "James Joyce", "isbn": "2"}) + "\n")
+            
+        library = Library(temp_path)
+        assert [book.isbn for book in library.books] == ["1", "2"]
+        
+        library.add_book(Book("Animal Farm", "George Orwell", "3"))
+        assert [book.isbn for book in Library(temp_path).books] == ["1", "2", "3"]
+    
+    def test_unreadable_file_is_set_aside_before_save(self, temp_path):
+        """Okunamayan dosyanın ilk kayıtta üzerine yazılmadan saklandığını test eder."""
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write('[{"title": "1984", "author": "George Orwell", "isbn": "1"}, 5]')
+            
+        library = Library(temp_path)
+        assert library.get_book_count() == 0
+        
+        library.add_book(Book("Animal Farm", "George Orwell", "3"))
+        
+        with open(f"{temp_path}.corrupt", encoding='utf-8') as file:
+            assert '"isbn": "1"' in file.read()
+        assert [book.isbn for book in Library(temp_path).books] == ["3"]
+
+
+class TestSQLiteStorage:
+    """Library sınıfının SQLite arka ucu için test sınıfı."""
+    
+    FILENAME = "library.db"
+    
+    @pytest.fixture
+    def sqlite_library(self, temp_path):
+        """Örnek kitaplarla doldurulmuş SQLite kütüphanesi oluşturur."""
+        library = Library(temp_path)
+        library.add_book(Book("1984", "George Orwell", "978-0451524935"))
+        library.add_book(Book("Animal Farm", "George Orwell", "978-0451526342"))
+        library.add_book(Book("İnce Memed", "Yaşar Kemal", "978-9750807128"))
+        
+        yield library
+        
+        library.close()
+    
+    def test_special_characters_round_trip(self, temp_path):
+        """HTML özel karakterli başlıkların okurken tekrar escape edilmediğini test eder."""
+        library = Library(temp_path)
+        library.add_book(Book("Tom & Jerry <1>", "Yazar & Çizer", "1"))
+        expected = library.find_book("1").title
+        library.close()
+        
+        for _ in range(2):
+            library = Library(temp_path)
+            book = library.find_book("1")
+            assert book.title == expected == "Tom &amp; Jerry &lt;1&gt;"
+            assert book.author == "Yazar &amp; Çizer"
+            assert library.books[0].title == expected
+            library.close()
+    
+    def test_page(self, sqlite_library):
+        """SQLite arka ucunda sayfalamanın ISBN sırasını izlediğini test eder."""
+        books, after = sqlite_library.get_books_page(2)
+        assert [book.isbn for book in books] == ["978-0451524935", "978-0451526342"]
+        books, after = sqlite_library.get_books_page(2, after)
+        assert [book.title for book in books] == ["İnce Memed"]
+        assert after is None
+    
+    def test_backend_selection(self, temp_path):
+        """Arka ucun dosya uzantısına veya parametreye göre seçildiğini test eder."""
+        library = Library(temp_path)
+        assert isinstance(library.storage, SQLiteStorage)
+        library.close()
+        
+        json_path = temp_path.replace(".db", ".json")
+        assert isinstance(Library(json_path).storage, JSONStorage)
+        
+        other_path = temp_path.replace(".db", ".data")
+        library = Library(other_path, backend="sqlite")
+        assert isinstance(library.storage, SQLiteStorage)
+        library.close()
+        
+        with pytest.raises(ValueError):
+            Library(temp_path, backend="csv")
+    
+    def test_add_find_remove(self, sqlite_library):
+        """Ekleme, bulma ve silme işlemlerinin veritabanında yapıldığını test eder."""
+        assert sqlite_library.get_book_count() == 3
+        assert sqlite_library.add_book(Book("Kopya", "Yazar", "978-0451524935")) is False
+        assert sqlite_library.find_book("978-0451524935").title == "1984"
+        
+        assert sqlite_library.remove_book("978-0451524935") is True
+        assert sqlite_library.find_book("978-0451524935") is None
+        assert sqlite_library.remove_book("978-0451524935") is False
+        assert [b.isbn for b in sqlite_library.books] == ["978-0451526342", "978-9750807128"]
+    
+    def test_search_matches_in_memory_semantics(self, sqlite_library):
+        """Aramanın başlık, yazar ve ISBN'de büyük/küçük harf duyarsız çalıştığını test eder."""
+        assert [b.title for b in sqlite_library.search_books("orwell")] == ["1984", "Animal Farm"]
+        assert [b.title for b in sqlite_library.search_books("yaşar")] == ["İnce Memed"]
+        assert [b.title for b in sqlite_library.search_books("526")] == ["Animal Farm"]
+        assert sqlite_library.search_books("%") == []
+    
+    def test_stats(self, sqlite_library):
+        """İstatistiklerin SQL ile hesaplandığını test eder."""
+        assert sqlite_library.stats() == {
+            "total_books": 3,
+            "unique_authors": 2,
+            "authors_with_most_books": "George Orwell",
+            "most_books_count": 2
+        }
+    
+    def test_persistence(self, sqlite_library, temp_path):
+        """Kitapların veritabanında kalıcı olduğunu test eder."""
+        sqlite_library.close()
+        
+        with Library(temp_path) as reopened:
+            assert reopened.get_book_count() == 3
+
+
+class TestBinaryStorage:
+    """İkili (mmap) katalog dışa aktarımı ve salt okunur arka uç için test sınıfı."""
+    
+    @pytest.fixture
+    def catalog_path(self):
+        """Örnek kitaplardan ikili katalog oluşturur."""
+        temp_dir = tempfile.mkdtemp()
+        source = Library(os.path.join(temp_dir, "library.json"))
+        for isbn in ["978-0451524935", "123", "978-0061120084", "1234", "978-9750807128"]:
+            source.add_book(Book(f"Kitap {isbn}", "Çalıkuşu Yazarı", isbn))
+        path = os.path.join(temp_dir, "catalog.bcat")
+        assert source.export_binary(path) == 5
+        
+        yield path
+        
+        # Test sonrası temizlik
+        for name in os.listdir(temp_dir):
+            os.unlink(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+    
+    def test_special_characters_round_trip(self):
+        """Dışa aktarılan HTML özel karakterlerin tekrar escape edilmediğini test eder."""
+        temp_dir = tempfile.mkdtemp()
+        source = Library(os.path.join(temp_dir, "library.json"))
+        source.add_book(Book("A & B", "<Yazar>", "1"))
+        path = os.path.join(temp_dir, "catalog.bcat")
+        source.export_binary(path)
+        
+        library = Library(path)
+        assert library.find_book("1").title == source.find_book("1").title == "A &amp; B"
+        assert [book.author for book in library.books] == ["&lt;Yazar&gt;"]
+        library.close()
+        for name in os.listdir(temp_dir):
+            os.unlink(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+    
+    def test_page_uses_sorted_keys(self, catalog_path):
+        """İkili katalogda sayfalamanın ISBN sırasını izlediğini test eder."""
+        library = Library(catalog_path)
+        
+        books, after = library.get_books_page(2, "1234")
+        assert [book.isbn for book in books] == ["978-0061120084", "978-0451524935"]
+        books, after = library.get_books_page(2, after)
+        assert [book.isbn for book in books] == ["978-9750807128"]
+        assert after is None
+        library.close()
+    
+    def test_open_by_extension_and_lookup(self, catalog_path):
+        """İkili kataloğun uzantıyla açıldığını ve ISBN ile bulunabildiğini test eder."""
+        library = Library(catalog_path)
+        
+        assert isinstance(library.storage, BinaryStorage)
+        assert library.get_book_count() == 5
+        for isbn in ["123", "1234", "978-0061120084", "978-9750807128"]:
+            assert library.find_book(isbn).title == f"Kitap {isbn}"
+        assert library.find_book("12") is None
+        assert library.find_book("999") is None
+        assert library.find_book("123456789012345678901") is None
+        library.close()
+    
+    def test_iteration_keeps_insertion_order(self, catalog_path):
+        """Kitapların ekleme sırasıyla döndürüldüğünü ve aramanın çalıştığını test eder."""
+        library = Library(catalog_path)
+        
+        assert [b.isbn for b in library.books][:2] == ["978-0451524935", "123"]
+        assert len(library.search_books("çalıkuşu")) == 5
+        assert library.stats()["most_books_count"] == 5
+        library.close()
+    
+    def test_read_only(self, catalog_path):
+        """İkili kataloğa yazılamadığını test eder."""
+        library = Library(catalog_path)
+        
+        with pytest.raises(ValueError):
+            library.add_book(Book("Yeni", "Yazar", "555"))
+        with pytest.raises(ValueError):
+            library.remove_book("123")
+        library.close()
+    
+    def test_invalid_file(self, catalog_path):
+        """Geçersiz dosyanın ikili katalog olarak açılmadığını test eder."""
+        with open(catalog_path, 'wb') as file:
+            file.write(b"not a catalog at all")
+            
+        with pytest.raises(ValueError):
+            Library(catalog_path)
+
+
+class TestMetadataCache:
+    """Open Library yanıt önbelleği için test sınıfı."""
+    
+    def test_hit_miss_and_ttl(self):
+        """Kayıtların TTL süresince döndürüldüğünü ve sayaçların tutulduğunu test eder."""
+        cache = MetadataCache(":memory:", ttl=60)
+        with patch("metadata_cache.time.time", return_value=1000.0):
+            assert cache.get("/isbn/1.json") is None
+            cache.set("/isbn/1.json", {"title": "Önbellek"})
+            assert cache.get("/isbn/1.json") == {"title": "Önbellek"}
+        with patch("metadata_cache.time.time", return_value=1061.0):
+            assert "/isbn/1.json" not in cache
+            assert cache.get("/isbn/1.json") is None
+        
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 0)
+        cache.close()
+    
+    def test_lru_eviction_and_persistence(self):
+        """Sınır aşıldığında en eski kullanılan kaydın silindiğini ve kayıtların kalıcı olduğunu test eder."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "cache.db")
+        
+        cache = MetadataCache(path, max_entries=2, touch_interval=1)
+        for now, key in [(1.0, "a"), (2.0, "b"), (4.0, "c")]:
+            with patch("metadata_cache.time.time", return_value=now):
+                cache.set(key, key)
+                if key == "b":
+                    # "a" kullanıldığı için en eski kayıt "b" olur
+                    with patch("metadata_cache.time.time", return_value=3.0):
+                        cache.get("a")
+        assert cache.stats()["evictions"] == 1
+        cache.close()
+        
+        reopened = MetadataCache(path, max_entries=2, ttl=float("inf"))
+        assert ("a" in reopened, "b" in reopened, "c" in reopened) == (True, False, True)
+        reopened.close()
+        
+        for name in os.listdir(temp_dir):
+            os.unlink(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+    
+    
+    def test_hot_path_avoids_writes_and_counts(self):
+        """Sık isabetlerin diske yazmadığını, eklemelerin COUNT(*) çalıştırmadığını test eder."""
+        cache = MetadataCache(":memory:", max_entries=20, touch_interval=60)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        with patch("metadata_cache.time.time", return_value=1000.0):
+            for i in range(20):
+                cache.set(f"/isbn/{i}.json", {"n": i})
+        with patch("metadata_cache.time.time", return_value=1030.0):
+            for _ in range(5):
+                assert cache.get("/isbn/0.json") == {"n": 0}
+        assert not [sql for sql in statements if "COUNT" in sql or sql.startswith("UPDATE")]
+        
+        # Aralık dolunca son kullanım zamanı güncellenir ve LRU sırası korunur
+        with patch("metadata_cache.time.time", return_value=1061.0):
+            cache.get("/isbn/0.json")
+            cache.set("/isbn/20.json", {"n": 20})
+            assert "/isbn/0.json" in cache and "/isbn/1.json" not in cache
+        assert [sql for sql in statements if sql.startswith("UPDATE")]
+        assert cache.stats()["evictions"] == 3
+        assert len(cache) == cache._count == 18
+        cache.close()
+    
+    def test_async_lookups_run_off_event_loop(self):
+        """Asenkron yolda önbellek okuma ve yazmalarının olay döngüsü dışında yapıldığını test eder."""
+        cache = MetadataCache(":memory:")
+        client = OpenLibraryClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"title": "Kitap"})))
+        library = Library(tempfile.mktemp(suffix=".json"), openlibrary=client, metadata_cache=cache)
+        threads = []
+        
+        def record(method):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return method(*args)
+            return wrapper
+        
+        async def scenario():
+            with patch.object(cache, "get", record(cache.get)), patch.object(cache, "set", record(cache.set)):
+                await library._openlibrary_aget("/isbn/1.json")
+                await library._openlibrary_aget("/isbn/1.json")
+            await client.aclose()
+            return threading.get_ident()
+        
+        loop_thread = asyncio.run(scenario())
+        assert len(threads) == 3 and loop_thread not in threads
+        assert cache.stats()["hits"] == 1
+        library.close()
+        client.close()
+
+
+class TestAuthorMemo:
+    """Yazar adı belleği ve istek birleştirme için test sınıfı."""
+    
+    def test_concurrent_sync_lookups_share_one_fetch(self):
+        """Aynı yazar için eş zamanlı iş parçacıklarının tek bir istek yaptığını test eder."""
+        memo = AuthorMemo()
+        calls = []
+        release = threading.Event()
+        
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return "George Orwell"
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(memo.resolve("/authors/OL1A", fetch)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while memo.stats()["coalesced"] < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert len(calls) == 1
+        assert results == ["George Orwell"] * 5
+        assert memo.resolve("/authors/OL1A", fetch) == "George Orwell"
+        assert len(calls) == 1
+    
+    def test_concurrent_async_lookups_share_one_fetch(self):
+        """Aynı yazar için eş zamanlı görevlerin tek bir istek yaptığını test eder."""
+        memo = AuthorMemo()
+        calls = []
+        
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "Yaşar Kemal"
+        
+        async def scenario():
+            return await asyncio.gather(*(memo.resolve_async("/authors/OL2A", fetch) for _ in range(5)))
+        
+        assert asyncio.run(scenario()) == ["Yaşar Kemal"] * 5
+        assert len(calls) == 1
+        assert memo.stats()["coalesced"] == 4
+    
+    def test_mixed_sync_and_async_lookups_share_one_fetch(self):
+        """Senkron ve asenkron çağıranların birbirinin süren isteğini paylaştığını test eder."""
+        memo = AuthorMemo()
+        calls = []
+        release = threading.Event()
+        
+        def fetch():
+            calls.append("sync")
+            release.wait(5)
+            return "Sabahattin Ali"
+        
+        async def async_fetch():
+            calls.append("async")
+            await asyncio.sleep(0.05)
+            return "Orhan Pamuk"
+        
+        # Senkron lider, asenkron bekleyenler
+        results = []
+        leader = threading.Thread(target=lambda: results.append(memo.resolve("/authors/OL4A", fetch)))
+        leader.start()
+        while not calls:
+            time.sleep(0.001)
+        
+        async def followers():
+            waiting = asyncio.gather(*(memo.resolve_async("/authors/OL4A", async_fetch) for _ in range(3)))
+            await asyncio.sleep(0.01)
+            release.set()
+            return await waiting
+        
+        assert asyncio.run(followers()) == ["Sabahattin Ali"] * 3
+        leader.join()
+        assert results == ["Sabahattin Ali"] and calls == ["sync"]
+        
+        # Asenkron lider, başka iş parçacığındaki senkron bekleyen
+        async def async_leader():
+            task = asyncio.ensure_future(memo.resolve_async("/authors/OL5A", async_fetch))
+            await asyncio.sleep(0)
+            name = await asyncio.to_thread(memo.resolve, "/authors/OL5A", fetch)
+            return [await task, name]
+        
+        assert asyncio.run(async_leader()) == ["Orhan Pamuk"] * 2
+        assert calls == ["sync", "async"]
+        assert memo.stats()["coalesced"] == 4
+    
+    def test_ttl_and_failures_are_not_memoized(self):
+        """Başarısız sorguların saklanmadığını ve sürenin dolunca yeniden sorgulandığını test eder."""
+        memo = AuthorMemo(ttl=10)
+        assert memo.resolve("/authors/OL3A", lambda: None) is None
+        assert memo.resolve("/authors/OL3A", lambda: "Orhan Pamuk") == "Orhan Pamuk"
+        
+        with patch("author_memo.time.monotonic", return_value=time.monotonic() + 11):
+            assert memo.resolve("/authors/OL3A", lambda: "Yeni Ad") == "Yeni Ad"
+
+
+class TestResponseCache:
+    """Hazır yanıt önbelleği için test sınıfı"""
+    
+    def test_entries_belong_to_one_version(self):
+        """Yeni sürümün eski kayıtları sildiğini, eski sürümün yazılamadığını test eder."""
+        cache = ResponseCache()
+        cache.set(1, ("books", None), b"[]", {"X-Next-Cursor": "abc"})
+        
+        assert cache.get(1, ("books", None)) == (b"[]", {"X-Next-Cursor": "abc"})
+        assert cache.get(2, ("books", None)) is None
+        cache.set(1, ("books", None), b"[]")
+        assert len(cache) == 0
+        assert cache.stats()["version"] == 2
+    
+    def test_lru_eviction_by_size(self):
+        """Boyut sınırı aşılınca en uzun süredir kullanılmayan kaydın silindiğini test eder."""
+        cache = ResponseCache(max_bytes=10)
+        cache.set(1, "a", b"aaaa")
+        cache.set(1, "b", b"bbbb")
+        cache.get(1, "a")
+        cache.set(1, "c", b"cccc")
+        cache.set(1, "big", b"x" * 11)
+        
+        assert cache.get(1, "b") is None
+        assert cache.get(1, "a") is not None
+        assert cache.get(1, "big") is None
+        stats = cache.stats()
+        assert stats["size"] == 8
+        assert stats["evictions"] == 1
+
+
+class TestOpenLibraryClient:
+    """Open Library istemcisinin tekrar deneme, hedging ve devre kesici davranışı için test sınıfı."""
+    
+    @staticmethod
+    def sequence_transport(outcomes, calls):
+        """Sırayla verilen yanıtları döndüren (veya hataları fırlatan) sahte transport."""
+        def handler(request):
+            calls.append(str(request.url))
+            outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return httpx.MockTransport(handler)
+    
+    def test_retries_transient_errors(self):
+        """Zaman aşımı ve 503 yanıtlarının tekrar denendiğini, 404/500'ün denenmediğini test eder."""
+        calls = []
+        outcomes = [httpx.TimeoutException("Timeout"), httpx.Response(503), httpx.Response(200, json={})]
+        client = OpenLibraryClient(transport=self.sequence_transport(outcomes, calls), backoff=0)
+        assert client.get("/isbn/1.json").status_code == 200
+        assert len(calls) == 3 and client.stats()["retried"] == 2
+        
+        for status in (404, 500):
+            calls = []
+            client = OpenLibraryClient(transport=self.sequence_transport([httpx.Response(status)], calls), backoff=0)
+            assert client.get("/isbn/1.json").status_code == status
+            assert len(calls) == 1
+        
+        calls = []
+        client = OpenLibraryClient(transport=self.sequence_transport([httpx.ConnectError("down")], calls),
+                                   retries=1, backoff=0)
+        with pytest.raises(httpx.ConnectError):
+            client.get("/isbn/1.json")
+        assert len(calls) == 2
+    
+    def test_shared_client_created_once(self):
+        """Aynı anda ilk isteği yapan iş parçacıklarının tek bir httpx.Client paylaştığını test eder."""
+        client = OpenLibraryClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        real_client = httpx.Client
+        created = []
+        
+        def slow_client(**kwargs):
+            time.sleep(0.05)
+            created.append(real_client(**kwargs))
+            return created[-1]
+        
+        seen = []
+        with patch("openlibrary.httpx.Client", side_effect=slow_client):
+            threads = [threading.Thread(target=lambda: seen.append(client.client)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert len(created) == 1
+        assert all(http_client is created[0] for http_client in seen)
+        client.close()
+        assert client._client is None
+    
+    def test_hedged_request_returns_faster_response(self):
+        """Gecikmeli isteğe ikinci istek eklendiğini ve hızlı yanıtın kullanıldığını test eder."""
+        calls = []
+        
+        def handler(request):
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return httpx.Response(200, json={"title": "Yavaş"})
+            return httpx.Response(200, json={"title": "Hızlı"})
+        
+        client = OpenLibraryClient(transport=httpx.MockTransport(handler), hedge_after=0.02)
+        started = time.monotonic()
+        assert client.get("/isbn/1.json").json()["title"] == "Hızlı"
+        assert time.monotonic() - started < 0.4
+        assert client.stats()["hedged"] == 1
+        client.close()
+    
+    def test_hedging_under_concurrency_stays_near_percentile(self):
+        """Eş zamanlı isteklerde kuyrukta bekleme süresinin hedging'i tetiklemediğini test eder."""
+        calls = []
+        
+        def handler(request):
+            calls.append(1)
+            time.sleep(0.05)
+            return httpx.Response(200, json={})
+        
+        client = OpenLibraryClient(transport=httpx.MockTransport(handler), hedge_percentile=0.95,
+                                   max_connections=16)
+        # Yüzdelik gecikme için yeterli ölçüm topla
+        for _ in range(20):
+            client.get("/isbn/1.json")
+        
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            list(pool.map(lambda _: client.get("/isbn/1.json"), range(320)))
+        
+        hedged = client.stats()["hedged"]
+        assert hedged < 320 * 0.2
+        assert len(calls) == 340 + hedged
+        client.close()
+    
+    def test_async_hedged_request_cancels_slow_one(self):
+        """Asenkron hedged istekte hızlı yanıtın kullanıldığını test eder."""
+        calls = []
+        
+        async def handler(request):
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(0.5)
+                return httpx.Response(200, json={"title": "Yavaş"})
+            return httpx.Response(200, json={"title": "Hızlı"})
+        
+        client = OpenLibraryClient(transport=httpx.MockTransport(handler), hedge_after=0.02)
+        
+        async def scenario():
+            response = await client.aget("/isbn/1.json")
+            await client.aclose()
+            return response
+        
+        started = time.monotonic()
+        assert asyncio.run(scenario()).json()["title"] == "Hızlı"
+        assert time.monotonic() - started < 0.4
+    
+    def test_circuit_breaker_trips_and_recovers(self):
+        """Hata oranı eşiği aşılınca devrenin açıldığını ve süre sonunda kapandığını test eder."""
+        breaker = CircuitBreaker(window=4, min_requests=4, reset_timeout=30)
+        for result in (True, False, False):
+            breaker.record_success() if result else breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        
+        assert breaker.stats()["state"] == "open"
+        assert not breaker.allow_request()
+        
+        with patch("circuit_breaker.time.monotonic", return_value=time.monotonic() + 31):
+            assert breaker.allow_request()
+            assert not breaker.allow_request()  # yarı açıkken tek deneme
+            breaker.record_success()
+        assert breaker.stats()["state"] == "closed"
+    
+    def test_server_errors_trip_circuit_breaker(self):
+        """Tekrar denenmeyen 500 yanıtlarının da devre kesicide hata sayıldığını test eder."""
+        calls = []
+        client = OpenLibraryClient(
+            transport=self.sequence_transport([httpx.Response(500)], calls),
+            backoff=0, breaker=CircuitBreaker(window=4, min_requests=4)
+        )
+        
+        for _ in range(4):
+            assert client.get("/isbn/1.json").status_code == 500
+        
+        assert len(calls) == 4
+        assert client.breaker.stats()["state"] == "open"
+        with pytest.raises(CircuitOpenError):
+            client.get("/isbn/1.json")
+    
+    def test_open_circuit_fails_fast_but_serves_cache(self):
+        """Devre açıkken isteklerin gönderilmediğini ve önbellekteki kitabın döndürüldüğünü test eder."""
+        calls = []
+        client = OpenLibraryClient(
+            transport=self.sequence_transport([httpx.ConnectError("down")], calls),
+            retries=0, breaker=CircuitBreaker(window=2, min_requests=2)
+        )
+        cache = MetadataCache(":memory:")
+        cache.set("/isbn/1.json", {"title": "Önbellekten"})
+        library = Library(tempfile.mktemp(suffix=".json"), openlibrary=client, metadata_cache=cache)
+        
+        for _ in range(2):
+            with pytest.raises(ValueError, match="ağ hatası"):
+                library.fetch_book_from_api("2")
+        with pytest.raises(ValueError, match="geçici olarak kullanılamıyor"):
+            library.fetch_book_from_api("2")
+        with pytest.raises(CircuitOpenError):
+            client.get("/isbn/2.json")
+        
+        assert len(calls) == 2
+        assert library.fetch_book_from_api("1")["title"] == "Önbellekten"
+        assert client.stats()["circuit"]["rejected"] == 2
+    
+    def test_unavailable_error_distinct_from_not_found(self):
+        """Ulaşılamama hatasının, devre açıkken bile bulunamadı hatasından ayrıldığını test eder."""
+        calls = []
+        client = OpenLibraryClient(
+            transport=self.sequence_transport([httpx.Response(404), httpx.ConnectError("down")], calls),
+            retries=0, breaker=CircuitBreaker(window=1, min_requests=1, failure_threshold=1)
+        )
+        library = Library(tempfile.mktemp(suffix=".json"), openlibrary=client, negative_cache=NegativeCache())
+        
+        with pytest.raises(ValueError, match="bulunamadı") as exc_info:
+            library.fetch_book_from_api("1")
+        assert not isinstance(exc_info.value, OpenLibraryUnavailableError)
+        with pytest.raises(OpenLibraryUnavailableError, match="ağ hatası"):
+            library.fetch_book_from_api("2")
+        with pytest.raises(OpenLibraryUnavailableError, match="geçici olarak kullanılamıyor"):
+            library.fetch_book_from_api("3")
+        
+        # Devre açıkken negatif önbellekten gelen yanıt yine "bulunamadı" olmalı
+        assert client.breaker.is_open
+        with pytest.raises(ValueError) as exc_info:
+            library.fetch_book_from_api("1")
+        assert not isinstance(exc_info.value, OpenLibraryUnavailableError)
+        assert len(calls) == 2
+    
+    def test_aborted_trial_request_is_released(self):
+        """Sonucu kaydedilmeden biten deneme isteğinin devreyi half_open'da kilitlemediğini test eder."""
+        breaker = CircuitBreaker(window=1, min_requests=1, reset_timeout=30)
+        breaker.record_failure()
+        
+        def handler(request):
+            raise RuntimeError("beklenmeyen hata")
+        
+        client = OpenLibraryClient(transport=httpx.MockTransport(handler), retries=0, breaker=breaker)
+        with patch("circuit_breaker.time.monotonic", return_value=time.monotonic() + 31):
+            with pytest.raises(RuntimeError):
+                client.get("/isbn/1.json")
+            assert breaker.stats()["state"] == "half_open"
+            
+            async def scenario():
+                with pytest.raises(RuntimeError):
+                    await client.aget("/isbn/1.json")
+            asyncio.run(scenario())
+            
+            # Deneme hakkı geri verildi; başka bir çağıranın hakkı ise korunur
+            assert breaker.allow_request()
+            threading.Thread(target=breaker.release_trial).start()
+            time.sleep(0.05)
+            assert not breaker.allow_request()
+        client.close()
+
+
+class TestOfflineIndex:
+    """Open Library dump'larından oluşturulan çevrimdışı indeks için test sınıfı."""
+    
+    @pytest.fixture
+    def dump_dir(self):
+        """Örnek authors ve editions dump dosyalarını içeren geçici dizin."""
+        temp_dir = tempfile.mkdtemp()
+        
+        def write_dump(name, records):
+            with gzip.open(os.path.join(temp_dir, name), "wt", encoding="utf-8") as dump:
+                for record_type, key, data in records:
+                    dump.write(f"{record_type}\t{key}\t1\t2024-01-01T00:00:00\t{json.dumps(data)}\n")
+                dump.write("bozuk satır\n")
+        
+        write_dump("authors.txt.gz", [
+            ("/type/author", "/authors/OL1A", {"key": "/authors/OL1A", "name": "George Orwell"}),
+        ])
+        write_dump("editions.txt.gz", [
+            ("/type/edition", "/books/OL1M", {"title": "1984", "authors": [{"key": "/authors/OL1A"}],
+                                              "isbn_13": ["9780451524935"], "isbn_10": ["0451524934"]}),
+            ("/type/edition", "/books/OL2M", {"title": "Yazarsız", "isbn_10": ["1111111111"]}),
+            ("/type/edition", "/books/OL3M", {"title": "Bilinmeyen", "authors": [{"key": "/authors/OL9A"}],
+                                              "isbn_13": ["9782222222222"]}),
+        ])
+        
+        yield temp_dir
+        
+        for name in os.listdir(temp_dir):
+            os.unlink(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+    
+    def test_import_and_lookup(self, dump_dir):
+        """Dump'ların içe aktarıldığını ve ISBN'lerin tireli/tiresiz bulunduğunu test eder."""
+        index = OfflineIndex(os.path.join(dump_dir, "index.db"))
+        progress = []
+        assert index.import_authors(os.path.join(dump_dir, "authors.txt.gz")) == 1
+        assert index.import_editions(os.path.join(dump_dir, "editions.txt.gz"),
+                                     progress_callback=progress.append, progress_every=2) == 3
+        
+        assert progress == [2, 3]
+        assert index.stats() == {"editions": 4, "authors": 1}
+        assert index.lookup("978-0451524935") == {"title": "1984", "author_key": "/authors/OL1A",
+                                                  "author": "George Orwell"}
+        assert index.lookup("0451524934")["title"] == "1984"
+        assert index.lookup("1111111111")["author"] is None
+        assert index.lookup("0000000000") is None
+        index.close()
+    
+    def test_library_uses_index_before_network(self, dump_dir):
+        """Library'nin kitapları önce indekste aradığını, yalnızca eksikleri ağdan çektiğini test eder."""
+        index_path = os.path.join(dump_dir, "index.db")
+        index = OfflineIndex(index_path)
+        index.import_authors(os.path.join(dump_dir, "authors.txt.gz"))
+        index.import_editions(os.path.join(dump_dir, "editions.txt.gz"))
+        index.close()
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request.url.path)
+            if request.url.path == "/authors/OL9A.json":
+                return httpx.Response(200, json={"name": "Ağdan Yazar"})
+            if request.url.path == "/isbn/3333333333.json":
+                return httpx.Response(200, json={"title": "Ağdan Kitap"})
+            return httpx.Response(404)
+        
+        client = OpenLibraryClient(transport=httpx.MockTransport(handler), retries=0)
+        library = Library(os.path.join(dump_dir, "library.json"), openlibrary=client, offline_index=index_path)
+        
+        assert library.add_book_by_isbn("978-0451524935") is True
+        assert library.find_book("978-0451524935").author == "George Orwell"
+        assert requests == []
+        
+        assert asyncio.run(library.fetch_book_from_api_async("9782222222222"))["author"] == "Ağdan Yazar"
+        summary = library.add_books_by_isbn(["1111111111", "9782222222222", "3333333333"])
+        assert summary["added"] == 3
+        assert library.find_book("1111111111").author == "Bilinmeyen Yazar"
+        # Yalnızca indekste olmayan kitap ağdan (bibkeys, ardından tek tek) sorgulanır
+        assert requests == ["/authors/OL9A.json", "/api/books", "/isbn/3333333333.json"]
+        
+        library.close()
+        client.close()
+
+
+class TestFakeOpenLibrary:
+    """Yerel sahte Open Library sunucusu için test sınıfı"""
+    
+    @pytest.fixture
+    def temp_file(self):
+        """Geçici test dosyası oluşturur."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
+            temp_filename = f.name
+        yield temp_filename
+        if os.path.exists(temp_filename):
+            os.unlink(temp_filename)
+    
+    def test_add_book_through_fake_server(self, temp_file):
+        """Sentetik veriyle kitabın uçtan uca eklendiğini test eder."""
+        with FakeOpenLibrary(author_count=3) as server:
+            client = OpenLibraryClient(server.base_url, retries=0)
+            library = Library(temp_file, openlibrary=client)
+            try:
+                assert library.add_book_by_isbn("9780000000004") is True
+                book = library.find_book("9780000000004")
+            finally:
+                library.close()
+                client.close()
+        
+        assert book.title == "Kitap 9780000000004"
+        assert book.author == "Yazar 2"
+        assert server.requests == 2
+    
+    def test_fixtures_and_error_injection(self, temp_file):
+        """Fixture dışındaki ISBN'ler için 404, hata oranı 1 iken 503 döndüğünü test eder."""
+        fixtures = {"editions": {"111": {"title": "Sabit Kitap"}}, "authors": {}}
+        with FakeOpenLibrary(fixtures=fixtures) as server:
+            with httpx.Client(base_url=server.base_url) as client:
+                assert client.get("/isbn/111.json").json() == {"title": "Sabit Kitap"}
+                assert client.get("/isbn/222.json").status_code == 404
+                server.error_rate = 1.0
+                assert client.get("/isbn/111.json").status_code == 503
 
 
 class TestLibraryAPI:
     """Library sınıfının API fonksiyonları için test sınıfı."""
     
     @pytest.fixture
-    def temp_library(self):
-        """Her test için geçici bir kütüphane oluşturur."""
+    def mock_api(self):
+        """Open Library yerine yanıt veren sahte transport ve yapılan isteklerin kaydı."""
+        api = SimpleNamespace(responses={}, requests=[])
+        
+        def handler(request):
+            api.requests.append(str(request.url))
+            response = api.responses.get(request.url.path, httpx.Response(404))
+            if isinstance(response, Exception):
+                raise response
+            return response
+        
+        api.transport = httpx.MockTransport(handler)
+        return api
+    
+    @pytest.fixture
+    def temp_library(self, mock_api):
+        """Her test için sahte Open Library'ye bağlı geçici bir kütüphane oluşturur."""
         # Geçici dosya oluştur
         temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
         temp_file.close()
         
-        library = Library(temp_file.name)
+        # Tekrar denemeler bu sınıfta kapalı; istek sayıları testlerde doğrulanır
+        library = Library(temp_file.name, openlibrary=OpenLibraryClient(transport=mock_api.transport, retries=0))
         
         yield library
         
         # Test sonrası temizlik
+        library.openlibrary.close()
         if os.path.exists(temp_file.name):
             os.unlink(temp_file.name)
-    
-    @pytest.fixture
-    def mock_client(self):
-        """HTTP istekleri için mock client oluşturur."""
-        with patch('httpx.Client') as mock:
-            yield mock
             
     @pytest.fixture
     def sample_book_data(self):
@@ -333,29 +1827,18 @@ class TestLibraryAPI:
         # Kitap eklenmediğini kontrol et
         assert len(temp_library.books) == 0
             
-    @patch('library.httpx.Client')
-    def test_fetch_book_from_api_success(self, mock_client, temp_library):
+    def test_fetch_book_from_api_success(self, mock_api, temp_library):
         """API'den kitap bilgilerini başarıyla çekmeyi test eder."""
-        # Mock yanıtı oluştur
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        # Sahte yanıtları oluştur
+        mock_api.responses["/isbn/1234567890.json"] = httpx.Response(200, json={
             "title": "<script>Test Book</script>",  # Test XSS koruması
             "authors": [{"key": "/authors/OL1A"}]
-        }
+        })
         
-        # Yazar bilgisi için mock yanıtı
-        mock_author_response = Mock()
-        mock_author_response.status_code = 200
-        mock_author_response.json.return_value = {
+        # Yazar bilgisi için sahte yanıt
+        mock_api.responses["/authors/OL1A.json"] = httpx.Response(200, json={
             "name": "<b>Test Author</b>"  # Test XSS koruması
-        }
-        
-        # Mock client'ı ayarla
-        mock_client.return_value.__enter__.return_value.get.side_effect = [
-            mock_response,
-            mock_author_response
-        ]
+        })
         
         # Test et
         result = temp_library.fetch_book_from_api("1234567890")
@@ -369,22 +1852,13 @@ class TestLibraryAPI:
         assert result["isbn"] == "1234567890"
         
         # API çağrılarının doğru yapıldığını doğrula
-        mock_client.return_value.__enter__.return_value.get.assert_any_call(
-            "https://openlibrary.org/isbn/1234567890.json"
-        )
-        mock_client.return_value.__enter__.return_value.get.assert_any_call(
-            "https://openlibrary.org/authors/OL1A.json"
-        )
+        assert "https://openlibrary.org/isbn/1234567890.json" in mock_api.requests
+        assert "https://openlibrary.org/authors/OL1A.json" in mock_api.requests
     
-    @patch('library.httpx.Client')
-    def test_fetch_book_from_api_not_found(self, mock_client, temp_library):
+    def test_fetch_book_from_api_not_found(self, mock_api, temp_library):
         """API'de kitap bulunamadığında hata döndürdüğünü test eder."""
-        # Mock yanıtı oluştur (404 Not Found)
-        mock_response = Mock()
-        mock_response.status_code = 404
-        
-        # Mock client'ı ayarla
-        mock_client.return_value.__enter__.return_value.get.return_value = mock_response
+        # Sahte yanıtı oluştur (404 Not Found)
+        mock_api.responses["/isbn/nonexistent123.json"] = httpx.Response(404)
         
         # Test et - hata fırlatmalı
         with pytest.raises(ValueError) as exc_info:
@@ -394,15 +1868,12 @@ class TestLibraryAPI:
         assert "bulunamadı" in str(exc_info.value).lower()
         
         # API çağrısının doğru yapıldığını doğrula
-        mock_client.return_value.__enter__.return_value.get.assert_called_once_with(
-            "https://openlibrary.org/isbn/nonexistent123.json"
-        )
+        assert mock_api.requests == ["https://openlibrary.org/isbn/nonexistent123.json"]
     
-    @patch('library.httpx.Client')
-    def test_fetch_book_from_api_timeout(self, mock_client, temp_library):
+    def test_fetch_book_from_api_timeout(self, mock_api, temp_library):
         """API timeout durumunda uygun hata döndürdüğünü test eder."""
         # Timeout hatası oluştur
-        mock_client.return_value.__enter__.return_value.get.side_effect = httpx.TimeoutException("Timeout")
+        mock_api.responses["/isbn/timeout123.json"] = httpx.TimeoutException("Timeout")
         
         # Test et - hata fırlatmalı
         with pytest.raises(ValueError) as exc_info:
@@ -412,30 +1883,18 @@ class TestLibraryAPI:
         assert "ağ hatası" in str(exc_info.value).lower()
         
         # API çağrısının doğru yapıldığını doğrula
-        mock_client.return_value.__enter__.return_value.get.assert_called_once()
+        assert len(mock_api.requests) == 1
     
-    @patch('library.httpx.Client')
-    def test_add_book_by_isbn_success(self, mock_client, temp_library):
+    def test_add_book_by_isbn_success(self, mock_api, temp_library):
         """ISBN ile kitap eklemenin başarılı olduğunu test eder."""
-        # Mock yanıtları oluştur
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        # Sahte yanıtları oluştur
+        mock_api.responses["/isbn/123-4567890.json"] = httpx.Response(200, json={
             "title": "<script>Test Book</script>",  # Test XSS koruması
             "authors": [{"key": "/authors/OL1A"}]
-        }
-        
-        mock_author_response = Mock()
-        mock_author_response.status_code = 200
-        mock_author_response.json.return_value = {
+        })
+        mock_api.responses["/authors/OL1A.json"] = httpx.Response(200, json={
             "name": "<b>Test Author</b>"  # Test XSS koruması
-        }
-        
-        # Mock client'ı ayarla
-        mock_client.return_value.__enter__.return_value.get.side_effect = [
-            mock_response,
-            mock_author_response
-        ]
+        })
         
         # Test et
         result = temp_library.add_book_by_isbn("123-4567890")
@@ -453,7 +1912,7 @@ class TestLibraryAPI:
         assert "zaten mevcut" in str(exc_info.value)
         
         # API çağrılarının doğru yapıldığını doğrula
-        assert mock_client.return_value.__enter__.return_value.get.call_count == 2
+        assert len(mock_api.requests) == 2
     
     def test_add_book_by_isbn_duplicate(self, temp_library, sample_book_data):
         """Aynı ISBN'li kitap eklemeye çalışıldığında hata döndürdüğünü test eder."""
@@ -471,13 +1930,10 @@ class TestLibraryAPI:
         # Kitap sayısının değişmediğini kontrol et
         assert len(temp_library.books) == 1
     
-    @patch('library.httpx.Client')
-    def test_add_book_by_isbn_api_failure(self, mock_client, temp_library):
+    def test_add_book_by_isbn_api_failure(self, mock_api, temp_library):
         """API başarısız olduğunda uygun hata döndürdüğünü test eder."""
-        # Hata durumu için mock yanıtı (500 Internal Server Error)
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_client.return_value.__enter__.return_value.get.return_value = mock_response
+        # Hata durumu için sahte yanıt (500 Internal Server Error)
+        mock_api.responses["/isbn/error123.json"] = httpx.Response(500)
         
         # Test et - hata fırlatmalı
         with pytest.raises(ValueError) as exc_info:
@@ -490,10 +1946,522 @@ class TestLibraryAPI:
         assert len(temp_library.books) == 0
         
         # API çağrısının doğru yapıldığını doğrula
-        mock_client.return_value.__enter__.return_value.get.assert_called_once_with(
-            "https://openlibrary.org/isbn/error123.json"
-        )
+        assert mock_api.requests == ["https://openlibrary.org/isbn/error123.json"]
+    
+    def test_shared_client_is_reused_and_closed(self, mock_api, temp_library):
+        """Tüm isteklerin aynı istemciyi kullandığını ve close() ile kapatıldığını test eder."""
+        mock_api.responses["/authors/OL1A.json"] = httpx.Response(200, json={"name": "Yazar"})
+        
+        assert temp_library.fetch_author_from_api("/authors/OL1A") == "Yazar"
+        client = temp_library.openlibrary.client
+        assert temp_library.fetch_author_from_api("/authors/OL1A") == "Yazar"
+        assert temp_library.openlibrary.client is client
+        
+        temp_library.openlibrary.close()
+        assert client.is_closed
+    
+    def test_library_close_closes_own_client(self):
+        """Library'nin yalnızca kendi oluşturduğu istemciyi kapattığını test eder."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "library.json")
+        
+        with Library(path) as library:
+            client = library.openlibrary.client
+        assert client.is_closed
+        
+        shared = OpenLibraryClient(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+        with Library(path, openlibrary=shared):
+            client = shared.client
+        assert not client.is_closed
+        shared.close()
+        
+        os.rmdir(temp_dir)
+    
+    def test_add_book_by_isbn_async(self, mock_api, temp_library):
+        """Asenkron ISBN ekleme yolunun senkron yol ile aynı sonucu verdiğini test eder."""
+        mock_api.responses["/isbn/1234567890.json"] = httpx.Response(200, json={
+            "title": "Async Book",
+            "authors": [{"key": "/authors/OL1A"}]
+        })
+        mock_api.responses["/authors/OL1A.json"] = httpx.Response(200, json={"name": "Async Author"})
+        
+        async def scenario():
+            assert await temp_library.add_book_by_isbn_async("1234567890") is True
+            with pytest.raises(ValueError) as exc_info:
+                await temp_library.add_book_by_isbn_async("1234567890")
+            assert "zaten mevcut" in str(exc_info.value)
+            with pytest.raises(ValueError):
+                await temp_library.fetch_book_from_api_async("error123")
+            await temp_library.openlibrary.aclose()
+            
+        asyncio.run(scenario())
+        
+        book = temp_library.find_book("1234567890")
+        assert (book.title, book.author) == ("Async Book", "Async Author")
+        assert temp_library.openlibrary._async_client is None
+    
+    def test_add_book_by_isbn_async_concurrent_duplicate(self, mock_api, temp_library):
+        """Aynı ISBN için eş zamanlı isteklerden yalnızca birinin kitap eklediğini test eder."""
+        mock_api.responses["/isbn/1234567890.json"] = httpx.Response(200, json={"title": "Async Book"})
+        
+        async def scenario():
+            return await asyncio.gather(
+                *(temp_library.add_book_by_isbn_async("1234567890") for _ in range(3)),
+                return_exceptions=True
+            )
+            
+        results = asyncio.run(scenario())
+        
+        assert results.count(True) == 1
+        assert all(isinstance(result, ValueError) for result in results if result is not True)
+        assert temp_library.get_book_count() == 1
+    
+    def test_add_book_by_isbn_async_writes_off_event_loop(self, mock_api, temp_library):
+        """Asenkron eklemede çevrimdışı indeks ve depo yazmasının olay döngüsü dışında yapıldığını test eder."""
+        mock_api.responses["/isbn/1234567890.json"] = httpx.Response(200, json={"title": "Async Book"})
+        threads = {}
+        
+        def record(name, method):
+            def wrapper(*args):
+                threads[name] = threading.get_ident()
+                return method(*args)
+            return wrapper
+        
+        temp_library.offline_index = SimpleNamespace(lookup=record("lookup", lambda isbn: None))
+        
+        async def scenario():
+            with patch.object(temp_library.storage, "add", record("add", temp_library.storage.add)):
+                assert await temp_library.add_book_by_isbn_async("1234567890") is True
+            await temp_library.openlibrary.aclose()
+            return threading.get_ident()
+            
+        loop_thread = asyncio.run(scenario())
+        
+        assert set(threads) == {"lookup", "add"}
+        assert loop_thread not in threads.values()
+        assert temp_library.find_book("1234567890").title == "Async Book"
+    
+    def test_add_books_by_isbn_uses_bibkeys_and_single_write(self, mock_api, temp_library):
+        """Toplu eklemenin bibkeys sorgusu, tekil yedek istekler ve tek kayıtla yapıldığını test eder."""
+        temp_library.add_book(Book("Mevcut", "Yazar", "111"))
+        mock_api.responses["/api/books"] = httpx.Response(200, json={
+            "ISBN:222": {"title": "Toplu Kitap", "authors": [{"name": "Toplu Yazar"}]}
+        })
+        # bibkeys yanıtında olmayan ISBN'ler tek tek çekilir; ortak yazar bir kez sorgulanır
+        for isbn in ("333", "444"):
+            mock_api.responses[f"/isbn/{isbn}.json"] = httpx.Response(200, json={
+                "title": f"Kitap {isbn}", "authors": [{"key": "/authors/OL1A"}]
+            })
+        mock_api.responses["/authors/OL1A.json"] = httpx.Response(200, json={"name": "Ortak Yazar"})
+        
+        with patch.object(temp_library.storage, "add_many", wraps=temp_library.storage.add_many) as add_many:
+            summary = temp_library.add_books_by_isbn(
+                ["111", "222", "333", "444", "222", "abc", "555"], concurrency=4
+            )
+            
+        assert add_many.call_count == 1
+        assert (summary["added"], summary["skipped"], summary["failed"]) == (3, 2, 2)
+        assert [r["status"] for r in summary["results"]] == [
+            "skipped", "added", "added", "added", "skipped", "error", "error"
+        ]
+        assert temp_library.find_book("222").author == "Toplu Yazar"
+        assert temp_library.find_book("444").author == "Ortak Yazar"
+        
+        bibkeys_requests = [url for url in mock_api.requests if "/api/books" in url]
+        assert len(bibkeys_requests) == 1
+        assert "ISBN%3A111" not in bibkeys_requests[0] and "ISBN:111" not in bibkeys_requests[0]
+        assert sum("/authors/OL1A.json" in url for url in mock_api.requests) == 1
+    
+    def test_metadata_cache_avoids_repeat_requests(self, mock_api, temp_library):
+        """Silinip yeniden eklenen kitap için Open Library'ye tekrar gidilmediğini test eder."""
+        temp_library.metadata_cache = MetadataCache(":memory:")
+        mock_api.responses["/isbn/1234567890.json"] = httpx.Response(200, json={
+            "title": "Önbellekli Kitap", "authors": [{"key": "/authors/OL1A"}]
+        })
+        mock_api.responses["/authors/OL1A.json"] = httpx.Response(200, json={"name": "Yazar"})
+        
+        temp_library.add_book_by_isbn("1234567890")
+        temp_library.remove_book("1234567890")
+        temp_library.add_book_by_isbn("1234567890")
+        asyncio.run(temp_library.fetch_book_from_api_async("1234567890"))
+        temp_library.remove_book("1234567890")
+        assert temp_library.add_books_by_isbn(["1234567890"])["added"] == 1
+        
+        assert len(mock_api.requests) == 2
+        assert temp_library.find_book("1234567890").author == "Yazar"
+        # Yazar adı ilk istekten sonra yazar belleğinden gelir
+        stats = temp_library.cache_stats()
+        assert (stats["metadata"]["hits"], stats["metadata"]["misses"]) == (3, 2)
+        assert stats["authors"]["hits"] == 3
+    
+    def test_shared_author_is_fetched_once(self, mock_api, temp_library):
+        """Aynı yazara ait kitaplar için yazarın bir kez sorgulandığını test eder."""
+        for isbn in ("111", "222", "333"):
+            mock_api.responses[f"/isbn/{isbn}.json"] = httpx.Response(200, json={
+                "title": f"Kitap {isbn}", "authors": [{"key": "/authors/OL1A"}]
+            })
+        mock_api.responses["/authors/OL1A.json"] = httpx.Response(200, json={"name": "Ortak Yazar"})
+        
+        temp_library.add_book_by_isbn("111")
+        
+        async def scenario():
+            await asyncio.gather(*(temp_library.add_book_by_isbn_async(isbn) for isbn in ("222", "333")))
+            await temp_library.openlibrary.aclose()
+        
+        asyncio.run(scenario())
+        
+        assert sum("/authors/OL1A.json" in url for url in mock_api.requests) == 1
+        assert {book.author for book in temp_library.books} == {"Ortak Yazar"}
+    
+    def test_not_found_isbn_is_remembered(self, mock_api, temp_library):
+        """404 dönen ISBN'in kısa süre hatırlandığını ve temizlenebildiğini test eder."""
+        for _ in range(3):
+            with pytest.raises(ValueError) as exc_info:
+                temp_library.add_book_by_isbn("404404")
+            assert "bulunamadı" in str(exc_info.value)
+        with pytest.raises(ValueError, match="bulunamadı"):
+            asyncio.run(temp_library.fetch_book_from_api_async("404404"))
+        assert temp_library.add_books_by_isbn(["404404"])["results"][0]["error"] == "Kitap Open Library'de bulunamadı"
+        assert len(mock_api.requests) == 1
+        assert temp_library.cache_stats()["not_found"]["hits"] == 4
+        
+        # Temizlendikten sonra ISBN yeniden sorgulanır
+        mock_api.responses["/isbn/404404.json"] = httpx.Response(200, json={"title": "Artık Var"})
+        assert temp_library.purge_negative_cache("404404") == 1
+        assert temp_library.add_book_by_isbn("404404") is True
+        assert len(mock_api.requests) == 2
+    
+    def test_not_found_isbn_expires(self, mock_api, temp_library):
+        """Bulunamayan ISBN kaydının süresi dolunca tekrar sorgulandığını test eder."""
+        temp_library.negative_cache = NegativeCache(ttl=60)
+        with pytest.raises(ValueError):
+            temp_library.fetch_book_from_api("404404")
+        with patch("negative_cache.time.monotonic", return_value=time.monotonic() + 61):
+            with pytest.raises(ValueError):
+                temp_library.fetch_book_from_api("404404")
+        assert len(mock_api.requests) == 2
+    
+    def test_prefetch_isbns_warms_cache(self, mock_api, temp_library):
+        """Ön yüklenen ISBN'lerin daha sonra ağa çıkmadan eklendiğini test eder."""
+        temp_library.metadata_cache = MetadataCache(":memory:")
+        mock_api.responses["/isbn/111.json"] = httpx.Response(200, json={
+            "title": "Ön Yüklenen Kitap", "authors": [{"key": "/authors/OL1A"}]
+        })
+        mock_api.responses["/authors/OL1A.json"] = httpx.Response(200, json={"name": "Yazar"})
+        progress = []
+        
+        summary = temp_library.prefetch_isbns(["111", "404", "111", "abc"], concurrency=2,
+                                              progress_callback=lambda done, total: progress.append((done, total)))
+        
+        assert summary == {"fetched": 1, "cached": 0, "skipped": 0, "not_found": 1, "failed": 1, "total": 3}
+        assert progress[-1] == (3, 3)
+        assert temp_library.get_book_count() == 0
+        
+        requests = len(mock_api.requests)
+        assert temp_library.add_book_by_isbn("111") is True
+        assert temp_library.find_book("111").author == "Yazar"
+        assert temp_library.prefetch_isbns(["111"])["skipped"] == 1
+        assert len(mock_api.requests) == requests
+    
+    def test_prefetch_isbns_requires_metadata_cache(self, temp_library):
+        """Önbellek olmadan ön yüklemenin hata verdiğini test eder."""
+        with pytest.raises(ValueError):
+            temp_library.prefetch_isbns(["111"])
+    
+    def test_add_books_by_isbn_falls_back_when_bibkeys_fails(self, mock_api, temp_library):
+        """bibkeys isteği başarısız olduğunda ISBN'lerin tek tek çekildiğini test eder."""
+        mock_api.responses["/api/books"] = httpx.Response(500)
+        mock_api.responses["/isbn/222.json"] = httpx.Response(200, json={"title": "Yedek Kitap"})
+        
+        summary = temp_library.add_books_by_isbn(["222"], batch_size=1)
+        
+        assert summary["added"] == 1
+        assert temp_library.find_book("222").author == "Bilinmeyen Yazar"
+        assert "https://openlibrary.org/isbn/222.json" in mock_api.requests
+
 
+class TestAPI:
+    """FastAPI uç noktaları için test sınıfı."""
+    
+    @pytest.fixture
+    def api(self, tmp_path, monkeypatch):
+        """
+        Geçici kütüphaneye ve sahte Open Library'ye bağlı api modülü. connect()
+        ile uygulamanın kullandığı kütüphane başka bir dosyaya bağlanabilir.
+        """
+        # Modül ilk kez içe aktarılırken oluşturulan dosyalar da geçici dizinde kalsın
+        monkeypatch.setenv("LIBRARY_FILE", str(tmp_path / "import.json"))
+        monkeypatch.setenv("OPENLIBRARY_CACHE_FILE", ":memory:")
+        module = importlib.import_module("api")
+        responses = {}
+        libraries = []
+        
+        def handler(request):
+            return responses.get(request.url.path, httpx.Response(404))
+        
+        def connect(filename="api.json", **options):
+            library = Library(str(tmp_path / filename), openlibrary=OpenLibraryClient(
+                transport=httpx.MockTransport(handler), retries=0), **options)
+            libraries.append(library)
+            monkeypatch.setattr(module, "library", library)
+            return library
+        
+        connect()
+        monkeypatch.setattr(module, "response_cache", ResponseCache())
+        yield SimpleNamespace(module=module, client=TestClient(module.app), responses=responses, connect=connect)
+        
+        for library in libraries:
+            library.openlibrary.close()
+            library.close()
+    
+    def test_if_none_match(self, api):
+        """Güncel, zayıf ve * ETag'lerinde 304, eski veya farklı ETag'lerde 200 döndüğünü test eder."""
+        api.client.post("/books/manual", json={"title": "Kitap", "author": "Yazar", "isbn": "111"})
+        response = api.client.get("/books")
+        etag = response.headers["etag"]
+        assert response.status_code == 200 and etag.startswith('"')
+        
+        for tag in (etag, f"W/{etag}", "*", f'"baska", {etag}'):
+            response = api.client.get("/books", headers={"If-None-Match": tag})
+            assert response.status_code == 304
+            assert response.headers["etag"] == etag and response.content == b""
+        
+        response = api.client.get("/books", headers={"If-None-Match": '"baska"'})
+        assert response.status_code == 200 and response.json()[0]["isbn"] == "111"
+        assert api.client.get("/books/111", headers={"If-None-Match": etag}).status_code == 304
+    
+    def test_etag_changes_after_post(self, api):
+        """Kitap eklendikten sonra eski ETag'in 304 döndürmediğini test eder."""
+        etag = api.client.get("/books").headers["etag"]
+        api.responses["/isbn/222.json"] = httpx.Response(200, json={"title": "Yeni Kitap"})
+        assert api.client.post("/books", json={"isbn": "222"}).status_code == 200
+        
+        response = api.client.get("/books", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert [book["isbn"] for book in response.json()] == ["222"]
+    
+    def test_sqlite_changes_from_other_process_are_seen(self, api):
+        """Aynı SQLite veritabanını kullanan başka bir bağlantının değişikliklerinin ETag'i ve yanıtı güncellediğini test eder."""
+        other = api.connect("shared.db")
+        api.connect("shared.db")  # uygulama ikinci bağlantıyı kullanır
+        
+        etag = api.client.get("/books").headers["etag"]
+        assert api.client.get("/books").json() == []
+        other.add_book(Book("Başka Süreç", "Yazar", "333"))
+        
+        response = api.client.get("/books", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert [book["isbn"] for book in response.json()] == ["333"]
+    
+    def test_cached_response_dropped_after_mutation(self, api):
+        """Önbellekteki yanıtın hem bu süreçteki hem başka bağlantıdaki değişiklikten sonra yenilendiğini test eder."""
+        other = api.connect("shared.db")
+        api.connect("shared.db")  # uygulama ikinci bağlantıyı kullanır
+        cache = api.module.response_cache
+        
+        api.client.post("/books/manual", json={"title": "Kitap", "author": "Yazar", "isbn": "111"})
+        first = api.client.get("/stats").content
+        assert api.client.get("/stats").content == first
+        assert cache.stats()["hits"] == 1
+        
+        assert api.client.delete("/books/111").status_code == 200
+        assert api.client.get("/stats").json()["total_books"] == 0
+        
+        other.add_book(Book("Başka Süreç", "Yazar", "222"))
+        assert api.client.get("/stats").json()["total_books"] == 1
+        assert cache.stats()["hits"] == 1 and len(cache) == 1
+    
+    def test_response_cache_respects_max_bytes(self, api, monkeypatch):
+        """Önbellek boyutunun max_bytes'ı aşmadığını ve silinen yanıtların yeniden üretildiğini test eder."""
+        for index in range(5):
+            api.client.post("/books/manual", json={"title": f"Kitap {index}", "author": "Yazar", "isbn": f"{index}"})
+        size = len(api.client.get("/books/0").content)
+        cache = ResponseCache(max_bytes=size * 2)
+        monkeypatch.setattr(api.module, "response_cache", cache)
+        
+        for _ in range(2):
+            for index in range(5):
+                assert api.client.get(f"/books/{index}").json()["title"] == f"Kitap {index}"
+                assert cache.size <= cache.max_bytes
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 8 and cache.stats()["hits"] == 0
+    
+    
+    def test_bulk_add_maps_results_to_request_indexes(self, api):
+        """Toplu eklemede her sonucun istekteki satırın sırasıyla döndüğünü test eder."""
+        api.client.post("/books/manual", json={"title": "Var Olan", "author": "Yazar", "isbn": "300"})
+        items = [
+            {"title": "Bir", "author": "Yazar", "isbn": "100"},
+            {"title": " ", "author": "Yazar", "isbn": "101"},
+            {"title": "İki", "author": "Yazar", "isbn": "abc"},
+            {"title": "Üç", "author": "Yazar", "isbn": "300"},
+            {"title": "Dört", "author": "Yazar", "isbn": "100"},
+            {"title": "Beş", "author": "Yazar", "isbn": "102"},
+        ]
+        response = api.client.post("/books/bulk", json=items)
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert [(r["index"], r["isbn"], r["status"]) for r in body["results"]] == [
+            (0, "100", "added"), (1, "101", "error"), (2, "abc", "error"),
+            (3, "300", "skipped"), (4, "100", "skipped"), (5, "102", "added")
+        ]
+        assert body["results"][1]["error"]
+        assert (body["added"], body["skipped"], body["failed"]) == (2, 2, 2)
+        assert api.client.get("/books/102").json()["title"] == "Beş"
+    
+    def test_bulk_add_conflict_error_adds_nothing(self, api):
+        """on_conflict=error iken çakışma olursa 409 döndüğünü ve hiçbir kitabın eklenmediğini test eder."""
+        api.client.post("/books/manual", json={"title": "Var Olan", "author": "Yazar", "isbn": "300"})
+        items = [{"title": "Yeni", "author": "Yazar", "isbn": "301"},
+                 {"title": "Çakışan", "author": "Yazar", "isbn": "300"}]
+        
+        response = api.client.post("/books/bulk?on_conflict=error", json=items)
+        assert response.status_code == 409
+        assert "300" in response.json()["detail"]
+        assert api.client.get("/books/301").status_code == 404
+        assert api.client.post("/books/bulk?on_conflict=hepsi", json=items).status_code == 400
+    
+    def test_bulk_item_limit(self, api):
+        """Tek istekte en fazla MAX_BULK_ITEMS kitap eklenip silinebildiğini test eder."""
+        limit = api.module.MAX_BULK_ITEMS
+        assert limit == 10000
+        items = [{"title": "Kitap", "author": "Yazar", "isbn": str(i)} for i in range(limit + 1)]
+        
+        response = api.client.post("/books/bulk", json=items)
+        assert response.status_code == 400
+        response = api.client.request("DELETE", "/books/bulk", json=[item["isbn"] for item in items])
+        assert response.status_code == 400
+        assert api.client.get("/stats").json()["total_books"] == 0
+        
+        assert api.client.post("/books/bulk", json=items[:limit]).json()["added"] == limit
+    
+    def test_bulk_delete_body(self, api):
+        """Toplu silmenin istek gövdesindeki ISBN listesiyle çalıştığını ve satır satır sonuç döndürdüğünü test eder."""
+        api.client.post("/books/bulk", json=[{"title": "Kitap", "author": "Yazar", "isbn": isbn}
+                                             for isbn in ("1", "2")])
+        
+        response = api.client.request("DELETE", "/books/bulk", json=["1", "9", "1", "x y", "2"])
+        assert response.status_code == 200
+        body = response.json()
+        assert [(r["index"], r["status"]) for r in body["results"]] == [
+            (0, "removed"), (1, "not_found"), (2, "not_found"), (3, "error"), (4, "removed")
+        ]
+        assert (body["removed"], body["not_found"], body["failed"]) == (2, 2, 1)
+        assert api.client.get("/books").json() == []
+        assert api.client.request("DELETE", "/books/bulk", json={"isbns": ["1"]}).status_code == 422
+    
+    def test_pagination_headers_and_last_page(self, api):
+        """Sayfalı listelemede imleç başlıklarının verildiğini ve son sayfada kaybolduğunu test eder."""
+        isbns = ["5", "1", "4", "2", "3"]
+        api.client.post("/books/bulk", json=[{"title": f"Kitap {isbn}", "author": "Yazar", "isbn": isbn}
+                                             for isbn in isbns])
+        assert [book["isbn"] for book in api.client.get("/books").json()] == isbns
+        
+        pages = []
+        url = "/books?limit=2"
+        while url:
+            response = api.client.get(url)
+            assert response.status_code == 200
+            pages.append([book["isbn"] for book in response.json()])
+            cursor = response.headers.get("x-next-cursor")
+            link = response.headers.get("link")
+            if cursor is None:
+                assert link is None
+                break
+            assert link == f'</books?limit=2&cursor={cursor}>; rel="next"'
+            url = link[1:link.index(">")]
+        
+        assert pages == [["1", "2"], ["3", "4"], ["5"]]
+        assert "x-next-cursor" not in api.client.get("/books?limit=5").headers
+        assert api.client.get("/books?cursor=%%%").status_code == 400
+        assert api.client.get("/books?limit=0").status_code == 422
+    
+    def test_empty_cursor_does_not_share_cache_with_full_list(self, api):
+        """Boş imleçli sayfalı yanıtın tam listenin önbellek kaydını bozmadığını test eder."""
+        count = api.module.DEFAULT_PAGE_SIZE + 50
+        api.client.post("/books/bulk", json=[{"title": f"Kitap {i}", "author": "Yazar", "isbn": f"{i:04d}"}
+                                             for i in range(count)])
+        
+        paged = api.client.get("/books?cursor=")
+        assert len(paged.json()) == api.module.DEFAULT_PAGE_SIZE
+        assert "x-next-cursor" in paged.headers
+        
+        full = api.client.get("/books")
+        assert len(full.json()) == count
+        assert "x-next-cursor" not in full.headers and "link" not in full.headers
+    
+    def test_cursor_survives_deletion(self, api):
+        """İmlecin gösterdiği kitap silinse de sonraki sayfanın doğru devam ettiğini test eder."""
+        api.client.post("/books/bulk", json=[{"title": f"Kitap {isbn}", "author": "Yazar", "isbn": isbn}
+                                             for isbn in ("1", "2", "3", "4")])
+        cursor = api.client.get("/books?limit=2").headers["x-next-cursor"]
+        
+        assert api.client.delete("/books/2").status_code == 200
+        api.client.post("/books/manual", json={"title": "Yeni", "author": "Yazar", "isbn": "25"})
+        response = api.client.get(f"/books?limit=2&cursor={cursor}")
+        assert [book["isbn"] for book in response.json()] == ["25", "3"]
+        response = api.client.get(response.headers["link"][1:response.headers["link"].index(">")])
+        assert [book["isbn"] for book in response.json()] == ["4"]
+        assert "link" not in response.headers
+    
+    def test_locked_library_does_not_block_event_loop(self, api):
+        """Kütüphane kilidi tutulurken bekleyen isteklerin diğer uç noktaları durdurmadığını test eder."""
+        api.client.post("/books/manual", json={"title": "Kitap", "author": "Yazar", "isbn": "111"})
+        locked, release, released = threading.Event(), threading.Event(), threading.Event()
+        
+        def hold_lock():
+            # Uzun süren bir toplu yazma gibi kilidi tutar
+            with api.module.library._lock:
+                locked.set()
+                release.wait(timeout=2)
+                released.set()
+                
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait()
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=api.module.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                waiting = [asyncio.ensure_future(client.get(path))
+                           for path in ("/stats", "/books/111", "/books/search/Kitap")]
+                await asyncio.sleep(0.05)
+                admin = await client.get("/admin/openlibrary")
+                served_while_locked = not released.is_set()
+                release.set()
+                return admin, served_while_locked, await asyncio.gather(*waiting)
+                
+        admin, served_while_locked, waiting = asyncio.run(scenario())
+        holder.join()
+        
+        assert admin.status_code == 200 and served_while_locked
+        assert [response.status_code for response in waiting] == [200, 200, 200]
+    
+    def test_export_formats(self, api):
+        """Dışa aktarımın içerik türlerini, CSV başlık satırını ve NDJSON satır yapısını test eder."""
+        books = [{"title": "Şiirler, Seçme", "author": "Nâzım Hikmet", "isbn": "1"},
+                 {"title": "Tutunamayanlar", "author": "Oğuz Atay", "isbn": "2"}]
+        api.client.post("/books/bulk", json=books)
+        
+        response = api.client.get("/books/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers["content-disposition"] == 'attachment; filename="books.ndjson"'
+        assert response.text.endswith("\n") and response.text.count("\n") == 2
+        assert [json.loads(line) for line in response.text.splitlines()] == books
+        
+        response = api.client.get("/books/export?format=csv")
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-type"].count("charset") <= 1
+        lines = response.text.splitlines()
+        assert lines[0] == "title,author,isbn"
+        assert lines[1:] == ['"Şiirler, Seçme",Nâzım Hikmet,1', "Tutunamayanlar,Oğuz Atay,2"]
+        
+        etag = response.headers["etag"]
+        assert api.client.get("/books/export", headers={"If-None-Match": etag}).status_code == 304
+        assert api.client.get("/books/export?format=xml").status_code == 400
 
 # Test çalıştırma fonksiyonu
 def run_tests():